@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+直接 Atom 客户端测试 - 回放同一份录制的响应，校验 atom 后端与 arxiv 包后端抓取的论文完全一致，以及请求超时和重试
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+import pytest
+import requests
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.arxiv_atom import AtomClient, parse_feed, retry_delay
+from scripts.benchmark import (CorpusTransport, DEFAULT_RECORDED_CORPUS, load_recorded_papers,
+                               recorded_corpus, render_atom_feed)
+from scripts.fetch_papers import PaperFetcher, RateLimiter
+from scripts.metrics import Metrics
+from scripts.transport import RecordedResponse, RecordingTransport, ReplayTransport
+
+CONFIG_PATH = str(project_root / "config.yaml")
+
+
+class ScriptedTransport:
+    """按顺序返回预设的响应或抛出预设的异常，记录每次请求的参数"""
+    
+    offline = True  # 测试中不实际等待
+    
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.calls = []
+    
+    def get(self, url: str, headers=None, **kwargs):
+        self.calls.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_response(status: int, content: bytes = b'', headers: dict = None) -> RecordedResponse:
+    """带响应头的回放响应"""
+    response = RecordedResponse('', status, content)
+    response.headers = headers or {}
+    return response
+
+
+def make_fetcher(transport, backend: str) -> PaperFetcher:
+    """只抓取一个类别、不限时间窗口和数量的 PaperFetcher"""
+    fetcher = PaperFetcher(CONFIG_PATH, transport=transport)
+    fetcher.config['sources']['arxiv'].update({
+        'backend': backend, 'categories': ['cs.AI'], 'max_results': None, 'page_size': 100, 'days_back': 36500,
+        'delay_seconds': 0, 'max_workers': 1, 'early_stop': False, 'incremental': False,
+    })
+    return fetcher
+
+
+def sample_papers():
+    """真实论文样本，加上带 journal_ref、标题含换行和多余空白的论文"""
+    papers = recorded_corpus(load_recorded_papers(DEFAULT_RECORDED_CORPUS), 250)
+    papers[0] = {**papers[0], 'title': 'Multi-line\n  title   with  spaces',
+                 'journal_ref': 'The International Conference on Pattern Recognition (ICPR),2024'}
+    papers[1] = {**papers[1], 'comment': '', 'authors': []}
+    return papers
+
+
+def test_backend_parity():
+    """atom 后端与 arxiv 包后端的结果一致"""
+    papers = sample_papers()
+    with tempfile.TemporaryDirectory() as directory:
+        make_fetcher(RecordingTransport(directory, inner=CorpusTransport(papers)), 'arxiv').fetch_arxiv_papers()
+        expected = make_fetcher(ReplayTransport(directory), 'arxiv').fetch_arxiv_papers()
+        actual = make_fetcher(ReplayTransport(directory), 'atom').fetch_arxiv_papers()
+    
+    assert len(expected) == 250
+    mismatches = [a['id'] for a, b in zip(actual, expected) if a != b]
+    assert len(actual) == len(expected) and not mismatches, mismatches[:5]
+    assert list(actual[0]) == list(expected[0])  # 字段顺序也一致
+    by_id = {paper['id']: paper for paper in actual}
+    assert by_id[papers[0]['id']]['title'] == 'Multi-line title with spaces'
+    assert by_id[papers[1]['id']]['comment'] is None
+
+
+def test_parse_feed():
+    """解析结果总数和字段；格式错误的响应返回空页"""
+    papers = sample_papers()[:3]
+    total, entries = parse_feed(render_atom_feed(papers, 0, 42))
+    assert total == 42
+    assert [paper['id'] for _, _, paper in entries] == [paper['id'] for paper in papers]
+    published_at, _, paper = entries[0]
+    assert published_at.tzinfo is not None
+    assert paper['pdf_url'] == f"http://arxiv.org/pdf/{papers[0]['id']}"
+    assert paper['journal_ref'] == papers[0]['journal_ref']
+    assert entries[1][2]['comment'] is None
+    
+    assert parse_feed(b'not xml') == (0, [])
+
+
+def test_fetch_page_retries():
+    """请求带超时；超时、503、500 按指数退避重试，Retry-After 优先；400 直接失败"""
+    papers = sample_papers()[:2]
+    transport = ScriptedTransport([
+        requests.exceptions.ReadTimeout(),
+        make_response(503, headers={'Retry-After': '7'}),
+        make_response(500),
+        make_response(200, render_atom_feed(papers, 0, 2)),
+    ])
+    metrics = Metrics('fetch')
+    client = AtomClient(transport, RateLimiter(0), num_retries=3, metrics=metrics, category='cs.AI', timeout=5)
+    total, entries = client.fetch_page('https://export.arxiv.org/api/query', first_page=True)
+    assert total == 2 and len(entries) == 2
+    assert [call['timeout'] for call in transport.calls] == [5, 5, 5, 5]
+    assert metrics.stages[('retry_wait', (('category', 'cs.AI'),))] == {'seconds': 3 + 7 + 12, 'calls': 3, 'items': 0}
+    
+    failing = ScriptedTransport([make_response(400), make_response(200, render_atom_feed(papers, 0, 2))])
+    with pytest.raises(ConnectionError):
+        AtomClient(failing, RateLimiter(0)).fetch_page('https://export.arxiv.org/api/query', first_page=True)
+    assert len(failing.calls) == 1
+    
+    exhausted = ScriptedTransport([make_response(503)] * 3)
+    with pytest.raises(ConnectionError):
+        AtomClient(exhausted, RateLimiter(0), num_retries=2).fetch_page('https://export.arxiv.org/api/query', True)
+    assert exhausted.responses == []
+
+
+def test_retry_delay():
+    """指数退避有上限；Retry-After 支持秒数和 HTTP 日期"""
+    assert [retry_delay(n) for n in (1, 2, 3, 10)] == [3, 6, 12, 60]
+    assert retry_delay(1, ' 120 ') == 120
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= retry_delay(1, later) <= 30
+    assert retry_delay(2, 'soon') == 6
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 直接 Atom 客户端测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_backend_parity, test_parse_feed, test_fetch_page_retries, test_retry_delay):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
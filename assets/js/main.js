@@ -0,0 +1,565 @@
+// 筛选、搜索、排序和懒加载功能
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('JavaScript loaded');
+    
+    // 获取DOM元素
+    const monthBtns = document.querySelectorAll('.month-btn');
+    const statusBtns = document.querySelectorAll('.status-btn');
+    const categoryBtns = document.querySelectorAll('.category-btn');
+    const sortBtns = document.querySelectorAll('.sort-btn');
+    const searchInput = document.getElementById('searchInput');
+    const exportBtn = document.getElementById('exportBtn');
+    const selectAllBtn = document.getElementById('selectAllBtn');
+    const clearAllBtn = document.getElementById('clearAllBtn');
+    const selectedCount = document.getElementById('selectedCount');
+    const resultsCount = document.getElementById('resultsCount');
+    const papersContainer = document.getElementById('papers-container');
+    
+    console.log('DOM elements:', {
+        monthBtns: monthBtns.length,
+        statusBtns: statusBtns.length,
+        categoryBtns: categoryBtns.length,
+        sortBtns: sortBtns.length,
+        searchInput: !!searchInput,
+        exportBtn: !!exportBtn,
+        selectAllBtn: !!selectAllBtn,
+        clearAllBtn: !!clearAllBtn,
+        resultsCount: !!resultsCount,
+        papersContainer: !!papersContainer
+    });
+    
+    // 状态变量
+    let allPapersData = [];  // 所有论文数据
+    let currentMonth = 'all';  // 当前选中的月份
+    let currentStatus = 'all';
+    let currentCategory = 'all';
+    let currentSort = 'date-desc';
+    let searchTerm = '';
+    let filteredPapers = [];
+    let loadedCount = 0;
+    const initialBatchSize = 20;  // 第一次加载20个
+    const subsequentBatchSize = 10;  // 后续每次加载10个
+    let isLoading = false;
+    let observer = null;
+    let monthsCache = {};  // 缓存已加载的月份数据
+    let abstractsCache = {};  // 已加载的摘要 {论文ID: 摘要}
+    let abstractChunkRequests = {};  // 摘要分块请求 {"月份/块号": Promise}
+    let searchMetaRequest = null;  // 搜索索引元数据请求，结果为 null 表示索引不可用
+    let searchShardRequests = {};  // 搜索索引分片请求 {前缀: Promise}
+    let searchResultIds = null;  // 当前搜索命中的论文ID集合（null 表示逐篇匹配）
+    
+    // 加载月份索引
+    async function loadMonthsIndex() {
+        try {
+            const response = await fetch('data/index.json');
+            const monthsIndex = await response.json();
+            console.log('Months index loaded:', monthsIndex);
+            
+            // 默认加载最新月份的数据
+            if (monthsIndex.length > 0) {
+                await loadMonthData('all');
+            }
+        } catch (e) {
+            console.error('Failed to load months index:', e);
+        }
+    }
+    
+    // 加载指定月份的数据
+    async function loadMonthData(month) {
+        if (month === 'all') {
+            // 加载所有月份
+            try {
+                const response = await fetch('data/index.json');
+                const monthsIndex = await response.json();
+                
+                // 加载所有月份数据
+                allPapersData = [];
+                for (const monthInfo of monthsIndex) {
+                    if (!monthsCache[monthInfo.month]) {
+                        const monthResponse = await fetch(`data/${monthInfo.month}.list.json`);
+                        monthsCache[monthInfo.month] = await monthResponse.json();
+                    }
+                    allPapersData.push(...monthsCache[monthInfo.month]);
+                }
+                console.log(`Loaded all months, total ${allPapersData.length} papers`);
+            } catch (e) {
+                console.error('Failed to load all months data:', e);
+            }
+        } else {
+            // 加载单个月份
+            if (!monthsCache[month]) {
+                try {
+                    const response = await fetch(`data/${month}.list.json`);
+                    monthsCache[month] = await response.json();
+                    console.log(`Loaded month ${month}, ${monthsCache[month].length} papers`);
+                } catch (e) {
+                    console.error(`Failed to load month ${month}:`, e);
+                    return;
+                }
+            }
+            allPapersData = monthsCache[month];
+            console.log(`Using cached data for ${month}, ${allPapersData.length} papers`);
+        }
+        
+        // 数据加载完成后，触发筛选
+        filterAndSortPapers();
+    }
+    
+    // 加载一个摘要分块（同一分块只请求一次）
+    function loadAbstractChunk(month, chunk) {
+        const key = `${month}/${chunk}`;
+        if (!abstractChunkRequests[key]) {
+            abstractChunkRequests[key] = fetch(`data/abstracts/${key}.json`)
+                .then(response => response.json())
+                .then(abstracts => {
+                    Object.assign(abstractsCache, abstracts);
+                })
+                .catch(e => {
+                    console.error(`Failed to load abstracts ${key}:`, e);
+                    delete abstractChunkRequests[key];
+                });
+        }
+        return abstractChunkRequests[key];
+    }
+    
+    // 确保给定论文的摘要都已加载（搜索摘要前调用）
+    async function ensureAbstracts(papers) {
+        const requests = {};
+        papers.forEach(paper => {
+            if (!(paper.id in abstractsCache)) {
+                const month = paper.published.substring(0, 7);
+                requests[`${month}/${paper.chunk}`] = [month, paper.chunk];
+            }
+        });
+        await Promise.all(Object.values(requests).map(([month, chunk]) => loadAbstractChunk(month, chunk)));
+    }
+    
+    // 加载搜索索引元数据和文档列表（data/search/，构建时生成）
+    function loadSearchMeta() {
+        if (!searchMetaRequest) {
+            const fetchJSON = url => fetch(url).then(response => {
+                if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+                return response.json();
+            });
+            searchMetaRequest = Promise.all([fetchJSON('data/search/meta.json'), fetchJSON('data/search/docs.json')])
+                .then(([meta, docs]) => {
+                    meta.docs = docs;
+                    meta.stopwordSet = new Set(meta.stopwords);
+                    return meta;
+                })
+                .catch(e => {
+                    console.error('Failed to load search index:', e);
+                    return null;
+                });
+        }
+        return searchMetaRequest;
+    }
+    
+    // 加载一个搜索索引分片
+    function loadSearchShard(prefix) {
+        if (!searchShardRequests[prefix]) {
+            searchShardRequests[prefix] = fetch(`data/search/shards/${prefix}.json`).then(response => response.json());
+        }
+        return searchShardRequests[prefix];
+    }
+    
+    // 分词规则与 scripts/search_index.py 的 tokenize 一致
+    function tokenize(text, meta) {
+        return (text.toLowerCase().match(/[a-z0-9]+/g) || [])
+            .filter(token => token.length >= 2 && !meta.stopwordSet.has(token));
+    }
+    
+    // 在全站索引上搜索：每个查询词按前缀匹配词项，多个查询词取交集，返回论文ID集合
+    // 文档编号按发布时间从旧到新分配，只用于查找 ID，结果的显示顺序由 filterAndSortPapers 的排序决定
+    async function searchArchive(query, meta) {
+        const tokens = tokenize(query, meta);
+        if (tokens.length === 0) return null;
+        
+        let result = null;
+        for (const token of tokens) {
+            // 查询词比分片前缀短时，需要查找所有以它开头的分片
+            const prefix = token.substring(0, meta.prefix_length);
+            const shards = await Promise.all(meta.shards.filter(p => p.startsWith(prefix)).map(loadSearchShard));
+            
+            const matched = new Set();
+            shards.forEach(shard => {
+                for (const term in shard) {
+                    if (term.startsWith(token)) {
+                        let doc = 0;
+                        shard[term].forEach(delta => {
+                            doc += delta;
+                            matched.add(doc);
+                        });
+                    }
+                }
+            });
+            result = result === null ? matched : new Set([...result].filter(doc => matched.has(doc)));
+            if (result.size === 0) break;
+        }
+        return new Set([...result].map(doc => meta.docs[doc]));
+    }
+    
+    // 生成论文HTML（卡片模板由 scripts/card_template.py 生成，见 js/card.js）
+    function createPaperHTML(paper) {
+        const abstract = abstractsCache[paper.id] !== undefined ? abstractsCache[paper.id] : '加载中...';
+        return PaperCard.render(PaperCard.context(paper, abstract));
+    }
+    
+    // 更新研究领域按钮的数量
+    function updateCategoryButtonCounts() {
+        // 先筛选出符合当前状态的论文
+        const statusFilteredPapers = allPapersData.filter(paper => {
+            const status = paper.conference ? 'published' : 'preprint';
+            return currentStatus === 'all' || status === currentStatus;
+        });
+        
+        // 计算各个领域的数量（领域按钮由构建时根据 config.yaml 生成）
+        const categoryCounts = { 'all': statusFilteredPapers.length };
+        categoryBtns.forEach(btn => {
+            if (btn.dataset.category !== 'all') {
+                categoryCounts[btn.dataset.category] = 0;
+            }
+        });
+        
+        statusFilteredPapers.forEach(paper => {
+            const tags = paper.tags || [];
+            tags.forEach(tag => {
+                if (categoryCounts.hasOwnProperty(tag)) {
+                    categoryCounts[tag]++;
+                }
+            });
+        });
+        
+        // 更新按钮文本
+        categoryBtns.forEach(btn => {
+            const category = btn.dataset.category;
+            const displayName = category === 'all' ? '全部' : 
+                               category === 'Natural Language Processing' ? 'NLP' : category;
+            const count = categoryCounts[category] || 0;
+            btn.textContent = `${displayName} (${count})`;
+        });
+    }
+    
+    // 筛选和排序论文
+    function filterAndSortPapers() {
+        console.log('Filtering papers:', { currentStatus, currentCategory, searchTerm, currentSort });
+        
+        // 筛选
+        filteredPapers = allPapersData.filter(paper => {
+            const status = paper.conference ? 'published' : 'preprint';
+            const tags = paper.tags || [];
+            const text = `${paper.title} ${paper.authors} ${abstractsCache[paper.id] || ''}`.toLowerCase();
+            
+            const matchStatus = currentStatus === 'all' || status === currentStatus;
+            const matchCategory = currentCategory === 'all' || tags.includes(currentCategory);
+            const matchSearch = searchTerm === '' || (searchResultIds ? searchResultIds.has(paper.id) : text.includes(searchTerm));
+            
+            return matchStatus && matchCategory && matchSearch;
+        });
+        
+        console.log(`Filtered to ${filteredPapers.length} papers`);
+        
+        // 排序
+        filteredPapers.sort((a, b) => {
+            const dateA = new Date(a.published);
+            const dateB = new Date(b.published);
+            
+            if (currentSort === 'date-desc') {
+                return dateB - dateA;
+            } else {
+                return dateA - dateB;
+            }
+        });
+        
+        // 更新研究领域按钮的数量
+        updateCategoryButtonCounts();
+        
+        // 更新显示
+        if (resultsCount) {
+            resultsCount.textContent = `显示 ${filteredPapers.length} 篇论文`;
+        }
+        
+        // 重置懒加载
+        loadedCount = 0;
+        if (papersContainer) {
+            papersContainer.innerHTML = '';
+        }
+        
+        // 移除旧的 observer
+        if (observer) {
+            observer.disconnect();
+        }
+        
+        // 加载第一批
+        loadMorePapers();
+    }
+    
+    // 加载更多论文
+    function loadMorePapers() {
+        if (isLoading || loadedCount >= filteredPapers.length) {
+            console.log('Skip loading:', { isLoading, loadedCount, total: filteredPapers.length });
+            return;
+        }
+        
+        isLoading = true;
+        
+        // 第一次加载50个，后续每次10个
+        const batchSize = loadedCount === 0 ? initialBatchSize : subsequentBatchSize;
+        console.log(`Loading papers ${loadedCount} to ${loadedCount + batchSize} (batch size: ${batchSize})`);
+        
+        const endIndex = Math.min(loadedCount + batchSize, filteredPapers.length);
+        const fragment = document.createDocumentFragment();
+        
+        for (let i = loadedCount; i < endIndex; i++) {
+            const paperHTML = createPaperHTML(filteredPapers[i]);
+            const temp = document.createElement('div');
+            temp.innerHTML = paperHTML;
+            fragment.appendChild(temp.firstElementChild);
+        }
+        
+        // 移除旧的加载指示器
+        const oldIndicator = document.getElementById('loading-indicator');
+        if (oldIndicator) {
+            oldIndicator.remove();
+        }
+        
+        papersContainer.appendChild(fragment);
+        loadedCount = endIndex;
+        isLoading = false;
+        
+        console.log(`Loaded ${endIndex} papers total`);
+        
+        // 如果还有更多，设置加载触发器
+        if (loadedCount < filteredPapers.length) {
+            setupLoadTrigger();
+        }
+    }
+    
+    // 设置加载触发器
+    function setupLoadTrigger() {
+        let indicator = document.getElementById('loading-indicator');
+        if (!indicator) {
+            indicator = document.createElement('div');
+            indicator.id = 'loading-indicator';
+            indicator.className = 'loading-indicator';
+            indicator.style.height = '100px';
+            indicator.style.margin = '20px 0';
+            indicator.style.textAlign = 'center';
+            indicator.style.color = '#666';
+            indicator.textContent = '加载更多...';
+            papersContainer.appendChild(indicator);
+        }
+        
+        // 创建新的 observer
+        if (observer) {
+            observer.disconnect();
+        }
+        
+        observer = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    console.log('Loading more papers (intersection detected)');
+                    loadMorePapers();
+                }
+            });
+        }, {
+            rootMargin: '200px'
+        });
+        
+        observer.observe(indicator);
+    }
+    
+    // 月份筛选
+    monthBtns.forEach(btn => {
+        btn.addEventListener('click', async function() {
+            console.log('Month button clicked:', this.dataset.month);
+            monthBtns.forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentMonth = this.dataset.month;
+            
+            // 显示加载提示
+            if (resultsCount) {
+                resultsCount.textContent = '加载中...';
+            }
+            if (papersContainer) {
+                papersContainer.innerHTML = '<div style="text-align: center; padding: 40px; color: #666;">加载中...</div>';
+            }
+            
+            // 加载月份数据
+            await loadMonthData(currentMonth);
+        });
+    });
+    
+    // 发表状态筛选
+    statusBtns.forEach(btn => {
+        btn.addEventListener('click', function() {
+            console.log('Status button clicked:', this.dataset.status);
+            statusBtns.forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentStatus = this.dataset.status;
+            filterAndSortPapers();
+        });
+    });
+    
+    // 研究领域筛选
+    categoryBtns.forEach(btn => {
+        btn.addEventListener('click', function() {
+            console.log('Category button clicked:', this.dataset.category);
+            categoryBtns.forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentCategory = this.dataset.category;
+            filterAndSortPapers();
+        });
+    });
+    
+    // 排序按钮
+    sortBtns.forEach(btn => {
+        btn.addEventListener('click', function(e) {
+            console.log('Sort button clicked:', this.dataset.sort);
+            e.preventDefault();
+            sortBtns.forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentSort = this.dataset.sort;
+            filterAndSortPapers();
+        });
+    });
+    
+    // 搜索输入
+    if (searchInput) {
+        searchInput.addEventListener('input', async function() {
+            const term = this.value.toLowerCase();
+            searchTerm = term;
+            searchResultIds = null;
+            console.log('Search term:', searchTerm);
+            
+            if (term !== '') {
+                const meta = await loadSearchMeta();
+                if (meta) {
+                    // 使用全站搜索索引，只下载查询词所在的分片
+                    const ids = await searchArchive(term, meta);
+                    if (term !== searchTerm) return;  // 输入已变化，丢弃过期结果
+                    searchResultIds = ids;
+                } else {
+                    // 没有搜索索引时逐篇匹配，需要先加载当前论文的摘要分块
+                    await ensureAbstracts(allPapersData);
+                    if (term !== searchTerm) return;
+                }
+            }
+            filterAndSortPapers();
+        });
+    }
+    
+    // 展开摘要时按需加载（toggle 事件不冒泡，使用捕获阶段）
+    if (papersContainer) {
+        papersContainer.addEventListener('toggle', async function(e) {
+            const details = e.target;
+            if (!details.open || !details.dataset.chunk) return;
+            const card = details.closest('.paper-card');
+            const paperId = card ? card.dataset.paperId : null;
+            if (!paperId || abstractsCache[paperId] !== undefined) return;
+            
+            await loadAbstractChunk(details.dataset.month, details.dataset.chunk);
+            details.querySelector('p').textContent = abstractsCache[paperId] || '';
+        }, true);
+    }
+    
+    // 更新选中数量
+    function updateSelectedCount() {
+        const count = document.querySelectorAll('.paper-checkbox:checked').length;
+        if (selectedCount) {
+            selectedCount.textContent = count;
+        }
+    }
+    
+    // 监听复选框变化（使用事件委托）
+    if (papersContainer) {
+        papersContainer.addEventListener('change', function(e) {
+            if (e.target.classList.contains('paper-checkbox')) {
+                updateSelectedCount();
+            }
+        });
+    }
+    
+    // 全选功能
+    if (selectAllBtn) {
+        selectAllBtn.addEventListener('click', function() {
+            const checkboxes = document.querySelectorAll('.paper-checkbox');
+            checkboxes.forEach(cb => cb.checked = true);
+            updateSelectedCount();
+            console.log('All papers selected');
+        });
+    }
+    
+    // 清空选择
+    if (clearAllBtn) {
+        clearAllBtn.addEventListener('click', function() {
+            const checkboxes = document.querySelectorAll('.paper-checkbox');
+            checkboxes.forEach(cb => cb.checked = false);
+            updateSelectedCount();
+            console.log('All selections cleared');
+        });
+    }
+    
+    // 导出功能
+    if (exportBtn) {
+        exportBtn.addEventListener('click', function(e) {
+            console.log('Export button clicked');
+            e.preventDefault();
+            exportToBibTeX();
+        });
+    }
+    
+    // 导出为 BibTeX
+    function exportToBibTeX() {
+        // 获取所有选中的复选框
+        const checkboxes = document.querySelectorAll('.paper-checkbox:checked');
+        
+        if (checkboxes.length === 0) {
+            alert('请至少选择一篇论文导出！');
+            return;
+        }
+        
+        // 获取选中的论文ID
+        const selectedIds = Array.from(checkboxes).map(cb => cb.dataset.paperId);
+        
+        // 从所有论文数据中找到对应的论文
+        const selectedPapers = allPapersData.filter(paper => selectedIds.includes(paper.id));
+        
+        let bibtex = '';
+        selectedPapers.forEach((paper, index) => {
+            const arxivId = paper.id;
+            const year = paper.published.split('-')[0];
+            
+            bibtex += `@article{${arxivId.replace('.', '_')},\n`;
+            bibtex += `  title={${paper.title}},\n`;
+            bibtex += `  author={${paper.authors}},\n`;
+            bibtex += `  year={${year}},\n`;
+            bibtex += `  journal={arXiv preprint arXiv:${arxivId}}`;
+            if (paper.conference) {
+                bibtex += `,\n  note={${paper.conference}}`;
+            }
+            bibtex += `\n}\n\n`;
+        });
+        
+        console.log(`Exporting ${selectedPapers.length} selected papers`);
+        downloadFile(bibtex, 'papers.bib', 'text/plain');
+    }
+    
+    // 下载文件
+    function downloadFile(content, filename, contentType) {
+        const blob = new Blob([content], { type: contentType });
+        const url = URL.createObjectURL(blob);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = filename;
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        URL.revokeObjectURL(url);
+        console.log('File download triggered:', filename);
+    }
+    
+    // 初始化 - 加载数据
+    console.log('Initializing...');
+    loadMonthsIndex();
+});
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+静态资源测试 - 校验 CSS / JS 压缩不改变选择器和脚本的含义，以及带哈希的文件名
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.assets import hashed_name, minify, minify_css, minify_js
+
+
+def test_css_selectors():
+    """后代选择器和伪类前的空格保留（a :hover 不会变成 a:hover），子选择器的空格也不改动"""
+    css = """
+    /* 链接 */
+    a :hover { color : red; }
+    .card a:hover,
+    .card  a:focus {
+        color: blue;
+    }
+    div > p { margin: 0 auto ; }
+    """
+    assert minify_css(css) == "a :hover{color : red}.card a:hover,.card a:focus{color: blue}div > p{margin: 0 auto}\n"
+
+
+def test_css_media_query():
+    """@media 条件中的空格和冒号保持不变"""
+    css = "@media (max-width: 600px) {\n  .a { display: none; }\n}\n"
+    assert minify_css(css) == "@media (max-width: 600px){.a{display: none}}\n"
+
+
+def test_js_and_hash():
+    """JS 只去掉缩进、空行和整行注释；文件名哈希随内容变化"""
+    js = "// 注释\nfunction f() {\n    return 1;\n\n}\n"
+    assert minify_js(js) == "function f() {\nreturn 1;\n}\n"
+    assert minify('data.json', ' {} ') == ' {} '
+    assert hashed_name('css/style.css', 'a').startswith('style.') and hashed_name('css/style.css', 'a').endswith('.css')
+    assert hashed_name('css/style.css', 'a') != hashed_name('css/style.css', 'b')
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 静态资源测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_css_selectors, test_css_media_query, test_js_and_hash):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
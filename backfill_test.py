@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+历史回填测试 - 用模拟的 OAI-PMH 响应校验 arXivRaw 解析、类别过滤、分批保存、中断后从检查点继续，令牌失效后重新收割，以及请求失败时的重试
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import requests
+import yaml
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.backfill import Backfiller, date_chunks, list_records_url, parse_list_records, split_authors
+from scripts.storage import open_store
+from scripts.transport import RecordedResponse
+
+CONFIG_PATH = str(project_root / "config.yaml")
+
+RECORD = """<record><header><identifier>oai:arXiv.org:{id}</identifier><datestamp>{day}</datestamp></header>
+<metadata><arXivRaw xmlns="http://arxiv.org/OAI/arXivRaw/">
+<id>{id}</id>
+<version version="v1"><date>Mon, 3 Mar 2025 10:00:00 GMT</date></version>
+<version version="v2"><date>Fri, 7 Mar 2025 12:00:00 GMT</date></version>
+<title>Deep learning for
+  {id}</title>
+<authors>A. Author, B. Author (Univ. X, Y) and C. Author</authors>
+<categories>{categories}</categories>
+<comments>Accepted at CVPR 2025</comments>
+<abstract>  A neural network approach.
+</abstract>
+</arXivRaw></metadata></record>"""
+
+DELETED = """<record><header status="deleted"><identifier>oai:arXiv.org:2503.99999</identifier></header></record>"""
+
+
+def oai_page(records, token=None, error=None) -> bytes:
+    """一页 ListRecords 响应"""
+    body = f'<error code="{error}">error</error>' if error else \
+        f"<ListRecords>{''.join(records)}<resumptionToken>{token or ''}</resumptionToken></ListRecords>"
+    return f'<?xml version="1.0"?><OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">{body}</OAI-PMH>'.encode()
+
+
+class FakeOAITransport:
+    """按 URL 返回预设响应的离线传输，fail_after 次请求后模拟网络中断"""
+    
+    offline = True
+    
+    def __init__(self, pages, fail_after=None):
+        self.pages = pages
+        self.fail_after = fail_after
+        self.requests = []
+    
+    def get(self, url, headers=None, **kwargs):
+        if self.fail_after is not None and len(self.requests) >= self.fail_after:
+            raise KeyboardInterrupt
+        self.requests.append(url)
+        return RecordedResponse(url, 200, self.pages[url])
+    
+    def now(self):
+        return datetime(2025, 3, 31, tzinfo=timezone.utc)
+
+
+class ExpiringTokenTransport(FakeOAITransport):
+    """带 resumptionToken 的请求第一次返回 badResumptionToken（令牌过期）"""
+    
+    def __init__(self, pages):
+        super().__init__(pages)
+        self.expired = set()
+    
+    def get(self, url, headers=None, **kwargs):
+        if 'resumptionToken' in url and url not in self.expired:
+            self.expired.add(url)
+            self.requests.append(url)
+            return RecordedResponse(url, 200, oai_page([], error='badResumptionToken'))
+        return super().get(url, headers=headers, **kwargs)
+
+
+class FlakyOAITransport(FakeOAITransport):
+    """先按顺序返回预设的失败（异常或 (状态码, Retry-After) 响应），之后正常响应"""
+    
+    def __init__(self, pages, failures):
+        super().__init__(pages)
+        self.failures = list(failures)
+    
+    def get(self, url, headers=None, **kwargs):
+        if not self.failures:
+            return super().get(url, headers=headers, **kwargs)
+        self.requests.append(url)
+        failure = self.failures.pop(0)
+        if isinstance(failure, Exception):
+            raise failure
+        status, retry_after = failure
+        response = RecordedResponse(url, status, b'')
+        response.headers = {'Retry-After': retry_after} if retry_after else {}
+        return response
+
+
+def make_pages():
+    """cs 集合 2025-03 的两页记录（第二页由 resumptionToken 取得），以及空的 2025-04"""
+    first = list_records_url('cs', '2025-03-01', '2025-03-31')
+    second = list_records_url('cs', '2025-03-01', '2025-03-31', token='page2')
+    return {
+        first: oai_page([RECORD.format(id='2503.00001', day='2025-03-07', categories='cs.CV cs.LG'),
+                         RECORD.format(id='2503.00002', day='2025-03-07', categories='cs.DS'),
+                         DELETED], token='page2'),
+        second: oai_page([RECORD.format(id='2503.00003', day='2025-03-08', categories='cs.CL')]),
+        list_records_url('cs', '2025-04-01', '2025-04-30'): oai_page([], error='noRecordsMatch'),
+    }
+
+
+def make_backfiller(directory, transport, batch_size: int = 1):
+    """写入临时目录的回填器，默认每篇论文保存一次"""
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    return Backfiller(config, data_path=str(Path(directory) / "papers.json"),
+                      checkpoint_path=str(Path(directory) / "checkpoint.json"),
+                      transport=transport, batch_size=batch_size)
+
+
+def test_parse_list_records():
+    """arXivRaw 记录解析为与日常抓取相同的论文字段"""
+    page = parse_list_records(make_pages()[list_records_url('cs', '2025-03-01', '2025-03-31')])
+    assert page['token'] == 'page2' and page['deleted'] == 1 and page['error'] is None
+    published_at, paper = page['records'][0]
+    assert published_at == datetime(2025, 3, 3, 10, tzinfo=timezone.utc)
+    assert paper['id'] == '2503.00001v2'
+    assert paper['title'] == 'Deep learning for 2503.00001'
+    assert paper['authors'] == ['A. Author', 'B. Author (Univ. X, Y)', 'C. Author']
+    assert (paper['published'], paper['updated']) == ('2025-03-03', '2025-03-07')
+    assert paper['primary_category'] == 'cs.CV'
+    assert paper['arxiv_url'] == 'http://arxiv.org/abs/2503.00001v2'
+    assert paper['abstract'] == 'A neural network approach.'
+    assert split_authors('A and B') == ['A', 'B']
+    assert date_chunks('2025-01-30', '2025-03-01', 30) == [('2025-01-30', '2025-02-28'), ('2025-03-01', '2025-03-01')]
+
+
+def test_backfill_and_resume():
+    """中断后从检查点继续，只重新请求未保存的页，结果与一次跑完相同"""
+    with tempfile.TemporaryDirectory() as directory:
+        # 第一页保存后中断
+        interrupted = make_backfiller(directory, FakeOAITransport(make_pages(), fail_after=1))
+        try:
+            interrupted.run('2025-03-01', '2025-04-30', chunk_days=31)
+            assert False, "应该中断"
+        except KeyboardInterrupt:
+            pass
+        assert open_store(Path(directory) / "papers.json", backend='sharded').count() == 1
+        
+        transport = FakeOAITransport(make_pages())
+        checkpoint = make_backfiller(directory, transport).run('2025-03-01', '2025-04-30', chunk_days=31)
+        assert transport.requests[0] == list_records_url('cs', '2025-03-01', '2025-03-31', token='page2')
+        assert checkpoint['completed'] == [['2025-03-01', '2025-03-31'], ['2025-04-01', '2025-04-30']]
+        assert checkpoint['current'] is None and checkpoint['saved'] == 2
+        
+        papers = {paper['id']: paper for paper in open_store(Path(directory) / "papers.json", backend='sharded').load()}
+        # cs.DS 不在配置的类别中
+        assert sorted(papers) == ['2503.00001v2', '2503.00003v2']
+        paper = papers['2503.00001v2']
+        assert paper['venue'] == 'cs.CV' and paper['query_categories'] == ['cs.CV', 'cs.LG']
+        assert paper['conference'] == 'CVPR 2025'
+        assert paper['tags']
+        
+        # 已完成后再次运行不发出请求
+        transport = FakeOAITransport(make_pages())
+        make_backfiller(directory, transport).run('2025-03-01', '2025-04-30', chunk_days=31)
+        assert transport.requests == []
+
+
+def test_bad_resumption_token():
+    """令牌失效后从本段开头重新收割：已收割未保存的论文不会重复添加，收割计数不会重复累加"""
+    with tempfile.TemporaryDirectory() as directory:
+        transport = ExpiringTokenTransport(make_pages())
+        backfiller = make_backfiller(directory, transport, batch_size=100)
+        batches = []
+        original_add = backfiller.store.add
+        
+        def spy_add(papers):
+            batches.append(sorted(paper['id'] for paper in papers))
+            return original_add(papers)
+        
+        backfiller.store.add = spy_add
+        checkpoint = backfiller.run('2025-03-01', '2025-04-30', chunk_days=31)
+        
+        first = list_records_url('cs', '2025-03-01', '2025-03-31')
+        assert transport.requests.count(first) == 2
+        assert batches == [['2503.00001v2', '2503.00003v2']]
+        assert checkpoint['harvested'] == 3 and checkpoint['saved'] == 2
+
+
+def test_overlapping_backfill_keeps_latest_version():
+    """重叠的回填遇到同一论文的新版本时替换旧版本，不保存两份"""
+    with tempfile.TemporaryDirectory() as directory:
+        make_backfiller(directory, FakeOAITransport(make_pages())).run('2025-03-01', '2025-03-31', chunk_days=31)
+        
+        pages = make_pages()
+        first = list_records_url('cs', '2025-03-01', '2025-03-31')
+        pages[first] = oai_page([RECORD.format(id='2503.00001', day='2025-03-20', categories='cs.CV').replace(
+            '</version>\n<title>', '</version>\n<version version="v3"><date>Thu, 20 Mar 2025 09:00:00 GMT</date>'
+                                   '</version>\n<title>')])
+        overlapping = make_backfiller(Path(directory) / "second", FakeOAITransport(pages))
+        overlapping.store = open_store(Path(directory) / "papers.json", backend='sharded')
+        assert overlapping.run('2025-03-01', '2025-03-31', chunk_days=31)['saved'] == 0
+        
+        ids = sorted(paper['id'] for paper in open_store(Path(directory) / "papers.json").load())
+        assert ids == ['2503.00001v3', '2503.00003v2']
+
+
+def test_request_retries():
+    """读取超时、429 和 5xx 按退避重试（429/503 带 Retry-After 时按其等待），其他 4xx 直接失败"""
+    with tempfile.TemporaryDirectory() as directory:
+        url = list_records_url('cs', '2025-03-01', '2025-03-31')
+        transport = FlakyOAITransport(make_pages(), [requests.exceptions.ReadTimeout('read timed out'),
+                                                     (429, '7'), (503, None), requests.exceptions.ConnectionError()])
+        backfiller = make_backfiller(directory, transport)
+        assert backfiller.request(url) == make_pages()[url]
+        assert len(transport.requests) == 5
+        assert backfiller.metrics.stages[('retry_wait', ())] == {'seconds': 3 + 7 + 12 + 24, 'calls': 4, 'items': 0}
+        
+        transport = FlakyOAITransport(make_pages(), [(429, None), (403, None)])
+        with pytest.raises(ConnectionError, match='HTTP 403'):
+            make_backfiller(directory, transport).request(url)
+        assert len(transport.requests) == 2
+        
+        transport = FlakyOAITransport(make_pages(), [requests.exceptions.ReadTimeout()] * 6)
+        with pytest.raises(ConnectionError):
+            make_backfiller(directory, transport).request(url)
+        assert len(transport.requests) == 6
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 历史回填测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_parse_list_records, test_backfill_and_resume, test_bad_resumption_token,
+                 test_overlapping_backfill_keeps_latest_version, test_request_retries):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+性能基准测试的冒烟测试 - 在小规模合成语料上跑通 scripts/benchmark.py，校验输出格式和回退检测
+"""
+
+import io
+import json
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts import benchmark
+from scripts.benchmark import compare_results, run_benchmarks, synthetic_corpus
+from scripts.fetch_papers import PaperFetcher
+
+CONFIG_PATH = str(project_root / "config.yaml")
+
+
+def test_synthetic_corpus():
+    """合成语料：ID 唯一，同一种子结果相同"""
+    config = PaperFetcher(CONFIG_PATH).config
+    papers = synthetic_corpus(config, 300, seed=1)
+    assert len({paper['id'] for paper in papers}) == 300
+    assert papers == synthetic_corpus(config, 300, seed=1)
+    assert len({paper['published'][:7] for paper in papers}) > 1
+
+
+def test_run_benchmarks():
+    """小规模运行全部基准，结果可用于对比"""
+    report = run_benchmarks([200], corpus='synthetic', config_path=CONFIG_PATH)
+    names = [result['benchmark'] for result in report['results']]
+    assert 'PaperFetcher.classify_paper' in names
+    assert 'HTMLGenerator.generate_monthly_data_files' in names
+    assert 'utils.get_papers_by_date' in names and 'utils.get_papers_by_category' in names
+    for result in report['results']:
+        assert result['size'] == 200
+        assert result['seconds'] >= 0
+        assert result['peak_memory_bytes'] is not None
+    assert compare_results(report, report) == []
+
+
+def test_compare_results():
+    """耗时增加超过阈值时报告回退，过短的基线不参与对比"""
+    baseline = {'results': [{'benchmark': 'a', 'size': 10, 'seconds': 1.0},
+                            {'benchmark': 'b', 'size': 10, 'seconds': 0.001}]}
+    current = {'results': [{'benchmark': 'a', 'size': 10, 'seconds': 1.5},
+                           {'benchmark': 'b', 'size': 10, 'seconds': 0.01}]}
+    regressions = compare_results(current, baseline, max_regression=0.25)
+    assert [r['benchmark'] for r in regressions] == ['a']
+    assert compare_results(current, baseline, max_regression=0.6) == []
+
+
+def test_baseline_stdout_is_json():
+    """指定 --baseline 且不指定 --output 时，标准输出只有 JSON 结果，对比信息输出到标准错误"""
+    with tempfile.TemporaryDirectory() as directory:
+        baseline_path = Path(directory) / "baseline.json"
+        baseline_path.write_text(json.dumps({'results': []}), encoding='utf-8')
+        stdout, stderr = io.StringIO(), io.StringIO()
+        argv = sys.argv
+        sys.argv = ['benchmark.py', '--sizes', '50', '--corpus', 'synthetic', '--no-memory',
+                    '--config', CONFIG_PATH, '--baseline', str(baseline_path)]
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                assert benchmark.main() == 0
+        finally:
+            sys.argv = argv
+        report = json.loads(stdout.getvalue())
+        assert report['regressions'] == []
+        assert '性能回退' in stderr.getvalue()
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 性能基准冒烟测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_synthetic_corpus, test_run_benchmarks, test_compare_results,
+                 test_baseline_stdout_is_json):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
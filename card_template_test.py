@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+论文卡片模板测试 - 校验 HTML 转义，以及 Python 与生成的 card.js 渲染结果一致（需要 node）
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.card_template import build_card_js, card_context, render_card
+
+SAMPLE_DATA = project_root / "docs" / "data" / "2025-10.json"
+
+# 覆盖转义、空字段、作者截断、区块等边界情况
+EDGE_CASES = [
+    {
+        'id': '2510.00001v1',
+        'title': 'Attacks on <script>alert("x")</script> & \'quotes\'',
+        'authors': ['A', 'B', 'C', 'D', 'E', 'F'],
+        'published': '2025-10-01',
+        'conference': 'NeurIPS 2025 <Spotlight>',
+        'tags': ['Computer Vision', 'R&D'],
+        'abstract': 'x < y && y > z',
+        'code_link': 'https://github.com/a/b?x=1&y="2"',
+        'project_link': 'https://example.com/p',
+        'chunk': 0,
+    },
+    {'id': '2510.00002v1', 'title': None, 'authors': [], 'published': '', 'tags': [], 'conference': None},
+    {'id': '2510.00003v1', 'title': 'Only id', 'authors': 'Single Author String', 'chunk': 3},
+]
+
+
+def load_samples(limit: int = 100):
+    """真实论文样本加上边界用例"""
+    papers = []
+    if SAMPLE_DATA.exists():
+        with open(SAMPLE_DATA, 'r', encoding='utf-8') as f:
+            papers = json.load(f)[:limit]
+    return papers + EDGE_CASES
+
+
+def render_with_node(papers):
+    """用生成的 card.js 在 node 中渲染论文卡片"""
+    script = build_card_js() + """
+const papers = JSON.parse(require('fs').readFileSync(0, 'utf-8'));
+process.stdout.write(JSON.stringify(papers.map(p => PaperCard.render(PaperCard.context(p)))));
+"""
+    result = subprocess.run(['node', '-e', script], input=json.dumps(papers), capture_output=True,
+                            text=True, encoding='utf-8', check=True)
+    return json.loads(result.stdout)
+
+
+def test_escaping():
+    """字段内容进行 HTML 转义"""
+    html = render_card(card_context(EDGE_CASES[0]))
+    assert '<script>' not in html
+    assert '&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp; &#x27;quotes&#x27;' in html
+    assert 'href="https://github.com/a/b?x=1&amp;y=&quot;2&quot;"' in html
+    assert 'A, B, C, D, E et al.' in html
+    assert '<span class="tag">R&amp;D</span>' in html
+    assert 'badge-neurips' in html
+
+
+def test_empty_sections():
+    """空值和空列表的区块不输出"""
+    html = render_card(card_context(EDGE_CASES[1]))
+    assert 'venue-badge' not in html
+    assert 'class="tag"' not in html
+    assert 'btn-code' not in html
+
+
+def test_python_js_parity():
+    """Python 与 card.js 渲染结果逐字节一致"""
+    if shutil.which('node') is None:
+        pytest.skip("未安装 node")
+    papers = load_samples()
+    expected = [render_card(card_context(paper)) for paper in papers]
+    actual = render_with_node(papers)
+    assert len(actual) == len(expected)
+    mismatches = [paper['id'] for paper, a, b in zip(papers, expected, actual) if a != b]
+    assert not mismatches, mismatches[:5]
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 论文卡片模板测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_escaping, test_empty_sections, test_python_js_parity):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except pytest.skip.Exception as e:
+            print(f"⏭️  {test.__doc__}: {e}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+关键词分类器测试 - 校验字典树正则分类与逐个关键词子串匹配的结果一致（含重叠、前缀关键词和单词边界模式）
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+import yaml
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmark import synthetic_corpus
+from scripts.classifier import KeywordClassifier, build_trie_pattern
+
+CONFIG_PATH = str(project_root / "config.yaml")
+
+
+def naive_classify(categories: dict, text: str, word_boundary: bool = False) -> list:
+    """逐个关键词子串匹配（原实现），按配置顺序返回类别"""
+    text = text.lower()
+    tags = []
+    for name, info in categories.items():
+        for keyword in info.get('keywords', []):
+            keyword = keyword.lower()
+            if word_boundary:
+                found = re.search(rf'(?<!\w){re.escape(keyword)}(?!\w)', text) is not None
+            else:
+                found = keyword in text
+            if found:
+                tags.append(name)
+                break
+    return tags
+
+
+def test_trie_pattern():
+    """字典树正则优先匹配最长的关键词，前缀关键词也能单独匹配"""
+    pattern = re.compile(build_trie_pattern(['control', 'contrastive learning', 'con']))
+    assert pattern.match('contrastive learning').group() == 'contrastive learning'
+    assert pattern.match('controller').group() == 'control'
+    assert pattern.match('cone').group() == 'con'
+
+
+def test_overlapping_keywords():
+    """相互重叠的关键词和作为前缀的关键词都能命中各自的类别"""
+    categories = {
+        'A': {'keywords': ['image-text']},
+        'B': {'keywords': ['text generation']},
+        'C': {'keywords': ['image']},
+        'D': {'keywords': ['gpt']},
+    }
+    classifier = KeywordClassifier(categories)
+    assert classifier.classify_text('Image-Text Generation') == ['A', 'B', 'C']
+    assert classifier.classify_text('GPTs everywhere') == ['D']
+    assert KeywordClassifier(categories, word_boundary=True).classify_text('GPTs everywhere') == []
+    assert KeywordClassifier({}).classify_text('anything') == []
+
+
+def test_matches_naive():
+    """在合成论文和随机关键词上，两种模式的结果都与逐个子串匹配一致"""
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    papers = synthetic_corpus(config, 200, seed=5)
+    classifier = KeywordClassifier(config['categories'])
+    for paper in papers:
+        assert classifier.classify_paper(paper) == \
+            naive_classify(config['categories'], paper['title'] + ' ' + paper['abstract'])
+    
+    rng = random.Random(7)
+    alphabet = 'ab -'
+    for _ in range(50):
+        categories = {f"C{i}": {'keywords': [''.join(rng.choices(alphabet, k=rng.randint(1, 4)))
+                                             for _ in range(rng.randint(1, 3))]}
+                      for i in range(5)}
+        text = ''.join(rng.choices(alphabet, k=40))
+        for word_boundary in (False, True):
+            assert KeywordClassifier(categories, word_boundary).classify_text(text) == \
+                naive_classify(categories, text, word_boundary), (categories, text, word_boundary)
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 关键词分类器测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_trie_pattern, test_overlapping_keywords, test_matches_naive):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+论文抓取测试 - 用合成语料模拟 ArXiv API，离线校验多类别抓取的合并、去重和时间窗口处理
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmark import CorpusTransport, synthetic_corpus
+from scripts import fetch_papers
+from scripts.fetch_papers import PaperFetcher, RateLimiter
+
+CONFIG_PATH = str(project_root / "config.yaml")
+CATEGORIES = ['cs.AI', 'cs.CV', 'cs.LG']
+
+
+class SlowCategoryTransport(CorpusTransport):
+    """每个类别都返回整个语料（所有论文都交叉列出），指定类别的请求额外延迟，使其最后完成"""
+    
+    def __init__(self, papers, slow_category: str, delay: float = 0.05):
+        super().__init__(papers)
+        self.slow_category = slow_category
+        self.delay = delay
+    
+    def get(self, url: str, headers=None, **kwargs):
+        if parse_qs(urlparse(url).query)['search_query'][0] == f"cat:{self.slow_category}":
+            time.sleep(self.delay)
+        return super().get(url, headers=headers, **kwargs)
+
+
+def make_fetcher(transport, **arxiv_config) -> PaperFetcher:
+    """离线抓取 CATEGORIES、不限时间窗口的 PaperFetcher，arxiv_config 覆盖 sources.arxiv 中的配置"""
+    fetcher = PaperFetcher(CONFIG_PATH, transport=transport)
+    fetcher.config['sources']['arxiv'].update({
+        'categories': CATEGORIES, 'max_results': None, 'page_size': 20, 'days_back': 36500,
+        'delay_seconds': 0, 'max_workers': 1, 'early_stop': False, 'adaptive_max_results': False,
+        'incremental': False, **arxiv_config,
+    })
+    return fetcher
+
+
+def corpus(size: int = 60):
+    """合成语料（固定种子）"""
+    return synthetic_corpus(PaperFetcher(CONFIG_PATH).config, size, seed=3)
+
+
+def test_parallel_matches_serial():
+    """并发抓取与串行抓取的结果完全相同（包括顺序）"""
+    papers = corpus()
+    serial = make_fetcher(SlowCategoryTransport(papers, CATEGORIES[1]), max_workers=1).fetch_arxiv_papers()
+    parallel = make_fetcher(SlowCategoryTransport(papers, CATEGORIES[1]), max_workers=3).fetch_arxiv_papers()
+    assert len(serial) == 60
+    assert parallel == serial
+
+
+def test_rate_limiter_shared():
+    """多个线程共用限速器时，请求之间仍保持最小间隔"""
+    limiter = RateLimiter(0.02)
+    times = []
+    lock = threading.Lock()
+    
+    def request():
+        limiter.wait()
+        with lock:
+            times.append(time.monotonic())
+    
+    # 线程被唤醒后的调度延迟会让相邻记录的间隔忽大忽小，只校验下界：
+    # 第 n 个放行的请求不早于开始后 (n - 1) * interval
+    start = time.monotonic()
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    times.sort()
+    assert all(t - start >= 0.02 * i - 0.001 for i, t in enumerate(times)), [t - start for t in times]
+
+
+def test_cross_category_owner():
+    """并发抓取时交叉列出的论文归属配置中的第一个类别，与线程完成顺序无关"""
+    papers = make_fetcher(SlowCategoryTransport(corpus(), CATEGORIES[0]), max_workers=3).fetch_arxiv_papers()
+    assert len(papers) == 60
+    assert all(paper['venue'] == CATEGORIES[0] for paper in papers)
+    assert all(paper['query_categories'] == CATEGORIES for paper in papers)
+
+
+def test_cross_listed_built_once():
+    """交叉列出的论文在各类别间共用一个论文字典，只构建一次；arxiv 后端与 atom 后端结果相同"""
+    built = []
+    original = fetch_papers.result_to_entry
+    
+    def spy(result):
+        built.append(result.entry_id)
+        return original(result)
+    
+    fetch_papers.result_to_entry = spy
+    try:
+        papers = make_fetcher(SlowCategoryTransport(corpus(), CATEGORIES[1]), max_workers=3).fetch_arxiv_papers()
+    finally:
+        fetch_papers.result_to_entry = original
+    assert len(papers) == 60
+    assert sorted(built) == sorted(set(built)) and len(built) == 60
+    atom = make_fetcher(SlowCategoryTransport(corpus(), CATEGORIES[1]), backend='atom').fetch_arxiv_papers()
+    assert atom == papers
+
+
+def dated_corpus():
+    """相对今天的三篇论文：窗口内提交、窗口前提交但窗口内修订、窗口前提交且未修订"""
+    today = datetime.now(timezone.utc).date()
+    papers = corpus(3)
+    for paper, (published, updated) in zip(papers, [(1, 1), (30, 1), (40, 40)]):
+        paper['published'] = (today - timedelta(days=published)).isoformat()
+        paper['updated'] = (today - timedelta(days=updated)).isoformat()
+    return papers
+
+
+def test_early_stop():
+    """默认不提前停止，窗口内修订的旧论文照常抓取；开启 early_stop 时按提交时间停止翻页"""
+    papers = dated_corpus()
+    fetched = make_fetcher(CorpusTransport(papers), categories=['cs.AI'], days_back=7,
+                           page_size=1).fetch_arxiv_papers()
+    assert [paper['id'] for paper in fetched] == [papers[0]['id'], papers[1]['id']]
+    
+    fetcher = make_fetcher(CorpusTransport(papers), categories=['cs.AI'], days_back=7, page_size=1, early_stop=True)
+    fetched = fetcher.fetch_arxiv_papers()
+    assert [paper['id'] for paper in fetched] == [papers[0]['id']]
+    counters = {c['counter']: c['value'] for c in fetcher.metrics.report()['counters']}
+    assert counters['api_requests'] == 2
+
+
+def test_truncated_watermark():
+    """类别被 max_results 截断时不推进水位线，完整覆盖时间窗口后才推进"""
+    papers = corpus(10)
+    fetcher = make_fetcher(CorpusTransport(papers), categories=['cs.AI'], max_results=3, page_size=3)
+    assert len(fetcher.fetch_arxiv_papers()) == 3
+    assert fetcher.new_watermarks == {}
+    
+    fetcher = make_fetcher(CorpusTransport(papers), categories=['cs.AI'])
+    assert len(fetcher.fetch_arxiv_papers()) == 10
+    newest = max(paper['updated'] for paper in papers)
+    assert fetcher.new_watermarks['cs.AI'].startswith(newest)
+
+
+def test_incremental_requests():
+    """增量抓取时有水位线的类别在结果早于起始时间后停止翻页，第二次抓取只请求新论文所在的页"""
+    papers = corpus()
+    with tempfile.TemporaryDirectory() as directory:
+        first = make_fetcher(CorpusTransport(papers), categories=['cs.AI'], page_size=5, incremental=True)
+        first.watermark_path = Path(directory) / "fetch_watermarks.json"
+        assert len(first.fetch_arxiv_papers()) == 60
+        first.save_watermarks()
+        
+        # 新提交的论文排在结果最前面，重叠窗口之后的旧论文所在的页不再请求
+        today = datetime.now(timezone.utc).date().isoformat()
+        newer = [dict(paper, id=f"2699.{i:05d}v1", published=today, updated=today) for i, paper in enumerate(corpus(2))]
+        second = make_fetcher(CorpusTransport(newer + papers), categories=['cs.AI'], page_size=5, incremental=True)
+        second.watermark_path = first.watermark_path
+        fetched = second.fetch_arxiv_papers()
+        assert [paper['id'] for paper in fetched][:2] == [paper['id'] for paper in newer]
+        
+        requests = [{c['counter']: c['value'] for c in fetcher.metrics.report()['counters']}['api_requests']
+                    for fetcher in (first, second)]
+        assert requests[0] == 12 and requests[1] <= 2, requests
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 论文抓取测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_parallel_matches_serial, test_rate_limiter_shared, test_cross_category_owner,
+                 test_cross_listed_built_once, test_early_stop, test_truncated_watermark, test_incremental_requests):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
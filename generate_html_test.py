@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+网页生成测试 - 校验增量构建、构建清单、月度列表、分页、派生字段缓存和搜索索引
+"""
+
+import gzip
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts import generate_html
+from scripts.card_template import DEFAULT_BADGE_CLASS
+from scripts.generate_html import HTMLGenerator
+from scripts.search_index import search
+from scripts.storage import open_store
+
+CONFIG_PATH = str(project_root / "config.yaml")
+
+
+def make_paper(paper_id: str, published: str, **fields) -> dict:
+    """最小的论文字典"""
+    paper = {'id': paper_id, 'title': f"Paper {paper_id}", 'abstract': f"Abstract of {paper_id}.",
+             'authors': ['Alice', 'Bob'], 'published': published, 'updated': published,
+             'url': f"https://arxiv.org/abs/{paper_id}", 'pdf_url': f"https://arxiv.org/pdf/{paper_id}",
+             'categories': ['cs.CV'], 'primary_category': 'cs.CV', 'tags': ['Computer Vision']}
+    paper.update(fields)
+    return paper
+
+
+def sample_papers() -> list:
+    """跨两个月的论文"""
+    return [make_paper(f"2510.{i:05d}v1", f"2025-10-{i % 28 + 1:02d}") for i in range(1, 8)] + \
+        [make_paper(f"2509.{i:05d}v1", f"2025-09-{i % 28 + 1:02d}") for i in range(1, 5)]
+
+
+def build_site(root: Path, papers: list = None, incremental: bool = True, **options) -> HTMLGenerator:
+    """在 root/data 保存论文（分片存储）并生成网页到 root/docs，options 覆盖生成器的输出选项"""
+    data_path = root / "data" / "papers.json"
+    if papers:
+        open_store(data_path, backend='sharded').add(papers)
+    generator = HTMLGenerator(str(data_path), str(root / "docs"), incremental=incremental, config_path=CONFIG_PATH)
+    for name, value in options.items():
+        setattr(generator, name, value)
+    generator.run()
+    return generator
+
+
+def read_json(path: Path):
+    """读取 JSON 文件"""
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def test_incremental_build():
+    """第二次构建跳过全部文件；构建清单保存在 data/ 下，不进入部署目录"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        first = build_site(root, sample_papers())
+        assert first.written_count > 0
+        manifest_path = root / "data" / "build_manifest.json"
+        assert manifest_path.exists()
+        assert not (root / "docs" / "data" / "build_manifest.json").exists()
+        
+        second = build_site(root)
+        assert second.written_count == 0, second.written_count
+        
+        # 只新增十月的论文时，九月的数据文件不会重新生成
+        september = root / "docs" / "data" / "2025-09.json"
+        september_mtime = september.stat().st_mtime_ns
+        third = build_site(root, [make_paper('2510.00100v1', '2025-10-20')])
+        assert third.written_count > 0
+        assert september.stat().st_mtime_ns == september_mtime
+        assert any(p['id'] == '2510.00100v1' for p in json.loads((root / "docs" / "data" / "2025-10.json").read_text()))
+
+
+def test_restored_outputs():
+    """输出文件从别处恢复（修改时间变化）时按内容哈希判断，内容一致仍跳过，被改动则重新生成"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        build_site(root, sample_papers())
+        september = root / "docs" / "data" / "2025-09.json"
+        os.utime(september, ns=(0, 0))
+        assert build_site(root).written_count == 0
+        
+        september.write_text('[]', encoding='utf-8')
+        rebuilt = build_site(root)
+        assert rebuilt.written_count > 0
+        assert len(json.loads(september.read_text(encoding='utf-8'))) == 4
+
+
+def test_legacy_manifest_removed():
+    """旧版本写在部署目录中的构建清单在保存新清单时删除"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        legacy = root / "docs" / "data" / "build_manifest.json"
+        legacy.parent.mkdir(parents=True)
+        legacy.write_text('{}', encoding='utf-8')
+        build_site(root, sample_papers())
+        assert not legacy.exists()
+
+
+def test_empty_archive():
+    """数据文件不存在或归档为空时生成空网站，不会因缺少搜索分片目录而出错"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        missing = build_site(root)
+        assert missing.papers == []
+        assert (root / "docs" / "index.html").exists()
+        meta = json.loads((root / "docs" / "data" / "search" / "meta.json").read_text(encoding='utf-8'))
+        assert meta['doc_count'] == 0 and meta['shards'] == []
+        assert not (root / "docs" / "data" / "search" / "shards").exists()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        open_store(root / "data" / "papers.json", backend='sharded').add([])
+        assert build_site(root).papers == []
+        assert (root / "docs" / "data" / "index.json").exists()
+
+
+def test_month_list_files():
+    """月度列表文件不含摘要、带分块编号；摘要按块拆分，块数减少后旧块被删除"""
+    papers = sample_papers()
+    papers[0]['abstract'] = 'Code: https://github.com/example/repo.'
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        build_site(root, papers, abstract_chunk_size=3)
+        data_dir = root / "docs" / "data"
+        october = read_json(data_dir / "2025-10.list.json")
+        assert len(october) == 7
+        assert [item['chunk'] for item in october] == [0, 0, 0, 1, 1, 1, 2]
+        assert all('abstract' not in item for item in october)
+        by_id = {item['id']: item for item in october}
+        assert by_id[papers[0]['id']]['code_link'] == 'https://github.com/example/repo'
+        
+        chunk_dir = data_dir / "abstracts" / "2025-10"
+        assert sorted(path.name for path in chunk_dir.iterdir() if path.suffix == '.json') == ['0.json', '1.json', '2.json']
+        abstracts = {}
+        for chunk in range(3):
+            abstracts.update(read_json(chunk_dir / f"{chunk}.json"))
+        assert abstracts == {paper['id']: paper['abstract'] for paper in papers if paper['published'] >= '2025-10'}
+        # 每篇论文的摘要都在列表文件标注的块中
+        for item in october:
+            assert item['id'] in read_json(chunk_dir / f"{item['chunk']}.json")
+        
+        # 块大小恰好等于论文数时只有一块
+        build_site(root, abstract_chunk_size=7)
+        assert {path.name.split('.')[0] for path in chunk_dir.iterdir()} == {'0'}  # 预压缩文件也一并删除
+        assert not any(key.startswith('data/abstracts/2025-10/1.') for key in read_json(root / "data" / "build_manifest.json"))
+        assert {item['chunk'] for item in read_json(data_dir / "2025-10.list.json")} == {0}
+
+
+def page_numbers(pagination: str) -> list:
+    """分页链接中的页码（不含上一页/下一页）"""
+    return [int(number) for number in re.findall(r'>(\d+)</a>', pagination)]
+
+
+def test_render_pagination():
+    """只有一页时不显示分页；首末页不显示上一页/下一页；远离当前页的页码以省略号代替"""
+    generator = HTMLGenerator(config_path=CONFIG_PATH, incremental=False)
+    assert generator.render_pagination(1, 1) == ''
+    
+    first = generator.render_pagination(1, 10)
+    assert '上一页' not in first and 'href="2.html">下一页' in first
+    assert page_numbers(first) == [1, 2, 3, 4, 10] and first.count('…') == 1
+    
+    last = generator.render_pagination(10, 10)
+    assert '下一页' not in last and 'href="9.html">← 上一页' in last
+    assert page_numbers(last) == [1, 7, 8, 9, 10]
+    
+    middle = generator.render_pagination(6, 12)
+    assert page_numbers(middle) == [1, 3, 4, 5, 6, 7, 8, 9, 12] and middle.count('…') == 2
+    assert '<a class="filter-btn active" href="6.html">6</a>' in middle
+    
+    # 与首末页相邻时不显示省略号
+    assert '…' not in generator.render_pagination(4, 8)
+
+
+def test_paginated_pages():
+    """每页论文数恰好整除时不生成空页；页数减少后删除多余的页面及其清单记录"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        papers = sample_papers() + [make_paper('2510.00100v1', '2025-10-20')]  # 十月共 8 篇
+        build_site(root, papers, papers_per_page=4)
+        month_dir = root / "docs" / "pages" / "month" / "2025-10"
+        assert sorted(path.name for path in month_dir.iterdir()) == ['1.html', '2.html']
+        assert [(month_dir / f"{page}.html").read_text(encoding='utf-8').count('<article class="paper-card"')
+                for page in (1, 2)] == [4, 4]
+        assert '第 2/2 页' in (month_dir / "2.html").read_text(encoding='utf-8')
+        
+        tag_dir = root / "docs" / "pages" / "tag" / "computer-vision"
+        assert sorted(path.name for path in tag_dir.iterdir()) == ['1.html', '2.html', '3.html']
+        
+        build_site(root, papers_per_page=5)
+        assert sorted(path.name for path in month_dir.iterdir()) == ['1.html', '2.html']
+        assert (month_dir / "2.html").read_text(encoding='utf-8').count('<article class="paper-card"') == 3
+        assert sorted(path.name for path in tag_dir.iterdir()) == ['1.html', '2.html', '3.html']
+        
+        build_site(root, papers_per_page=8)
+        assert sorted(path.name for path in month_dir.iterdir()) == ['1.html']
+        assert sorted(path.name for path in tag_dir.iterdir()) == ['1.html', '2.html']
+        manifest = read_json(root / "data" / "build_manifest.json")
+        assert 'pages/month/2025-10/2.html' not in manifest and 'pages/tag/computer-vision/3.html' not in manifest
+        assert 'pagination' not in (month_dir / "1.html").read_text(encoding='utf-8')
+
+
+def test_derived_cache():
+    """代码/项目链接和会议徽章样式按摘要和会议的哈希缓存：再次构建时不重新提取，内容变化的论文才重新计算"""
+    papers = sample_papers()
+    papers[0]['abstract'] = 'Code: https://github.com/example/repo. Project: https://example.org/demo'
+    papers[1]['abstract'] = 'See https://github.com/example/other for details.'
+    papers[1]['conference'] = 'CVPR 2025'
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        build_site(root, papers)
+        cache = read_json(root / "data" / "derived_cache.json")
+        assert len(cache) == len(papers)
+        assert {key: cache[papers[0]['id']][key] for key in ('code', 'project')} == \
+            {'code': 'https://github.com/example/repo', 'project': 'https://example.org/demo'}
+        assert cache[papers[1]['id']]['code'] == 'https://github.com/example/other'
+        assert cache[papers[1]['id']]['venue_class'] == 'badge-cvpr'
+        assert set(cache[papers[2]['id']]) == {'hash'}  # 没有链接和会议时只保存哈希
+        
+        extracted = []
+        original_extract = HTMLGenerator.extract_code_links
+        
+        def spy_extract(self, abstract):
+            extracted.append(abstract)
+            return original_extract(self, abstract)
+        
+        HTMLGenerator.extract_code_links = spy_extract
+        try:
+            generator = HTMLGenerator(str(root / "data" / "papers.json"), str(root / "docs"), config_path=CONFIG_PATH)
+            generator.load_papers()
+            for paper in generator.papers:
+                generator.render_paper_card(paper)
+            assert extracted == []
+            assert not generator.derived_cache_dirty
+            
+            changed = dict(papers[2], abstract='Code: https://gitlab.com/example/new')
+            assert generator.get_derived_fields(changed)['code'] == 'https://gitlab.com/example/new'
+            assert extracted == ['Code: https://gitlab.com/example/new']
+            assert generator.derived_cache_dirty
+            
+            # 卡片使用缓存中的徽章样式；会议变化后重新计算
+            generator.derived_cache[papers[1]['id']]['venue_class'] = 'badge-cached'
+            assert 'venue-badge badge-cached' in generator.render_paper_card(papers[1])
+            assert generator.get_derived_fields(dict(papers[1], conference='ICCV 2025'))['venue_class'] == 'badge-iccv'
+        finally:
+            HTMLGenerator.extract_code_links = original_extract
+
+
+def test_venue_badge():
+    """会议徽章：没有会议信息时为预印本，会议名按关键词（不区分大小写）匹配样式，卡片中使用同一样式"""
+    generator = HTMLGenerator(config_path=CONFIG_PATH, incremental=False)
+    assert generator.get_venue_badge(None) == ('preprint', 'Preprint')
+    assert generator.get_venue_badge('NeurIPS 2025') == ('badge-neurips', 'NeurIPS 2025')
+    assert generator.get_venue_badge('Findings of EMNLP 2025') == ('badge-emnlp', 'Findings of EMNLP 2025')
+    assert generator.get_venue_badge('Nature Communications') == (DEFAULT_BADGE_CLASS, 'Nature Communications')
+    
+    card = generator.render_paper_card(make_paper('2510.00001v1', '2025-10-02', conference='CVPR 2025'))
+    assert 'badge-cvpr' in card and 'CVPR 2025' in card
+
+
+def read_search_index(root: Path):
+    """读取生成的搜索索引，返回 (文档ID列表, {前缀: 分片}, 分片前缀长度)"""
+    search_dir = root / "docs" / "data" / "search"
+    meta = read_json(search_dir / "meta.json")
+    shards = {prefix: read_json(search_dir / "shards" / f"{prefix}.json") for prefix in meta['shards']}
+    return read_json(search_dir / "docs.json"), shards, meta['prefix_length']
+
+
+def test_search_index():
+    """搜索索引可查回对应论文；文档编号从旧到新分配，追加更新的论文时已有分片的内容不变"""
+    papers = sample_papers()
+    papers[0]['abstract'] = 'Diffusion transformers for video generation.'
+    papers[5]['abstract'] = 'Video tokenizers with diffusion decoders.'
+    papers[8]['abstract'] = 'Sparse attention for long context transformers.'
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        build_site(root, papers)
+        doc_ids, shards, prefix_length = read_search_index(root)
+        assert doc_ids == [p['id'] for p in sorted(papers, key=lambda p: (p['published'], p['id']))]
+        assert set(search(doc_ids, shards, 'diffusion video', prefix_length)) == {papers[0]['id'], papers[5]['id']}
+        assert search(doc_ids, shards, 'transform', prefix_length) == \
+            sorted([papers[0]['id'], papers[8]['id']], key=doc_ids.index)
+        assert search(doc_ids, shards, 'diffusion sparse', prefix_length) == []
+        
+        shard_dir = root / "docs" / "data" / "search" / "shards"
+        before = {path.name: path.read_bytes() for path in shard_dir.iterdir()}
+        
+        # 新论文的词项都不在已有分片中：已有分片文件逐字节不变，只新增分片
+        newer = make_paper('2510.00100v1', '2025-10-30', title='Quantum yoga', authors=['Zed'],
+                           abstract='Quokka zebra.')
+        build_site(root, [newer])
+        doc_ids, shards, prefix_length = read_search_index(root)
+        assert doc_ids[-1] == newer['id'] and len(doc_ids) == len(papers) + 1
+        assert {name: (shard_dir / name).read_bytes() for name in before} == before
+        assert search(doc_ids, shards, 'quokka', prefix_length) == [newer['id']]
+        
+        # 新论文与已有论文共享词项时，只有这些词项所在的分片改变
+        before = {path.name: path.read_bytes() for path in shard_dir.iterdir()}
+        build_site(root, [make_paper('2510.00101v1', '2025-10-31', title='Sparse quokka', authors=['Zed'],
+                                     abstract='Zebra.')])
+        changed = {name for name in before if (shard_dir / name).read_bytes() != before[name]}
+        assert changed <= {'sp.json', 'sp.json.gz', 'sp.json.br', 'qu.json', 'qu.json.gz', 'qu.json.br',
+                           'ze.json', 'ze.json.gz', 'ze.json.br'}, changed
+
+
+def test_streamed_index():
+    """流式写出的 index.html 与拼接整页字符串的结果逐字节相同"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        open_store(root / "data" / "papers.json", backend='sharded').add(sample_papers())
+        generator = HTMLGenerator(str(root / "data" / "papers.json"), str(root / "docs"), config_path=CONFIG_PATH)
+        generator.index_max_papers = 5
+        streamed = {}
+        original_write_stream = generator.write_stream
+        
+        def capture(path, chunks, input_hash=None):
+            chunks = list(chunks)
+            streamed[path.name] = chunks
+            return original_write_stream(path, iter(chunks), input_hash=input_hash)
+        
+        generator.write_stream = capture
+        generator.run()
+        
+        # 基线：在页面模板中直接替换为完整的论文列表字符串
+        head, tail = streamed['index.html'][0], streamed['index.html'][-1]
+        baseline = HTMLGenerator(str(root / "data" / "papers.json"), str(root / "docs"), config_path=CONFIG_PATH)
+        baseline.load_papers()
+        baseline.papers = list(baseline.iter_latest_papers())[:5]
+        expected = head + baseline.generate_papers_html() + tail
+        assert (root / "docs" / "index.html").read_text(encoding='utf-8') == expected
+        assert expected.count('class="paper-card"') == 5
+        
+        # 没有论文时写出占位提示
+        empty = HTMLGenerator(config_path=CONFIG_PATH, incremental=False)
+        assert ''.join(empty.iter_papers_html([])) == empty.generate_papers_html() == '<p class="no-results">暂无论文数据</p>'
+
+
+def test_stats_match_multi_pass():
+    """单次遍历的统计（stats.json、index.json、分类按钮）与逐项多次遍历的旧算法结果相同"""
+    papers = sample_papers()
+    papers[0].update(conference='CVPR 2025', tags=['Computer Vision', 'Multimodal'])
+    papers[3].update(conference='ICLR 2026', tags=['Machine Learning', 'Quantum'])
+    papers[8].update(conference='ACL 2025', tags=['Natural Language Processing'])
+    papers[9]['tags'] = []
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        generator = build_site(root, papers)
+        stats = read_json(root / "docs" / "data" / "stats.json")
+        
+        # 旧算法：每个数字单独遍历一次论文
+        config_tags = ['Computer Vision', 'Natural Language Processing', 'Machine Learning', 'Robotics', 'Multimodal']
+        months = sorted({p['published'][:7] for p in papers}, reverse=True)
+        by_month = {month: [p for p in papers if p['published'][:7] == month] for month in months}
+        
+        def counts(month_papers):
+            return {'count': len(month_papers),
+                    'published_count': sum(1 for p in month_papers if p.get('conference')),
+                    'preprint_count': sum(1 for p in month_papers if not p.get('conference')),
+                    'tags': {tag: sum(1 for p in month_papers if tag in p.get('tags', []))
+                             for tag in config_tags + [t for p in month_papers for t in p.get('tags', [])]}}
+        
+        assert stats == {'total': counts(papers), 'months': {month: counts(by_month[month]) for month in months}}
+        assert list(stats['months']) == months
+        assert read_json(root / "docs" / "data" / "index.json") == \
+            [{'month': month, **{k: v for k, v in counts(by_month[month]).items() if k != 'tags'}} for month in months]
+        
+        buttons = generator.generate_category_buttons()
+        for tag in config_tags:
+            assert f'data-category="{tag}">' in buttons
+        assert f'({sum(1 for p in papers if "Computer Vision" in p.get("tags", []))})' in buttons
+
+
+def check_precompressed(data_dir: Path) -> int:
+    """每个 .gz / .br 文件都能解压回旁边的 JSON 文件，返回检查的压缩文件数"""
+    checked = 0
+    for path in data_dir.rglob('*.json'):
+        source = path.read_bytes()
+        json.loads(source)
+        gz_path, br_path = path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')
+        if gz_path.exists():
+            assert gzip.decompress(gz_path.read_bytes()) == source, gz_path
+            checked += 1
+        if br_path.exists():
+            assert generate_html.brotli is not None, br_path
+            assert generate_html.brotli.decompress(br_path.read_bytes()) == source, br_path
+            checked += 1
+        if len(source) < generate_html.PRECOMPRESS_MIN_SIZE:
+            assert not gz_path.exists() and not br_path.exists(), path
+    return checked
+
+
+def test_precompressed_siblings():
+    """write_data_file 生成的 .gz / .br 文件解压后与 JSON 文件逐字节相同，JSON 更新后压缩文件随之更新"""
+    papers = [dict(paper, abstract=f"{paper['abstract']} " + 'diffusion models for dense prediction ' * 80)
+              for paper in sample_papers()]
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        generator = build_site(root, papers)
+        assert 'gzip' in generator.precompress
+        data_dir = root / "docs" / "data"
+        assert (data_dir / "2025-10.json.gz").exists()
+        first = check_precompressed(data_dir)
+        assert first > 0
+        
+        build_site(root, [make_paper('2510.00100v1', '2025-10-20', abstract='Sparse attention. ' * 200)])
+        assert any(p['id'] == '2510.00100v1' for p in json.loads(gzip.decompress((data_dir / "2025-10.json.gz").read_bytes())))
+        assert check_precompressed(data_dir) >= first
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 网页生成测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_incremental_build, test_restored_outputs, test_legacy_manifest_removed,
+                 test_empty_archive, test_month_list_files, test_render_pagination, test_paginated_pages,
+                 test_derived_cache, test_venue_badge, test_search_index,
+                 test_streamed_index, test_stats_match_multi_pass,
+                 test_precompressed_siblings):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+运行指标测试 - 校验阶段计时、计数器、Prometheus 输出，以及回放抓取时记录的指标
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmark import CorpusTransport, synthetic_corpus
+from scripts.fetch_papers import PaperFetcher
+from scripts.metrics import Metrics
+from scripts.transport import RecordingTransport
+
+CONFIG_PATH = str(project_root / "config.yaml")
+
+
+def test_stages_and_counters():
+    """同名同标签的阶段和计数器累加，不同标签分别统计"""
+    metrics = Metrics('test')
+    with metrics.stage('render', items=2, page='index'):
+        pass
+    with metrics.stage('render', page='index') as stage:
+        stage.items = 3
+    metrics.add_time('render', 0.5, items=1, page='archive')
+    metrics.count('bytes_written', 100)
+    metrics.count('bytes_written', 50)
+    
+    report = metrics.report()
+    stages = {(s['stage'], s['labels'].get('page')): s for s in report['stages']}
+    assert stages[('render', 'index')]['calls'] == 2
+    assert stages[('render', 'index')]['items'] == 5
+    assert stages[('render', 'archive')]['seconds'] == 0.5
+    assert report['counters'] == [{'counter': 'bytes_written', 'labels': {}, 'value': 150}]
+
+
+def test_prometheus_format():
+    """Prometheus 文本格式：带 HELP/TYPE，标签值转义"""
+    metrics = Metrics('test')
+    metrics.add_time('fetch_category', 1.5, items=10, category='cs."AI"')
+    metrics.count('api_requests', 2, category='cs.AI')
+    text = metrics.to_prometheus()
+    assert '# TYPE paper_daily_stage_seconds_total counter' in text
+    assert 'paper_daily_stage_seconds_total{run="test",stage="fetch_category",category="cs.\\"AI\\""} 1.5' in text
+    assert 'paper_daily_api_requests_total{run="test",category="cs.AI"} 2' in text
+    assert text.endswith('\n')
+
+
+def test_fetch_metrics():
+    """抓取时记录每个类别的耗时、请求页数、会议提取和分类"""
+    papers = synthetic_corpus(PaperFetcher(CONFIG_PATH).config, 50, seed=3)
+    with tempfile.TemporaryDirectory() as directory:
+        fetcher = PaperFetcher(CONFIG_PATH, transport=RecordingTransport(directory, inner=CorpusTransport(papers)))
+        fetcher.config['sources']['arxiv'].update({
+            'categories': ['cs.AI'], 'max_results': None, 'page_size': 20, 'days_back': 36500,
+            'delay_seconds': 0, 'max_workers': 1, 'early_stop': False, 'incremental': False,
+        })
+        fetcher.fetch_arxiv_papers()
+    
+    report = fetcher.metrics.report()
+    stages = {s['stage']: s for s in report['stages']}
+    counters = {c['counter']: c['value'] for c in report['counters']}
+    assert stages['fetch_category']['items'] == 50
+    assert stages['fetch_category']['labels'] == {'category': 'cs.AI'}
+    assert stages['venue_extraction']['calls'] == 50
+    assert stages['classification']['items'] == 50
+    assert counters['api_requests'] == 3
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 运行指标测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_stages_and_counters, test_prometheus_format, test_fetch_metrics):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+SQLite 论文库测试 - 校验导入、索引查询，以及含标点、连字符的全文搜索（FTS5 与 LIKE 回退）
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.paper_db import PaperDatabase, fts_query
+
+PAPERS = [
+    {'id': '2510.00001v1', 'title': 'Text-to-Image Diffusion Models', 'published': '2025-10-02',
+     'abstract': 'We study text-to-image generation with diffusion.', 'tags': ['Generative Models']},
+    {'id': '2510.00002v1', 'title': 'Fast Kernels in C++', 'published': '2025-10-01',
+     'abstract': 'What is the fastest way to write 100% efficient kernels?', 'tags': ['Systems']},
+    {'id': '2509.00001v1', 'title': 'Image Classification "in the wild"', 'published': '2025-09-30',
+     'abstract': 'Robust image classification under distribution shift.', 'tags': ['Computer Vision']},
+]
+
+
+def open_database(directory: str) -> PaperDatabase:
+    """临时目录中导入了 PAPERS 的论文库"""
+    db = PaperDatabase(str(Path(directory) / "papers.db"))
+    db.import_papers(PAPERS)
+    return db
+
+
+def search_ids(db: PaperDatabase, query: str) -> list:
+    """搜索结果的 ID（排序后）"""
+    return sorted(paper['id'] for paper in db.search(query))
+
+
+def test_queries():
+    """按日期、日期范围和标签查询"""
+    with tempfile.TemporaryDirectory() as directory:
+        db = open_database(directory)
+        assert db.count() == 3
+        assert [p['id'] for p in db.get_papers_by_date('2025-10-01')] == ['2510.00002v1']
+        assert [p['id'] for p in db.get_papers_by_date_range('2025-09-30', '2025-10-01')] == \
+            ['2510.00002v1', '2509.00001v1']
+        assert [p['id'] for p in db.get_papers_by_category('Systems')] == ['2510.00002v1']
+        assert db.count_papers_by_category() == {'Generative Models': 1, 'Systems': 1, 'Computer Vision': 1}
+        db.close()
+
+
+def test_search_punctuation():
+    """FTS5 搜索词中的连字符、+、?、引号和 % 按普通文本处理，不会导致查询出错"""
+    assert fts_query('text-to-image "wild') == '"text-to-image" """wild"'
+    with tempfile.TemporaryDirectory() as directory:
+        db = open_database(directory)
+        if db.has_fts:
+            assert search_ids(db, 'text-to-image') == ['2510.00001v1']
+            assert search_ids(db, 'C++') == ['2510.00002v1']
+            assert search_ids(db, 'what?') == ['2510.00002v1']
+            assert search_ids(db, '"in the wild"') == ['2509.00001v1']
+            assert search_ids(db, '100%') == ['2510.00002v1']
+            assert search_ids(db, 'image classification') == ['2509.00001v1']
+            assert search_ids(db, 'NOT OR AND') == []
+        assert search_ids(db, '  ') == []
+        db.close()
+
+
+def test_search_like_fallback():
+    """没有 FTS5 时按子串匹配，每个词都须出现，% 和 _ 按普通字符匹配"""
+    with tempfile.TemporaryDirectory() as directory:
+        db = open_database(directory)
+        db.has_fts = False
+        assert search_ids(db, 'text-to-image') == ['2510.00001v1']
+        assert search_ids(db, 'C++ kernels') == ['2510.00002v1']
+        assert search_ids(db, '100%') == ['2510.00002v1']
+        assert search_ids(db, '0%_') == []
+        assert search_ids(db, 'image classification') == ['2509.00001v1']
+        db.close()
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 SQLite 论文库测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_queries, test_search_punctuation, test_search_like_fallback):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+批量重新分类测试 - 校验只写回标签变化的论文，分片存储逐月写回
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts import retag_papers
+from scripts.storage import ShardedPaperStore, open_store
+
+CONFIG = {'categories': {'Vision': {'keywords': ['image']}, 'Language': {'keywords': ['text']}}}
+
+
+def make_paper(paper_id: str, published: str, title: str, tags: list) -> dict:
+    """最小的论文字典"""
+    return {'id': paper_id, 'title': title, 'abstract': '', 'published': published, 'tags': tags}
+
+
+def test_retag_per_month():
+    """分片存储每个月单独写回，标签未变化的月份不重写"""
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = Path(directory) / "papers.json"
+        store = open_store(data_path, backend='sharded')
+        store.add([
+            make_paper('2510.00001v1', '2025-10-02', 'Image models', ['Vision']),
+            make_paper('2509.00001v1', '2025-09-02', 'Text and image', ['Vision']),
+            make_paper('2508.00001v1', '2025-08-02', 'Text models', []),
+        ])
+        october_hash = store.month_hash('2025-10')
+        
+        updates = []
+        original_update = ShardedPaperStore.update
+        
+        def spy_update(self, papers):
+            updates.append([paper['id'] for paper in papers])
+            return original_update(self, papers)
+        
+        ShardedPaperStore.update = spy_update
+        try:
+            stats = retag_papers.retag_papers(CONFIG, str(data_path), workers=1)
+        finally:
+            ShardedPaperStore.update = original_update
+        
+        assert stats == {'total': 3, 'changed': 2}
+        assert updates == [['2509.00001v1'], ['2508.00001v1']]
+        reopened = open_store(data_path)
+        assert reopened.month_hash('2025-10') == october_hash
+        assert {p['id']: p['tags'] for p in reopened.load()} == {
+            '2510.00001v1': ['Vision'], '2509.00001v1': ['Vision', 'Language'], '2508.00001v1': ['Language']}
+        
+        # dry-run 只统计不写回
+        assert retag_papers.retag_papers({'categories': {}}, str(data_path), workers=1, dry_run=True)['changed'] == 3
+        assert open_store(data_path).load_month('2025-10')[0]['tags'] == ['Vision']
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 批量重新分类测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_retag_per_month,):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
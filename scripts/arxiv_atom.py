@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+ArXiv Atom 客户端
+直接请求 ArXiv API，用 lxml.etree.iterparse 逐条目解析 Atom 响应（解析完的元素随即释放，不保留整棵树），
+每个条目直接解析为论文字典，不经过 arxiv 包的 Result / Author / Link 对象。
+每页响应先完整读取再解析（一页最多 page_size 条，录制和回放也需要完整的响应原文）。请求通过传输对象发出（默认所有线程共用一个
+keep-alive 连接池，见 scripts/transport.py），批量回填时瓶颈在网络而不是逐对象的开销。
+
+请求 URL 与 arxiv 包完全相同，两种抓取后端录制的响应可以互相回放。
+解析结果与 arxiv 包一致：标题中的连续空白合并为一个空格，摘要保留原文。
+"""
+
+import io
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+import logging
+
+import requests
+from lxml import etree
+
+from scripts.transport import DEFAULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://export.arxiv.org/api/query"
+USER_AGENT = "DailyPaper (https://github.com/4everWZ/DailyPaper)"
+
+# 重试等待：第 n 次重试前等待 RETRY_BACKOFF * 2 ** (n - 1) 秒，最多 RETRY_MAX_DELAY 秒；
+# 响应带 Retry-After 时按其等待
+RETRY_BACKOFF = 3.0
+RETRY_MAX_DELAY = 60.0
+
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_ARXIV = '{http://arxiv.org/schemas/atom}'
+_OPENSEARCH = '{http://a9.com/-/spec/opensearch/1.1/}'
+
+_ENTRY = _ATOM + 'entry'
+_TOTAL_RESULTS = _OPENSEARCH + 'totalResults'
+_ID = _ATOM + 'id'
+_TITLE = _ATOM + 'title'
+_SUMMARY = _ATOM + 'summary'
+_PUBLISHED = _ATOM + 'published'
+_UPDATED = _ATOM + 'updated'
+_AUTHOR = _ATOM + 'author'
+_NAME = _ATOM + 'name'
+_LINK = _ATOM + 'link'
+_CATEGORY = _ATOM + 'category'
+_PRIMARY_CATEGORY = _ARXIV + 'primary_category'
+_COMMENT = _ARXIV + 'comment'
+_JOURNAL_REF = _ARXIV + 'journal_ref'
+
+_WHITESPACE = re.compile(r'\s+')
+
+# 一个条目：(提交时间, 更新时间, 论文字典)
+Entry = Tuple[datetime, datetime, Dict]
+
+
+def query_url(category: str, start: int, page_size: int) -> str:
+    """按提交时间降序查询一个类别的请求 URL"""
+    return API_URL + '?' + urlencode({
+        'search_query': f"cat:{category}",
+        'id_list': '',
+        'sortBy': 'submittedDate',
+        'sortOrder': 'descending',
+        'start': str(start),
+        'max_results': str(page_size),
+    })
+
+
+def retry_delay(try_index: int, retry_after: Optional[str] = None) -> float:
+    """第 try_index 次重试（从 1 开始）前的等待秒数；Retry-After 可以是秒数或 HTTP 日期"""
+    if retry_after:
+        retry_after = retry_after.strip()
+        if retry_after.isdigit():
+            return float(retry_after)
+        try:
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return min(RETRY_BACKOFF * 2 ** (try_index - 1), RETRY_MAX_DELAY)
+
+
+def parse_datetime(text: Optional[str]) -> Optional[datetime]:
+    """解析 Atom 时间（如 2025-10-31T17:59:46Z）为 UTC 时间"""
+    if not text:
+        return None
+    value = datetime.fromisoformat(text.strip().replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_entry(element) -> Optional[Entry]:
+    """把 <entry> 元素解析为论文字典，缺少 ID 或时间时返回 None
+    
+    venue / query_categories 由抓取器按查询的类别填写，conference / tags 在会议提取和分类后添加。
+    """
+    entry_id = title = summary = published = updated = comment = journal_ref = pdf_url = None
+    primary_category = ''
+    authors = []
+    categories = []
+    for child in element:
+        tag = child.tag
+        if tag == _AUTHOR:
+            authors.append(child.findtext(_NAME) or '')
+        elif tag == _CATEGORY:
+            term = child.get('term')
+            if term is not None:
+                categories.append(term)
+        elif tag == _LINK:
+            if pdf_url is None and child.get('title') == 'pdf':
+                pdf_url = child.get('href')
+        elif tag == _ID:
+            entry_id = child.text
+        elif tag == _TITLE:
+            title = child.text
+        elif tag == _SUMMARY:
+            summary = child.text
+        elif tag == _PUBLISHED:
+            published = child.text
+        elif tag == _UPDATED:
+            updated = child.text
+        elif tag == _PRIMARY_CATEGORY:
+            primary_category = child.get('term') or ''
+        elif tag == _COMMENT:
+            comment = child.text
+        elif tag == _JOURNAL_REF:
+            journal_ref = child.text
+    
+    published_at = parse_datetime(published)
+    updated_at = parse_datetime(updated)
+    if not entry_id or published_at is None or updated_at is None:
+        logger.warning(f"跳过缺少 ID 或时间的条目: {entry_id}")
+        return None
+    
+    return published_at, updated_at, {
+        'id': entry_id.split('/')[-1],
+        'title': _WHITESPACE.sub(' ', title or ''),
+        'authors': authors,
+        'abstract': summary or '',
+        'published': published_at.strftime('%Y-%m-%d'),
+        'updated': updated_at.strftime('%Y-%m-%d'),
+        'categories': categories,
+        'primary_category': primary_category,
+        'pdf_url': pdf_url,
+        'arxiv_url': entry_id,
+        'source': 'ArXiv',
+        'venue': None,
+        'query_categories': None,
+        'comment': comment or None,
+        'journal_ref': journal_ref or None,
+    }
+
+
+def parse_feed(content: bytes) -> Tuple[int, List[Entry]]:
+    """逐条目解析一页 Atom 响应，返回 (结果总数, 条目列表)；已解析的元素随即释放"""
+    total_results = 0
+    entries = []
+    try:
+        for _, element in etree.iterparse(io.BytesIO(content), events=('end',), tag=(_ENTRY, _TOTAL_RESULTS),
+                                          resolve_entities=False, no_network=True, recover=True):
+            if element.tag == _TOTAL_RESULTS:
+                total_results = int((element.text or '0').strip() or 0)
+                continue
+            entry = parse_entry(element)
+            if entry is not None:
+                entries.append(entry)
+            # 释放已处理的条目，解析过程中不保留整棵树
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        logger.warning(f"Atom 响应格式错误: {e}")
+    return total_results, entries
+
+
+class AtomClient:
+    """分页请求一个类别的论文，每页请求及重试都经过共享的限速器"""
+    
+    def __init__(self, transport, rate_limiter, page_size: int = 100, num_retries: int = 3,
+                 metrics=None, category: str = '', timeout: float = DEFAULT_TIMEOUT):
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self.page_size = page_size
+        self.num_retries = num_retries
+        self.timeout = timeout
+        self.metrics = metrics
+        self.category = category
+    
+    def fetch_page(self, url: str, first_page: bool) -> Tuple[int, List[Entry]]:
+        """请求并解析一页
+        
+        连接错误、超时、429 和 5xx 响应以及非首页为空时按指数退避重试（响应带 Retry-After 时按其等待，
+        离线回放时不等待）；其他状态码（如 400）重试也不会成功，直接失败。
+        """
+        error = None
+        retry_after = None
+        for try_index in range(self.num_retries + 1):
+            if try_index > 0:
+                delay = retry_delay(try_index, retry_after)
+                logger.info(f"{self.category} 请求失败（{error}），{delay:.0f} 秒后重试")
+                if not self.transport.offline:
+                    time.sleep(delay)
+                if self.metrics is not None:
+                    self.metrics.add_time('retry_wait', delay, category=self.category)
+                retry_after = None
+            
+            waited = self.rate_limiter.wait()
+            if self.metrics is not None:
+                self.metrics.add_time('rate_limit_wait', waited, category=self.category)
+                self.metrics.count('api_requests', category=self.category)
+            logger.debug(f"请求 {url}（第 {try_index + 1} 次）")
+            try:
+                response = self.transport.get(url, headers={'user-agent': USER_AGENT}, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                error = f"HTTP {response.status_code}"
+                retry_after = getattr(response, 'headers', {}).get('Retry-After')
+                continue
+            if response.status_code != 200:
+                raise ConnectionError(f"请求失败: {url}: HTTP {response.status_code}")
+            total_results, entries = parse_feed(response.content)
+            if not entries and not first_page:
+                error = "返回了空页"
+                continue
+            return total_results, entries
+        raise ConnectionError(f"请求失败（重试 {self.num_retries} 次）: {url}: {error}")
+    
+    def results(self, category: str, max_results: Optional[int] = None) -> Iterator[Entry]:
+        """按提交时间降序逐条返回类别中的论文，max_results 为 None 时不设上限"""
+        start = 0
+        count = 0
+        while True:
+            total_results, entries = self.fetch_page(query_url(category, start, self.page_size), first_page=start == 0)
+            for entry in entries:
+                yield entry
+                count += 1
+                if max_results is not None and count >= max_results:
+                    return
+            start += len(entries)
+            if not entries or start >= total_results:
+                return
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+静态资源处理
+网页的 CSS / JS 源文件放在 assets/ 目录，构建时压缩并以内容哈希命名（如 style.3f2a9c1b04.css）
+写入 docs/assets/，文件名随内容变化，浏览器可以长期缓存。
+
+压缩只做不改变语义的保守处理：CSS 去掉注释和多余空白；JS 去掉缩进、空行和整行注释。
+"""
+
+import hashlib
+import re
+from pathlib import PurePosixPath
+
+# 内容哈希在文件名中保留的长度
+HASH_LENGTH = 10
+
+# Cloudflare Pages 的响应头配置：带哈希的资源永久缓存
+HEADERS_FILE = """/assets/*
+  Cache-Control: public, max-age=31536000, immutable
+"""
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_WHITESPACE = re.compile(r'\s+')
+# 只去掉 { } ; , 两侧的空白；: 和 > 两侧的空格需要结合上下文判断（选择器 a :hover 与 a:hover 含义不同），保持原样
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*')
+
+
+def minify_css(css: str) -> str:
+    """压缩 CSS：去掉注释、合并空白、去掉 { } ; , 两侧的空格"""
+    css = _CSS_COMMENT.sub('', css)
+    css = _CSS_WHITESPACE.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    return css.replace(';}', '}').strip() + '\n'
+
+
+def minify_js(js: str) -> str:
+    """压缩 JS：去掉每行首尾空白、空行和整行 // 注释（保留换行，不影响自动分号插入）"""
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def minify(name: str, content: str) -> str:
+    """按文件类型压缩，其他类型原样返回"""
+    if name.endswith('.css'):
+        return minify_css(content)
+    if name.endswith('.js'):
+        return minify_js(content)
+    return content
+
+
+def hashed_name(name: str, content: str) -> str:
+    """带内容哈希的文件名，例如 css/style.css -> style.3f2a9c1b04.css"""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    path = PurePosixPath(name)
+    return f"{path.stem}.{digest}{path.suffix}"
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+历史论文回填脚本
+通过 ArXiv 的 OAI-PMH 接口（ListRecords + resumptionToken）按集合（如 cs）批量收割一段日期内的论文，
+经过与日常抓取相同的会议提取和关键词分类后分批保存，用于为新部署一次性导入数月或数年的历史数据。
+搜索 API 受 max_results 限制，不适合大范围回填。
+
+进度保存在检查点文件中，中断后重新运行同样的命令即可从上次保存的位置继续：
+日期范围按 --chunk-days 切分为若干段，已完成的段直接跳过，当前段从最后保存的 resumptionToken 继续
+（令牌过期时从该段开头重新收割，已保存的论文按去掉版本号的 ID 去重，不会重复写入）。
+
+说明:
+    - OAI-PMH 的 from / until 是记录的最后修改日期，旧论文更新后也会出现在结果中，
+      因此只保留首个版本提交日期（published）不早于 --from 的论文；--until 默认到今天，以包含之后更新过的论文
+    - 使用 arXivRaw 格式，论文 ID 带最新版本号（如 2510.27630v2），与日常抓取的 ID 一致；
+      标题和作者中的 LaTeX 转义（如 Bal\\'azs）保持原样
+    - 默认只保留属于 config.yaml 中 sources.arxiv.categories 的论文（--all-categories 保留集合中的全部论文）
+
+用法:
+    python scripts/backfill.py --from 2024-11-01                      # 收割 cs 集合 2024-11-01 至今
+    python scripts/backfill.py --from 2024-11-01 --until 2025-10-31 --set cs
+    python scripts/backfill.py --from 2024-11-01 --restart            # 忽略检查点，重新开始
+"""
+
+import argparse
+import io
+import json
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import logging
+
+import requests
+import yaml
+from lxml import etree
+
+# 以脚本方式运行（python scripts/backfill.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts import venue
+from scripts.arxiv_atom import retry_delay
+from scripts.classifier import KeywordClassifier
+from scripts.fetch_papers import RateLimiter
+from scripts.metrics import Metrics
+from scripts.storage import open_store
+from scripts.transport import HTTPTransport, open_transport
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+OAI_URL = "https://oaipmh.arxiv.org/oai"
+METADATA_PREFIX = 'arXivRaw'
+USER_AGENT = "DailyPaper (https://github.com/4everWZ/DailyPaper)"
+
+# 检查点格式版本：修改检查点结构后递增
+CHECKPOINT_VERSION = 1
+
+# 累积多少篇论文保存一次（同时更新检查点）
+DEFAULT_BATCH_SIZE = 5000
+
+# 日期范围切分的天数
+DEFAULT_CHUNK_DAYS = 30
+
+# 请求失败（连接错误、超时、429、5xx）时的最大重试次数，等待时间见 arxiv_atom.retry_delay
+MAX_RETRIES = 5
+
+_OAI = '{http://www.openarchives.org/OAI/2.0/}'
+_RAW = '{http://arxiv.org/OAI/arXivRaw/}'
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def list_records_url(set_spec: str, from_date: str, until_date: str, token: Optional[str] = None) -> str:
+    """ListRecords 请求 URL；有 resumptionToken 时只带令牌"""
+    if token:
+        params = {'verb': 'ListRecords', 'resumptionToken': token}
+    else:
+        params = {'verb': 'ListRecords', 'metadataPrefix': METADATA_PREFIX, 'set': set_spec,
+                  'from': from_date, 'until': until_date}
+    return OAI_URL + '?' + urlencode(params)
+
+
+def split_authors(text: str) -> List[str]:
+    """拆分 arXivRaw 的作者字符串，如 "A, B and C"（括号内的逗号不拆分）"""
+    authors = []
+    depth = 0
+    current = []
+    for char in _WHITESPACE.sub(' ', text or '').strip():
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(0, depth - 1)
+        if char == ',' and depth == 0:
+            authors.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    authors.append(''.join(current))
+    
+    names = []
+    for part in authors:
+        # "A and B" 以及 ", and C"
+        for name in re.split(r'^and\s+|\s+and\s+', part.strip()):
+            if name.strip():
+                names.append(name.strip())
+    return names
+
+
+def parse_record(record) -> Optional[Tuple[datetime, Dict]]:
+    """解析一条 arXivRaw 记录为 (首个版本提交时间, 论文字典)，已删除或缺少必要字段时返回 None
+    
+    venue / query_categories 由回填器按类别填写，conference / tags 在会议提取和分类后添加。
+    """
+    header = record.find(_OAI + 'header')
+    if header is not None and header.get('status') == 'deleted':
+        return None
+    metadata = record.find(f"{_OAI}metadata/{_RAW}arXivRaw")
+    if metadata is None:
+        return None
+    
+    arxiv_id = metadata.findtext(_RAW + 'id')
+    versions = []
+    for version in metadata.iterfind(_RAW + 'version'):
+        try:
+            versions.append((version.get('version'), parsedate_to_datetime(version.findtext(_RAW + 'date'))))
+        except (TypeError, ValueError):
+            continue
+    if not arxiv_id or not versions:
+        return None
+    
+    published_at = versions[0][1].astimezone(timezone.utc)
+    latest_version, updated_at = versions[-1]
+    paper_id = f"{arxiv_id}{latest_version}"
+    categories = (metadata.findtext(_RAW + 'categories') or '').split()
+    return published_at, {
+        'id': paper_id,
+        'title': _WHITESPACE.sub(' ', metadata.findtext(_RAW + 'title') or '').strip(),
+        'authors': split_authors(metadata.findtext(_RAW + 'authors') or ''),
+        'abstract': (metadata.findtext(_RAW + 'abstract') or '').strip(),
+        'published': published_at.strftime('%Y-%m-%d'),
+        'updated': updated_at.astimezone(timezone.utc).strftime('%Y-%m-%d'),
+        'categories': categories,
+        'primary_category': categories[0] if categories else '',
+        'pdf_url': f"http://arxiv.org/pdf/{paper_id}",
+        'arxiv_url': f"http://arxiv.org/abs/{paper_id}",
+        'source': 'ArXiv',
+        'venue': None,
+        'query_categories': None,
+        'comment': _WHITESPACE.sub(' ', metadata.findtext(_RAW + 'comments') or '').strip() or None,
+        'journal_ref': _WHITESPACE.sub(' ', metadata.findtext(_RAW + 'journal-ref') or '').strip() or None,
+    }
+
+
+def parse_list_records(content: bytes) -> Dict:
+    """逐条记录解析一页 ListRecords 响应（解析完的记录随即释放）
+    
+    返回 {'records': [(提交时间, 论文)], 'deleted': 跳过的记录数, 'token': 下一页令牌（最后一页为 None）,
+    'error': OAI 错误码（如 noRecordsMatch、badResumptionToken）}
+    """
+    result = {'records': [], 'deleted': 0, 'token': None, 'error': None}
+    tags = (_OAI + 'record', _OAI + 'resumptionToken', _OAI + 'error')
+    for _, element in etree.iterparse(io.BytesIO(content), events=('end',), tag=tags,
+                                      resolve_entities=False, no_network=True):
+        if element.tag == _OAI + 'record':
+            parsed = parse_record(element)
+            if parsed is None:
+                result['deleted'] += 1
+            else:
+                result['records'].append(parsed)
+            # 释放已处理的记录
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        elif element.tag == _OAI + 'resumptionToken':
+            result['token'] = (element.text or '').strip() or None
+        else:
+            result['error'] = element.get('code')
+    return result
+
+
+def date_chunks(from_date: str, until_date: str, chunk_days: int) -> List[Tuple[str, str]]:
+    """把日期范围切分为不超过 chunk_days 天的段 [(起, 止)]，两端都包含"""
+    start = date.fromisoformat(from_date)
+    end = date.fromisoformat(until_date)
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=max(1, chunk_days) - 1))
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class Backfiller:
+    """按日期段收割 OAI-PMH 记录，分批分类并保存，进度写入检查点"""
+    
+    def __init__(self, config: Dict, data_path: str = "data/papers.json",
+                 checkpoint_path: str = "data/backfill_checkpoint.json", set_spec: str = 'cs',
+                 transport: Optional[HTTPTransport] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 all_categories: bool = False, metrics: Optional[Metrics] = None):
+        self.config = config
+        self.data_path = Path(data_path)
+        self.checkpoint_path = Path(checkpoint_path)
+        self.set_spec = set_spec
+        self.transport = transport or HTTPTransport()
+        self.batch_size = max(1, batch_size)
+        self.metrics = metrics or Metrics('backfill')
+        
+        arxiv_config = config['sources']['arxiv']
+        # 只保留配置中的类别；all_categories 时保留集合中的全部论文
+        self.categories = None if all_categories else list(arxiv_config['categories'])
+        self.rate_limiter = RateLimiter(0 if self.transport.offline else arxiv_config.get('delay_seconds', 3.0))
+        self.classifier = KeywordClassifier.from_config(config)
+        self.store = open_store(self.data_path, backend=config.get('output', {}).get('storage', 'json'))
+        self.checkpoint = None
+        self.pending = []  # 已分类、尚未保存的论文
+    
+    def load_checkpoint(self, from_date: str, until_date: str, chunk_days: int, restart: bool = False) -> Dict:
+        """加载检查点；参数与本次运行不一致时报错（使用 restart 重新开始）"""
+        params = {'set': self.set_spec, 'from': from_date, 'until': until_date, 'chunk_days': chunk_days,
+                  'categories': self.categories}
+        if self.checkpoint_path.exists() and not restart:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('params') != params:
+                raise ValueError(f"检查点 {self.checkpoint_path} 与本次参数不一致，使用 --restart 重新开始")
+            logger.info(f"从检查点继续：已完成 {len(checkpoint['completed'])} 段，已保存 {checkpoint['saved']} 篇论文")
+            return checkpoint
+        return {'version': CHECKPOINT_VERSION, 'params': params, 'completed': [], 'current': None,
+                'harvested': 0, 'saved': 0}
+    
+    def save_checkpoint(self):
+        """写入检查点（先写临时文件再替换，中断时不会留下半个文件）"""
+        self.checkpoint['updated_at'] = datetime.now(timezone.utc).isoformat()
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.checkpoint_path)
+    
+    def request(self, url: str) -> bytes:
+        """请求一页
+        
+        连接错误、超时、429 和 5xx 响应按指数退避重试，响应带 Retry-After 时按其等待（OAI-PMH 的流量控制
+        通过 503 + Retry-After 实现）；其他状态码重试也不会成功，直接失败。
+        """
+        error = None
+        retry_after = None
+        for try_index in range(MAX_RETRIES + 1):
+            if try_index > 0:
+                delay = retry_delay(try_index, retry_after)
+                logger.info(f"请求失败（{error}），{delay:.0f} 秒后重试")
+                time.sleep(0 if self.transport.offline else delay)
+                self.metrics.add_time('retry_wait', delay)
+                retry_after = None
+            
+            self.metrics.add_time('rate_limit_wait', self.rate_limiter.wait())
+            self.metrics.count('api_requests')
+            try:
+                with self.metrics.stage('oai_request'):
+                    response = self.transport.get(url, headers={'user-agent': USER_AGENT})
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                continue
+            if response.status_code == 200:
+                self.metrics.count('bytes_received', len(response.content))
+                return response.content
+            error = f"HTTP {response.status_code}"
+            if response.status_code != 429 and response.status_code < 500:
+                break
+            retry_after = getattr(response, 'headers', {}).get('Retry-After')
+        raise ConnectionError(f"请求失败: {url}: {error}")
+    
+    def process_records(self, records: List[Tuple[datetime, Dict]], from_date: str) -> List[Dict]:
+        """过滤类别和提交日期，填写来源类别，提取会议信息并分类"""
+        papers = []
+        for published_at, paper in records:
+            # 旧论文更新后也会出现在 OAI-PMH 结果中，只保留在回填范围内首次提交的论文
+            if paper['published'] < from_date:
+                self.metrics.count('records_skipped', reason='published_before_range')
+                continue
+            if self.categories is None:
+                query_categories = [paper['primary_category']]
+            else:
+                query_categories = [c for c in self.categories if c in paper['categories']]
+                if not query_categories:
+                    self.metrics.count('records_skipped', reason='category')
+                    continue
+            paper['venue'] = query_categories[0]
+            paper['query_categories'] = query_categories
+            papers.append(paper)
+        
+        with self.metrics.stage('venue_extraction', items=len(papers)):
+            for paper in papers:
+                paper['conference'] = venue.extract_venue(paper['journal_ref'], paper['comment'])
+        with self.metrics.stage('classification', items=len(papers)):
+            for paper in papers:
+                paper['tags'] = self.classifier.classify_paper(paper)
+        return papers
+    
+    def flush(self):
+        """保存累积的论文，并把检查点推进到当前位置"""
+        if self.pending:
+            with self.metrics.stage('save', items=len(self.pending)):
+                saved = self.store.add(self.pending)
+            self.metrics.count('papers_saved', saved)
+            self.checkpoint['saved'] += saved
+            logger.info(f"保存了 {saved} 篇新论文（本批 {len(self.pending)} 篇）")
+            self.pending = []
+        self.save_checkpoint()
+    
+    def harvest_chunk(self, from_date: str, until_date: str, range_from: str):
+        """收割一个日期段，从检查点中的 resumptionToken 继续（如果有）
+        
+        检查点的 current 中记录本段开始时的已收割记录数，令牌失效、从本段开头重新收割时恢复该计数。
+        """
+        current = self.checkpoint.get('current') or {}
+        resuming = current.get('from') == from_date
+        token = current.get('token') if resuming else None
+        start_harvested = current.get('harvested', self.checkpoint['harvested']) if resuming \
+            else self.checkpoint['harvested']
+        self.checkpoint['current'] = {'from': from_date, 'until': until_date, 'token': token,
+                                      'harvested': start_harvested}
+        
+        while True:
+            content = self.request(list_records_url(self.set_spec, from_date, until_date, token))
+            with self.metrics.stage('parse') as stage:
+                page = parse_list_records(content)
+                stage.items = len(page['records'])
+            
+            if page['error'] == 'badResumptionToken' and token:
+                # 令牌过期：从本段开头重新收割。每段结束时都会保存，pending 中只有本段的论文，
+                # 丢弃后重新收割，避免重复添加；已保存的论文按去掉版本号的 ID 去重
+                logger.warning(f"resumptionToken 已失效，从 {from_date} 重新收割本段")
+                self.pending = []
+                self.checkpoint['harvested'] = start_harvested
+                self.checkpoint['current']['token'] = token = None
+                continue
+            if page['error'] not in (None, 'noRecordsMatch'):
+                raise ValueError(f"OAI-PMH 返回错误: {page['error']}")
+            
+            self.checkpoint['harvested'] += len(page['records'])
+            self.metrics.count('records_harvested', len(page['records']))
+            self.metrics.count('records_skipped', page['deleted'], reason='deleted')
+            self.pending.extend(self.process_records(page['records'], range_from))
+            
+            token = page['token']
+            if token is None:
+                return
+            # 攒够一批再保存，检查点只记录已保存部分之后的令牌
+            if len(self.pending) >= self.batch_size:
+                self.checkpoint['current']['token'] = token
+                self.flush()
+    
+    def run(self, from_date: str, until_date: Optional[str] = None, chunk_days: int = DEFAULT_CHUNK_DAYS,
+            restart: bool = False) -> Dict:
+        """回填 [from_date, until_date]，返回检查点中的统计"""
+        until_date = until_date or self.transport.now().strftime('%Y-%m-%d')
+        self.checkpoint = self.load_checkpoint(from_date, until_date, chunk_days, restart=restart)
+        completed = {tuple(chunk) for chunk in self.checkpoint['completed']}
+        chunks = date_chunks(from_date, until_date, chunk_days)
+        logger.info(f"回填 {self.set_spec} 集合 {from_date} 至 {until_date}，共 {len(chunks)} 段")
+        
+        for chunk_from, chunk_until in chunks:
+            if (chunk_from, chunk_until) in completed:
+                continue
+            logger.info(f"收割 {chunk_from} 至 {chunk_until}")
+            with self.metrics.stage('chunk'):
+                self.harvest_chunk(chunk_from, chunk_until, from_date)
+            self.checkpoint['completed'].append([chunk_from, chunk_until])
+            self.checkpoint['current'] = None
+            self.flush()
+        
+        logger.info(f"回填完成！收割 {self.checkpoint['harvested']} 条记录，保存 {self.checkpoint['saved']} 篇新论文，"
+                    f"总共 {self.store.count()} 篇")
+        logger.info(f"各阶段耗时: {self.metrics.summary()}（总计 {self.metrics.duration():.2f}s）")
+        return self.checkpoint
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="通过 OAI-PMH 批量回填历史论文（可中断后继续）")
+    parser.add_argument('--from', dest='from_date', required=True, help="起始日期（YYYY-MM-DD）")
+    parser.add_argument('--until', dest='until_date', default=None, help="结束日期（YYYY-MM-DD，默认今天）")
+    parser.add_argument('--set', dest='set_spec', default='cs', help="OAI-PMH 集合（默认 cs）")
+    parser.add_argument('--config', default="config.yaml", help="配置文件路径")
+    parser.add_argument('--data', default=None, help="论文数据路径（默认 output.data_dir/papers.json）")
+    parser.add_argument('--checkpoint', default=None, help="检查点路径（默认 output.data_dir/backfill_checkpoint.json）")
+    parser.add_argument('--chunk-days', type=int, default=DEFAULT_CHUNK_DAYS, help="每段的天数")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="累积多少篇论文保存一次")
+    parser.add_argument('--all-categories', action='store_true', help="保留集合中的全部论文，不按配置的类别过滤")
+    parser.add_argument('--restart', action='store_true', help="忽略已有的检查点，重新开始")
+    parser.add_argument('--record', metavar='DIR', default=None, help="同时把 OAI-PMH 原始响应录制到目录")
+    parser.add_argument('--replay', metavar='DIR', default=None, help="从录制目录回放响应，不访问网络")
+    parser.add_argument('--metrics-report', metavar='PATH', default=None, help="写出各阶段耗时和计数的 JSON 报告")
+    args = parser.parse_args()
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    data_dir = Path(config.get('output', {}).get('data_dir', 'data'))
+    
+    backfiller = Backfiller(
+        config,
+        data_path=args.data or str(data_dir / "papers.json"),
+        checkpoint_path=args.checkpoint or str(data_dir / "backfill_checkpoint.json"),
+        set_spec=args.set_spec,
+        transport=open_transport(record=args.record, replay=args.replay),
+        batch_size=args.batch_size,
+        all_categories=args.all_categories,
+    )
+    backfiller.run(args.from_date, args.until_date, chunk_days=args.chunk_days, restart=args.restart)
+    
+    if args.metrics_report:
+        backfiller.metrics.write_report(args.metrics_report)
+
+
+if __name__ == "__main__":
+    main()
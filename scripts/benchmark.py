@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+性能基准测试
+离线运行（不访问 ArXiv API），在 1k / 10k / 100k 篇论文规模上测量抓取 → 分类 → 保存 → 生成网页
+各环节的耗时、吞吐量（篇/秒）和内存峰值，结果以 JSON 输出，可与上一次的结果对比发现性能回退。
+
+抓取环节回放由语料渲染成的 ArXiv Atom 响应（scripts/transport.py），测量解析、会议提取和分类的完整路径。
+
+论文语料:
+    recorded   以已保存的真实论文（默认 docs/data/2025-10.json）为样本，复制扩充到指定规模
+    synthetic  按固定随机种子生成的论文（标题/摘要取自分类关键词和常用词，comment 取自 fixtures/venue_corpus.json）
+
+用法:
+    python scripts/benchmark.py                                  # 默认 1000,10000,100000 篇
+    python scripts/benchmark.py --sizes 1000 --output bench.json
+    python scripts/benchmark.py --baseline old.json              # 与基线对比，变慢超过阈值时返回非零退出码
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape, quoteattr
+import logging
+
+# 以脚本方式运行（python scripts/benchmark.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts import utils, venue
+from scripts.fetch_papers import PaperFetcher
+from scripts.generate_html import HTMLGenerator
+from scripts.storage import open_store
+from scripts.transport import HTTPTransport, RecordedResponse, RecordingTransport, ReplayTransport
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_RECORDED_CORPUS = PROJECT_ROOT / "docs" / "data" / "2025-10.json"
+VENUE_CORPUS = PROJECT_ROOT / "fixtures" / "venue_corpus.json"
+
+# 结果文件格式版本：修改输出结构后递增
+RESULT_VERSION = 1
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# 与基线对比时允许的最大变慢比例（0.25 即耗时增加 25%）
+DEFAULT_MAX_REGRESSION = 0.25
+
+# 基线耗时低于此值（秒）的基准不参与对比，计时误差相对过大
+MIN_COMPARE_SECONDS = 0.01
+
+# 回放抓取基准中每个 Atom 响应的条目数
+ATOM_PAGE_SIZE = 1000
+
+# 合成论文分布的月份数（论文按编号轮流分到最近的若干个月）
+SYNTHETIC_MONTHS = 12
+
+FILLER_WORDS = """
+model models method approach framework learning training data dataset benchmark results performance
+task tasks network networks neural large language vision visual robust efficient scalable novel
+propose proposed show demonstrate state art baseline baselines evaluation experiments analysis
+representation representations feature features structure optimization inference generalization
+accuracy improvement method methods problem setting settings simple effective existing recent
+""".split()
+
+FIRST_NAMES = ['Wei', 'Anna', 'Jun', 'Maria', 'David', 'Li', 'Sarah', 'Hiroshi', 'Chen', 'Omar', 'Elena', 'Yuki']
+LAST_NAMES = ['Zhang', 'Smith', 'Wang', 'Garcia', 'Kim', 'Liu', 'Müller', 'Tanaka', 'Rossi', 'Chen', 'Singh', 'Ivanova']
+
+
+def make_paper_id(index: int, published: str) -> str:
+    """按发布月份生成唯一的 ArXiv 风格 ID，如 2510.000042v1"""
+    return f"{published[2:4]}{published[5:7]}.{index:06d}v1"
+
+
+def synthetic_date(index: int) -> str:
+    """第 index 篇论文的发布日期：按编号轮流分到最近 SYNTHETIC_MONTHS 个月"""
+    month = 12 - index % SYNTHETIC_MONTHS
+    day = 1 + (index // SYNTHETIC_MONTHS) % 28
+    return f"2025-{month:02d}-{day:02d}"
+
+
+def load_recorded_papers(path: Path) -> List[Dict]:
+    """加载真实论文样本（JSON 列表或数据存储目录下的 papers.json）"""
+    if path.suffix == '.json' and path.is_file():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return open_store(path).load()
+
+
+def recorded_corpus(samples: List[Dict], size: int) -> List[Dict]:
+    """复制真实论文样本扩充到 size 篇，重新分配 ID 和发布日期"""
+    papers = []
+    for i in range(size):
+        paper = dict(samples[i % len(samples)])
+        paper['published'] = synthetic_date(i)
+        paper['id'] = make_paper_id(i, paper['published'])
+        papers.append(paper)
+    return papers
+
+
+def synthetic_corpus(config: Dict, size: int, seed: int = 0) -> List[Dict]:
+    """生成 size 篇合成论文（同一种子结果相同）"""
+    rng = random.Random(seed)
+    keywords = [kw for category in config.get('categories', {}).values() for kw in category.get('keywords', [])]
+    with open(VENUE_CORPUS, 'r', encoding='utf-8') as f:
+        comments = [case['input'] for case in json.load(f)['comment']]
+    arxiv_categories = config['sources']['arxiv']['categories']
+    
+    def sentence(length: int) -> str:
+        words = rng.choices(FILLER_WORDS, k=length)
+        # 约每 10 个词插入一个分类关键词，使分类器有命中
+        for _ in range(max(1, length // 10)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords) if keywords else 'learning')
+        return ' '.join(words)
+    
+    papers = []
+    for i in range(size):
+        published = synthetic_date(i)
+        paper_id = make_paper_id(i, published)
+        primary = rng.choice(arxiv_categories)
+        comment = rng.choice(comments) if rng.random() < 0.6 else None
+        abstract = '. '.join(sentence(rng.randint(15, 30)) for _ in range(rng.randint(5, 9))) + '.'
+        if rng.random() < 0.2:
+            abstract += f" Code is available at https://github.com/lab{i % 97}/project{i}."
+        papers.append({
+            'id': paper_id,
+            'title': sentence(rng.randint(6, 12)).title(),
+            'authors': [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(rng.randint(1, 9))],
+            'abstract': abstract,
+            'published': published,
+            'updated': published,
+            'categories': [primary],
+            'primary_category': primary,
+            'pdf_url': f"http://arxiv.org/pdf/{paper_id}",
+            'arxiv_url': f"http://arxiv.org/abs/{paper_id}",
+            'source': 'ArXiv',
+            'venue': primary,
+            'query_categories': [primary],
+            'comment': comment,
+            'journal_ref': None,
+            'conference': venue.extract_venue_from_comment(comment),
+            'tags': [],
+        })
+    return papers
+
+
+def render_atom_feed(papers: List[Dict], start: int, total: int) -> bytes:
+    """把论文渲染为 ArXiv API 格式的 Atom 响应"""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">\n'
+        f'<opensearch:totalResults>{total}</opensearch:totalResults>\n'
+        f'<opensearch:startIndex>{start}</opensearch:startIndex>\n'
+        f'<opensearch:itemsPerPage>{len(papers)}</opensearch:itemsPerPage>\n'
+    ]
+    for paper in papers:
+        paper_id = paper['id']
+        published = f"{paper['published']}T12:00:00Z"
+        updated = f"{paper.get('updated') or paper['published']}T12:00:00Z"
+        entry = [
+            f'<entry>\n<id>http://arxiv.org/abs/{paper_id}</id>',
+            f'<updated>{updated}</updated>\n<published>{published}</published>',
+            f'<title>{escape(paper.get("title") or "")}</title>',
+            f'<summary>{escape(paper.get("abstract") or "")}</summary>',
+        ]
+        entry.extend(f'<author><name>{escape(author)}</name></author>' for author in paper.get('authors', []))
+        if paper.get('comment'):
+            entry.append(f'<arxiv:comment>{escape(paper["comment"])}</arxiv:comment>')
+        if paper.get('journal_ref'):
+            entry.append(f'<arxiv:journal_ref>{escape(paper["journal_ref"])}</arxiv:journal_ref>')
+        entry.append(f'<link href="http://arxiv.org/abs/{paper_id}" rel="alternate" type="text/html"/>')
+        entry.append(f'<link title="pdf" href="http://arxiv.org/pdf/{paper_id}" rel="related" type="application/pdf"/>')
+        categories = paper.get('categories') or []
+        if categories:
+            entry.append(f'<arxiv:primary_category term={quoteattr(paper.get("primary_category") or categories[0])}/>')
+        entry.extend(f'<category term={quoteattr(category)}/>' for category in categories)
+        entry.append('</entry>\n')
+        parts.append('\n'.join(entry))
+    parts.append('</feed>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+class CorpusTransport(HTTPTransport):
+    """模拟 ArXiv API：按请求 URL 中的 start / max_results 从语料（按发布日期降序）中取出一页"""
+    
+    def __init__(self, papers: List[Dict]):
+        super().__init__()
+        self.papers = sorted(papers, key=lambda paper: paper['published'], reverse=True)
+    
+    def get(self, url: str, headers=None, **kwargs) -> RecordedResponse:
+        """返回语料中对应的一页"""
+        query = parse_qs(urlparse(url).query)
+        start = int(query['start'][0])
+        page = self.papers[start:start + int(query['max_results'][0])]
+        return RecordedResponse(url, 200, render_atom_feed(page, start, len(self.papers)))
+
+
+def time_call(func: Callable[[], object]) -> float:
+    """执行 func，返回耗时秒数"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """执行 func，返回期间 Python 分配内存的峰值字节数
+    
+    tracemalloc 会明显拖慢执行，因此与计时分开单独运行一次。
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class BenchmarkSuite:
+    """在一个临时目录中准备数据并依次运行各项基准"""
+    
+    def __init__(self, config_path: str, work_dir: Path, memory: bool = True, repeat: int = 1):
+        self.config_path = config_path
+        self.work_dir = work_dir
+        self.memory = memory
+        self.repeat = max(1, repeat)
+        self.fetcher = PaperFetcher(config_path)
+        self.tags = list(self.fetcher.config.get('categories', {}).keys())
+    
+    def fresh_dir(self, name: str) -> Path:
+        """返回一个空的工作子目录"""
+        path = self.work_dir / name
+        if path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True)
+        return path
+    
+    def new_generator(self, data_path: Path, load: bool = True) -> HTMLGenerator:
+        """非增量模式的生成器（每次都完整重建），输出到空目录"""
+        generator = HTMLGenerator(str(data_path), str(self.fresh_dir('docs')),
+                                  incremental=False, config_path=self.config_path)
+        if load:
+            generator.load_papers()
+        return generator
+    
+    def replay_fetcher(self, transport: HTTPTransport, backend: str = 'arxiv') -> PaperFetcher:
+        """抓取全部论文的 PaperFetcher：单个类别、不限时间窗口、不限速"""
+        fetcher = PaperFetcher(self.config_path, transport=transport)
+        arxiv_config = fetcher.config['sources']['arxiv']
+        arxiv_config.update({
+            'backend': backend,
+            'categories': arxiv_config['categories'][:1],
+            'max_results': None,
+            'page_size': ATOM_PAGE_SIZE,
+            'days_back': 36500,
+            'delay_seconds': 0,
+            'max_workers': 1,
+            'early_stop': False,
+            'adaptive_max_results': False,
+            'incremental': False,
+        })
+        return fetcher
+    
+    def benchmarks(self, papers: List[Dict]) -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+        """基准列表：(名称, 准备函数)，准备函数不计时，返回被测函数"""
+        data_path = self.work_dir / "data" / "papers.json"
+        
+        recording = self.work_dir / "recording"
+        
+        def fetch_setup():
+            # 先把语料录制为 Atom 响应，计时部分只回放录制
+            self.fresh_dir('recording')
+            self.replay_fetcher(RecordingTransport(str(recording), inner=CorpusTransport(papers))).fetch_arxiv_papers()
+            return self.replay_fetcher(ReplayTransport(str(recording))).fetch_arxiv_papers
+        
+        def atom_fetch_setup():
+            # 回放 fetch_setup 录制的响应
+            return self.replay_fetcher(ReplayTransport(str(recording)), backend='atom').fetch_arxiv_papers
+        
+        def venue_setup():
+            comments = [paper.get('comment') for paper in papers]
+            return lambda: [venue.extract_venue_from_comment(comment) for comment in comments]
+        
+        def classify_setup():
+            self.fetcher.classifier = None
+            self.fetcher.classify_paper(papers[0])  # 分类器的构建不计入
+            return lambda: [self.fetcher.classify_paper(paper) for paper in papers]
+        
+        def save_setup():
+            def run():
+                output = self.fresh_dir('save') / "papers.json"
+                self.fetcher.save_papers(papers, str(output))
+            return run
+        
+        def load_setup():
+            generator = self.new_generator(data_path, load=False)
+            
+            def run():
+                generator.papers, generator.papers_by_month = [], {}
+                generator.load_papers()
+            return run
+        
+        def monthly_setup():
+            generator = self.new_generator(data_path)
+            
+            def run():
+                generator.output_dir = self.fresh_dir('docs')
+                generator.stats = None
+                generator.generate_monthly_data_files()
+            return run
+        
+        def papers_html_setup():
+            generator = self.new_generator(data_path)
+            
+            def run():
+                generator.derived_cache = {}  # 每次都重新提取代码链接
+                return generator.generate_papers_html()
+            return run
+        
+        def by_date_setup():
+            # 查询最近 7 个发布日期（每日页面的典型查询）
+            dates = sorted({paper['published'] for paper in papers}, reverse=True)[:7]
+            return lambda: [utils.get_papers_by_date(papers, date) for date in dates]
+        
+        return [
+            ('PaperFetcher.fetch_arxiv_papers (replay)', fetch_setup),
+            ('PaperFetcher.fetch_arxiv_papers (replay, atom)', atom_fetch_setup),
+            ('venue.extract_venue_from_comment', venue_setup),
+            ('PaperFetcher.classify_paper', classify_setup),
+            ('PaperFetcher.save_papers', save_setup),
+            ('HTMLGenerator.load_papers', load_setup),
+            ('HTMLGenerator.generate_monthly_data_files', monthly_setup),
+            ('HTMLGenerator.generate_papers_html', papers_html_setup),
+            ('utils.get_papers_by_date', by_date_setup),
+            ('utils.get_papers_by_category', lambda: lambda: [utils.get_papers_by_category(papers, tag)
+                                                              for tag in self.tags]),
+            ('utils.deduplicate_papers', lambda: lambda: utils.deduplicate_papers(papers)),
+            ('utils.count_papers_by_category', lambda: lambda: utils.count_papers_by_category(papers)),
+            ('utils.compute_paper_stats', lambda: lambda: utils.compute_paper_stats(papers, self.tags)),
+        ]
+    
+    def run(self, papers: List[Dict]) -> List[Dict]:
+        """在一组论文上运行全部基准"""
+        # 生成器相关的基准共用一份按配置后端保存的数据
+        self.fetcher.save_papers(papers, str(self.fresh_dir('data') / "papers.json"))
+        
+        results = []
+        for name, setup in self.benchmarks(papers):
+            func = setup()
+            seconds = min(time_call(func) for _ in range(self.repeat))
+            peak = peak_memory(func) if self.memory else None
+            result = {
+                'benchmark': name,
+                'size': len(papers),
+                'seconds': round(seconds, 6),
+                'throughput': round(len(papers) / seconds, 1) if seconds > 0 else None,
+                'peak_memory_bytes': peak,
+            }
+            results.append(result)
+            memory_text = f"，内存峰值 {peak / 1024 / 1024:.1f} MB" if peak is not None else ""
+            print(f"  {name:<48} {seconds:>9.3f} 秒  {result['throughput'] or 0:>12.0f} 篇/秒{memory_text}", file=sys.stderr)
+        return results
+
+
+def run_benchmarks(sizes: List[int], corpus: str = 'recorded', config_path: str = "config.yaml",
+                   memory: bool = True, repeat: int = 1, seed: int = 0) -> Dict:
+    """按各规模运行基准，返回可序列化为 JSON 的结果
+    
+    corpus 为 'synthetic'、'recorded'（默认真实样本，文件不存在时改用合成论文）或真实论文文件路径。
+    """
+    if corpus == 'recorded':
+        corpus = str(DEFAULT_RECORDED_CORPUS) if DEFAULT_RECORDED_CORPUS.exists() else 'synthetic'
+    samples = None if corpus == 'synthetic' else load_recorded_papers(Path(corpus))
+    
+    results = []
+    with tempfile.TemporaryDirectory(prefix="paper-daily-bench-") as work_dir:
+        suite = BenchmarkSuite(config_path, Path(work_dir), memory=memory, repeat=repeat)
+        for size in sizes:
+            if samples:
+                papers = recorded_corpus(samples, size)
+            else:
+                papers = synthetic_corpus(suite.fetcher.config, size, seed=seed)
+            print(f"📊 {size} 篇论文（语料: {corpus}）", file=sys.stderr)
+            results.extend(suite.run(papers))
+    
+    return {
+        'version': RESULT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': corpus,
+        'storage': suite.fetcher.config.get('output', {}).get('storage', 'json'),
+        'results': results,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, max_regression: float = DEFAULT_MAX_REGRESSION) -> List[Dict]:
+    """与基线对比，返回耗时增加超过 max_regression 的基准（忽略基线耗时过短的项）"""
+    baseline_seconds = {(r['benchmark'], r['size']): r['seconds'] for r in baseline.get('results', [])}
+    regressions = []
+    for result in current['results']:
+        old = baseline_seconds.get((result['benchmark'], result['size']))
+        if old and old >= MIN_COMPARE_SECONDS and result['seconds'] > old * (1 + max_regression):
+            regressions.append({
+                'benchmark': result['benchmark'],
+                'size': result['size'],
+                'baseline_seconds': old,
+                'seconds': result['seconds'],
+                'ratio': round(result['seconds'] / old, 2),
+            })
+    return regressions
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="离线运行抓取/分类/保存/生成网页各环节的性能基准")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="论文规模，逗号分隔")
+    parser.add_argument('--corpus', default='recorded',
+                        help="语料：recorded（真实论文样本）、synthetic（合成论文）或真实论文文件路径")
+    parser.add_argument('--config', default="config.yaml", help="配置文件路径")
+    parser.add_argument('--output', default=None, help="结果 JSON 文件路径（默认输出到标准输出）")
+    parser.add_argument('--baseline', default=None, help="基线结果 JSON，用于检测性能回退")
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="允许的最大变慢比例（默认 0.25）")
+    parser.add_argument('--repeat', type=int, default=1, help="每项计时重复次数，取最快的一次")
+    parser.add_argument('--no-memory', action='store_true', help="不测量内存峰值（省去一次额外运行）")
+    parser.add_argument('--seed', type=int, default=0, help="合成语料的随机种子")
+    args = parser.parse_args()
+    
+    # 基准运行期间只输出警告，避免各环节的进度日志干扰计时和输出
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    report = run_benchmarks(sizes, corpus=args.corpus, config_path=args.config,
+                            memory=not args.no_memory, repeat=args.repeat, seed=args.seed)
+    
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['regressions'] = compare_results(report, baseline, args.max_regression)
+        for regression in report['regressions']:
+            print(f"❌ 性能回退: {regression['benchmark']} ({regression['size']} 篇) "
+                  f"{regression['baseline_seconds']:.3f} -> {regression['seconds']:.3f} 秒（{regression['ratio']}x）",
+                  file=sys.stderr)
+        if report['regressions']:
+            exit_code = 1
+        else:
+            print(f"✅ 与基线相比没有超过 {args.max_regression:.0%} 的性能回退", file=sys.stderr)
+    
+    # 标准输出只输出 JSON 结果（可直接重定向到文件），对比和进度信息都输出到标准错误
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(text + '\n', encoding='utf-8')
+        print(f"💾 结果已保存到 {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+论文卡片模板
+卡片 HTML 只在这里定义一次，导入时预编译为 Python 渲染函数 render_card，
+同时生成等价的 JavaScript 渲染代码（docs/js/card.js），供静态页面和前端共用。
+
+模板语法（Mustache 的一个子集）:
+    {{name}}                 输出上下文字段，自动进行 HTML 转义（None 输出为空）
+    {{#name}}...{{/name}}    name 为列表时对每一项重复，项目本身用 {{.}} 表示；
+                             为其他真值时输出一次（{{.}} 为该值）；为空值或空列表时不输出
+区块内的 {{name}} 仍然引用卡片上下文的字段，区块不能嵌套同名区块。
+"""
+
+import html
+import json
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 卡片上最多显示的作者数，超过时追加 et al.
+MAX_AUTHORS = 5
+
+# 会议徽章样式：会议名（大写）包含关键词时使用对应样式，按顺序取第一个匹配
+VENUE_BADGE_CLASSES = [
+    ('NEURIPS', 'badge-neurips'),
+    ('ICLR', 'badge-iclr'),
+    ('ICML', 'badge-icml'),
+    ('CVPR', 'badge-cvpr'),
+    ('ICCV', 'badge-iccv'),
+    ('ECCV', 'badge-eccv'),
+    ('ACL', 'badge-acl'),
+    ('EMNLP', 'badge-emnlp'),
+    ('NAACL', 'badge-naacl'),
+    ('AAAI', 'badge-aaai'),
+    ('IJCAI', 'badge-ijcai'),
+]
+DEFAULT_BADGE_CLASS = 'badge-published'
+
+CARD_TEMPLATE = """
+<article class="paper-card" data-date="{{published}}" data-status="{{status}}" data-tags="{{tags_csv}}" data-paper-id="{{id}}">
+    <div class="paper-select">
+        <input type="checkbox" class="paper-checkbox" id="check-{{id}}" data-paper-id="{{id}}">
+        <label for="check-{{id}}"></label>
+    </div>
+    <div class="paper-content">
+        <h2 class="paper-title">
+            <a href="https://arxiv.org/abs/{{id}}" target="_blank">{{title}}</a>
+        </h2>
+        <div class="paper-meta">
+            <span class="meta-item">📅 {{published}}</span>
+            {{#venue}}<span class="venue-badge {{venue_class}}">{{venue}}</span>{{/venue}}
+        </div>
+        <div class="paper-authors">
+            👥 {{authors}}
+        </div>
+        <div class="paper-tags">
+            {{#tags}}<span class="tag">{{.}}</span>{{/tags}}
+        </div>
+        <div class="paper-abstract">
+            <details data-month="{{month}}" data-chunk="{{chunk}}">
+                <summary>查看摘要</summary>
+                <p>{{abstract}}</p>
+            </details>
+        </div>
+        <div class="paper-links">
+            <a href="https://arxiv.org/pdf/{{id}}" target="_blank" class="btn-link">📄 PDF</a>
+            {{#code_link}}<a href="{{code_link}}" target="_blank" class="btn-link btn-code">💻 Code</a>{{/code_link}}
+            {{#project_link}}<a href="{{project_link}}" target="_blank" class="btn-link btn-project">🌐 Project</a>{{/project_link}}
+        </div>
+    </div>
+</article>
+"""
+
+_TAG_PATTERN = re.compile(r'\{\{\s*([#/]?)\s*([\w.]+)\s*\}\}')
+
+
+def escape_html(value) -> str:
+    """HTML 转义（与 card.js 中的 escapeHTML 一致），None 输出为空字符串"""
+    if value is None:
+        return ''
+    return html.escape(str(value), quote=True)
+
+
+def parse_template(template: str) -> List:
+    """把模板解析为节点列表：字符串（原文）、('var', 名称)、('section', 名称, 子节点)"""
+    # 去掉每行的缩进，减小输出体积
+    template = '\n'.join(line.strip() for line in template.strip().splitlines())
+    
+    root = []
+    stack = [(None, root)]
+    pos = 0
+    for match in _TAG_PATTERN.finditer(template):
+        if match.start() > pos:
+            stack[-1][1].append(template[pos:match.start()])
+        pos = match.end()
+        kind, name = match.groups()
+        if kind == '#':
+            children = []
+            stack[-1][1].append(('section', name, children))
+            stack.append((name, children))
+        elif kind == '/':
+            if stack[-1][0] != name:
+                raise ValueError(f"模板区块未正确闭合: {name}")
+            stack.pop()
+        else:
+            stack[-1][1].append(('var', name))
+    if len(stack) != 1:
+        raise ValueError(f"模板区块未闭合: {stack[-1][0]}")
+    if pos < len(template):
+        root.append(template[pos:])
+    return root
+
+
+def _compile_python(nodes: List) -> str:
+    """生成 Python 渲染函数源码"""
+    lines = ['def render(c):', '    out = []', '    a = out.append']
+    counter = [0]
+    
+    def emit(nodes: List, indent: str, item: Optional[str]):
+        for node in nodes:
+            if isinstance(node, str):
+                lines.append(f'{indent}a({node!r})')
+            elif node[0] == 'var':
+                value = item if node[1] == '.' else f'c.get({node[1]!r})'
+                lines.append(f'{indent}a(_escape({value}))')
+            else:
+                counter[0] += 1
+                var = f'v{counter[0]}'
+                lines.append(f'{indent}{var} = c.get({node[1]!r})')
+                lines.append(f'{indent}if isinstance({var}, list):')
+                lines.append(f'{indent}    for i{counter[0]} in {var}:')
+                emit(node[2], indent + '        ', f'i{counter[0]}')
+                lines.append(f'{indent}elif {var}:')
+                emit(node[2], indent + '    ', var)
+    
+    emit(nodes, '    ', None)
+    lines.append("    return ''.join(out)")
+    return '\n'.join(lines)
+
+
+def _compile_js(nodes: List) -> str:
+    """生成 JavaScript 渲染函数源码"""
+    lines = ['function (c) {', '    var o = \'\';']
+    counter = [0]
+    
+    def emit(nodes: List, indent: str, item: Optional[str]):
+        for node in nodes:
+            if isinstance(node, str):
+                lines.append(f'{indent}o += {json.dumps(node, ensure_ascii=False)};')
+            elif node[0] == 'var':
+                value = item if node[1] == '.' else f'c[{json.dumps(node[1])}]'
+                lines.append(f'{indent}o += escapeHTML({value});')
+            else:
+                counter[0] += 1
+                n = counter[0]
+                lines.append(f'{indent}var v{n} = c[{json.dumps(node[1])}];')
+                lines.append(f'{indent}if (Array.isArray(v{n})) {{')
+                lines.append(f'{indent}    for (var k{n} = 0; k{n} < v{n}.length; k{n}++) {{')
+                lines.append(f'{indent}        var i{n} = v{n}[k{n}];')
+                emit(node[2], indent + '        ', f'i{n}')
+                lines.append(f'{indent}    }}')
+                lines.append(f'{indent}}} else if (v{n}) {{')
+                emit(node[2], indent + '    ', f'v{n}')
+                lines.append(f'{indent}}}')
+    
+    emit(nodes, '    ', None)
+    lines.append('    return o;')
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def compile_template(template: str) -> Tuple[Callable[[Dict], str], str]:
+    """编译模板，返回 (Python 渲染函数, JavaScript 渲染函数源码)"""
+    nodes = parse_template(template)
+    namespace = {'_escape': escape_html}
+    exec(_compile_python(nodes), namespace)
+    return namespace['render'], _compile_js(nodes)
+
+
+# 导入时编译一次
+render_card, _CARD_JS_RENDER = compile_template(CARD_TEMPLATE)
+
+
+def venue_badge_class(conference: Optional[str]) -> str:
+    """会议徽章样式"""
+    conference_upper = (conference or '').upper()
+    for keyword, css_class in VENUE_BADGE_CLASSES:
+        if keyword in conference_upper:
+            return css_class
+    return DEFAULT_BADGE_CLASS
+
+
+def card_context(paper: Dict, abstract: Optional[str] = None) -> Dict:
+    """由论文数据构建卡片模板上下文（与 card.js 中的 PaperCard.context 一致）
+    
+    abstract 为 None 时使用论文自带的摘要。
+    """
+    authors = paper.get('authors') or []
+    if isinstance(authors, list):
+        authors_text = ', '.join(authors[:MAX_AUTHORS])
+        if len(authors) > MAX_AUTHORS:
+            authors_text += ' et al.'
+    else:
+        authors_text = authors
+    
+    conference = paper.get('conference')
+    tags = paper.get('tags') or []
+    published = paper.get('published') or ''
+    chunk = paper.get('chunk')
+    return {
+        'id': paper.get('id'),
+        'title': paper.get('title'),
+        'published': published,
+        'month': published[:7],
+        'status': 'published' if conference else 'preprint',
+        'authors': authors_text,
+        'tags': tags,
+        'tags_csv': ','.join(tags),
+        'venue': conference,
+        'venue_class': paper.get('venue_class') or venue_badge_class(conference),  # 构建时可传入缓存的样式
+        'code_link': paper.get('code_link'),
+        'project_link': paper.get('project_link'),
+        'abstract': paper.get('abstract', '') if abstract is None else abstract,
+        'chunk': '' if chunk is None else str(chunk),
+    }
+
+
+def build_card_js() -> str:
+    """生成 docs/js/card.js：定义全局 PaperCard.render / PaperCard.context"""
+    return f"""// 论文卡片渲染（由 scripts/card_template.py 生成，请勿手动修改）
+var PaperCard = (function () {{
+    var ESCAPES = {{ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;' }};
+    var MAX_AUTHORS = {MAX_AUTHORS};
+    var VENUE_BADGE_CLASSES = {json.dumps(VENUE_BADGE_CLASSES)};
+    var DEFAULT_BADGE_CLASS = {json.dumps(DEFAULT_BADGE_CLASS)};
+    
+    function escapeHTML(value) {{
+        if (value === null || value === undefined) return '';
+        return String(value).replace(/[&<>"']/g, function (ch) {{ return ESCAPES[ch]; }});
+    }}
+    
+    function venueBadgeClass(conference) {{
+        var upper = (conference || '').toUpperCase();
+        for (var i = 0; i < VENUE_BADGE_CLASSES.length; i++) {{
+            if (upper.indexOf(VENUE_BADGE_CLASSES[i][0]) !== -1) return VENUE_BADGE_CLASSES[i][1];
+        }}
+        return DEFAULT_BADGE_CLASS;
+    }}
+    
+    function context(paper, abstract) {{
+        var authors = paper.authors || [];
+        var authorsText = authors;
+        if (Array.isArray(authors)) {{
+            authorsText = authors.slice(0, MAX_AUTHORS).join(', ');
+            if (authors.length > MAX_AUTHORS) authorsText += ' et al.';
+        }}
+        var conference = paper.conference;
+        var tags = paper.tags || [];
+        var published = paper.published || '';
+        var chunk = paper.chunk;
+        return {{
+            id: paper.id,
+            title: paper.title,
+            published: published,
+            month: published.substring(0, 7),
+            status: conference ? 'published' : 'preprint',
+            authors: authorsText,
+            tags: tags,
+            tags_csv: tags.join(','),
+            venue: conference,
+            venue_class: paper.venue_class || venueBadgeClass(conference),
+            code_link: paper.code_link,
+            project_link: paper.project_link,
+            abstract: abstract === undefined || abstract === null ? (paper.abstract === undefined ? '' : paper.abstract) : abstract,
+            chunk: chunk === undefined || chunk === null ? '' : String(chunk)
+        }};
+    }}
+    
+    var render = {_CARD_JS_RENDER};
+    
+    return {{ render: render, context: context, escapeHTML: escapeHTML }};
+}})();
+"""
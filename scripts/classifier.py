@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+关键词分类器
+根据 config.yaml 中 categories 的关键词给论文打标签。
+
+所有类别的关键词在构建时合并成一个按字典树（trie）组织的正则表达式，
+由正则引擎在 C 层逐位置扫描文本，每篇论文只需扫描一次就能找出所有出现的关键词，
+耗时基本不随关键词数量增长。
+"""
+
+import re
+from typing import Dict, Iterable, List, Set
+
+
+def build_trie_pattern(keywords: Iterable[str]) -> str:
+    """把关键词构建成字典树形式的正则表达式，每个位置优先匹配最长的关键词
+    
+    例如 ["control", "contrastive learning"] -> "contr(?:ol|astive\\ learning)"
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True  # 关键词结束标记
+    
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # 当前结点本身也是一个关键词时，后续部分可选（贪婪匹配保证优先取更长的关键词）
+        return f'(?:{body})?' if '' in node else body
+    
+    return build(trie)
+
+
+class KeywordClassifier:
+    """基于合并正则的多关键词分类器"""
+    
+    def __init__(self, categories: Dict, word_boundary: bool = False):
+        """
+        categories: {类别名: {'keywords': [...]}}，即 config['categories']
+        word_boundary: 为 True 时关键词必须作为完整单词出现（如 "gpt" 不匹配 "gpts"）
+        """
+        self.category_names = list(categories.keys())
+        self.word_boundary = word_boundary
+        
+        # 关键词（小写）-> 所属类别下标集合
+        keyword_categories = {}
+        for index, (category_name, category_info) in enumerate(categories.items()):
+            for keyword in (category_info or {}).get('keywords', []) or []:
+                keyword = str(keyword).lower()
+                if keyword:
+                    keyword_categories.setdefault(keyword, set()).add(index)
+        
+        # 字典树正则在每个位置上匹配最长的关键词；
+        # 同一位置上同时出现的较短关键词必然是它的前缀，预先把这些前缀的类别合并进来
+        self._categories_by_keyword = {
+            keyword: self._prefix_closure(keyword, keyword_categories)
+            for keyword in keyword_categories
+        }
+        
+        self.pattern = None
+        if keyword_categories:
+            trie_pattern = build_trie_pattern(keyword_categories)
+            if word_boundary:
+                trie_pattern = rf'(?<!\w)(?:{trie_pattern})(?!\w)'
+            self.pattern = re.compile(trie_pattern)
+    
+    @classmethod
+    def from_config(cls, config: Dict) -> 'KeywordClassifier':
+        """从完整配置构建分类器"""
+        classification = config.get('classification', {}) or {}
+        return cls(config.get('categories', {}) or {},
+                   word_boundary=classification.get('word_boundary', False))
+    
+    def _prefix_closure(self, keyword: str, keyword_categories: Dict[str, Set[int]]) -> Set[int]:
+        """keyword 所属类别，加上在同一位置必然同时匹配的前缀关键词的类别"""
+        result = set(keyword_categories[keyword])
+        for length in range(1, len(keyword)):
+            prefix = keyword[:length]
+            if prefix not in keyword_categories:
+                continue
+            # 单词边界模式下，前缀后面紧跟单词字符时不构成独立匹配
+            if self.word_boundary and re.match(r'\w', keyword[length]):
+                continue
+            result |= keyword_categories[prefix]
+        return result
+    
+    def classify_text(self, text: str) -> List[str]:
+        """返回文本命中的类别（按配置顺序）"""
+        if self.pattern is None:
+            return []
+        
+        found = set()
+        total = len(self.category_names)
+        text = text.lower()
+        pos = 0
+        while True:
+            match = self.pattern.search(text, pos)
+            if not match:
+                break
+            found |= self._categories_by_keyword[match.group()]
+            if len(found) == total:
+                break
+            # 从下一个位置继续搜索，相互重叠的关键词（如 "image-text" 与 "text generation"）都能被找到
+            pos = match.start() + 1
+        return [self.category_names[index] for index in sorted(found)]
+    
+    def classify_paper(self, paper: Dict) -> List[str]:
+        """根据标题和摘要给论文分类"""
+        return self.classify_text(paper['title'] + ' ' + paper['abstract'])
@@ -4,14 +4,30 @@
 从 ArXiv 等数据源抓取最新论文
 """
 
+import argparse
 import arxiv
 import json
+import sys
 import yaml
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 import logging
 
+# 以脚本方式运行（python scripts/fetch_papers.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts import venue
+from scripts.arxiv_atom import AtomClient, Entry
+from scripts.classifier import KeywordClassifier
+from scripts.metrics import Metrics
+from scripts.storage import open_store
+from scripts.transport import HTTPTransport, PooledHTTPTransport, open_transport
+from scripts.utils import strip_arxiv_version
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -20,19 +36,129 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """全局限速器：保证所有线程发出的请求之间至少间隔 interval 秒"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+    
+    def wait(self) -> float:
+        """阻塞直到允许发出下一个请求，返回等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            # 预约下一个请求时间片，锁外睡眠，避免阻塞其他线程排队
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+            return wait_time
+        return 0.0
+
+
+class RateLimitedClient(arxiv.Client):
+    """使用全局限速器的 ArXiv 客户端（每页请求及重试都经过限速器，请求通过传输对象发出）"""
+    
+    def __init__(self, rate_limiter: RateLimiter, page_size: int = 100, num_retries: int = 3,
+                 transport: Optional[HTTPTransport] = None, metrics: Optional[Metrics] = None,
+                 category: str = ''):
+        # 关闭客户端自身的按实例限速，由共享的限速器统一控制
+        super().__init__(page_size=page_size, delay_seconds=0, num_retries=num_retries)
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics or Metrics('fetch')
+        self.category = category
+        # arxiv.Client 通过 self._session.get(url, headers=...) 请求，替换为传输对象以支持录制/回放
+        if transport is not None:
+            self._session = transport
+    
+    def _parse_feed(self, url, first_page=True, _try_index=0):
+        # 重试时 arxiv.Client 会再次调用 _parse_feed，每次请求都计数
+        self.metrics.add_time('rate_limit_wait', self.rate_limiter.wait(), category=self.category)
+        self.metrics.count('api_requests', category=self.category)
+        return super()._parse_feed(url, first_page=first_page, _try_index=_try_index)
+
+
+def result_to_entry(result: arxiv.Result) -> Entry:
+    """arxiv.Result -> (提交时间, 更新时间, 论文字典)，字段与 scripts/arxiv_atom.py 的解析结果一致"""
+    return result.published, result.updated, {
+        'id': result.entry_id.split('/')[-1],
+        'title': result.title,
+        'authors': [author.name for author in result.authors],
+        'abstract': result.summary,
+        'published': result.published.strftime('%Y-%m-%d'),
+        'updated': result.updated.strftime('%Y-%m-%d'),
+        'categories': result.categories,
+        'primary_category': result.primary_category,
+        'pdf_url': result.pdf_url,
+        'arxiv_url': result.entry_id,
+        'source': 'ArXiv',
+        'venue': None,
+        'query_categories': None,
+        'comment': result.comment if result.comment else None,
+        'journal_ref': result.journal_ref if hasattr(result, 'journal_ref') and result.journal_ref else None
+    }
+
+
 class PaperFetcher:
     """论文抓取器"""
     
-    def __init__(self, config_path: str = "config.yaml"):
-        """初始化"""
+    def __init__(self, config_path: str = "config.yaml", transport: Optional[HTTPTransport] = None,
+                 metrics: Optional[Metrics] = None, output_dir: Optional[str] = None):
+        """初始化
+        
+        transport 为请求使用的传输（见 scripts/transport.py），默认按抓取后端直接访问网络；
+        metrics 记录各阶段耗时和计数（见 scripts/metrics.py）；
+        output_dir 为保存论文和水位线的数据目录，默认为配置中的 output.data_dir（data/）。
+        """
         self.config = self.load_config(config_path)
+        self.transport = transport  # 为 None 时在抓取时按后端创建
+        self.metrics = metrics or Metrics('fetch')
         self.papers = []
-        
+        self.classifier = None  # 关键词分类器，首次分类时根据 config['categories'] 构建
+        
+        # 增量抓取水位线：与论文数据存放在同一目录
+        self.output_dir = output_dir
+        self.data_dir = Path(output_dir or self.config.get('output', {}).get('data_dir', 'data'))
+        self.watermark_path = self.data_dir / "fetch_watermarks.json"
+        self.new_watermarks = {}
+        self.entry_cache = {}  # 带版本号的 arXiv ID -> 论文字典，交叉列出的论文只构建一次
+    
     def load_config(self, config_path: str) -> dict:
         """加载配置文件"""
         with open(config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
     
+    def load_watermarks(self) -> Dict[str, str]:
+        """加载各类别的水位线（已抓取到的最新提交/更新时间，ISO 格式）
+        
+        回放录制的响应时使用录制开始时的水位线，不读取数据目录中的文件。
+        """
+        recorded = getattr(self.transport, 'watermarks', None)
+        if recorded is not None:
+            return dict(recorded)
+        if not self.watermark_path.exists():
+            return {}
+        with open(self.watermark_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_watermarks(self):
+        """保存本次抓取推进后的水位线（应在论文数据保存成功后调用）"""
+        if not self.new_watermarks:
+            return
+        
+        watermarks = self.load_watermarks()
+        for category, timestamp in self.new_watermarks.items():
+            old = watermarks.get(category)
+            if not old or datetime.fromisoformat(timestamp) > datetime.fromisoformat(old):
+                watermarks[category] = timestamp
+        
+        self.watermark_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.watermark_path, 'w', encoding='utf-8') as f:
+            json.dump(watermarks, f, ensure_ascii=False, indent=2, sort_keys=True)
+        
+        logger.info(f"更新抓取水位线: {self.watermark_path}")
+    
     def fetch_arxiv_papers(self) -> List[Dict]:
         """从 ArXiv 抓取论文"""
         logger.info("开始从 ArXiv 抓取论文...")
@@ -42,266 +168,242 @@ class PaperFetcher:
             logger.info("ArXiv 数据源未启用")
             return []
         
-        papers = []
         categories = arxiv_config['categories']
         max_results = arxiv_config['max_results']
         days_back = arxiv_config.get('days_back', 1)
-        
-        # 计算时间范围（使用 UTC 时区）
-        end_date = datetime.now(timezone.utc)
+        max_workers = max(1, arxiv_config.get('max_workers', 1))
+        early_stop = arxiv_config.get('early_stop', False)
+        self.page_size = arxiv_config.get('page_size', 100)
+        
+        # 抓取后端：arxiv（arxiv 包）或 atom（直接请求并逐条目解析 Atom，所有线程共用一个连接池）
+        self.backend = arxiv_config.get('backend', 'arxiv')
+        if self.transport is None:
+            self.transport = PooledHTTPTransport(max_workers) if self.backend == 'atom' else HTTPTransport()
+        
+        # 自适应模式：不设数量上限，一直翻页直到结果早于时间窗口
+        if arxiv_config.get('adaptive_max_results', False):
+            if not early_stop:
+                logger.warning("adaptive_max_results 需要配合 early_stop 使用，已自动开启 early_stop"
+                               "（在窗口之前提交、窗口内修订的论文不会被抓取）")
+                early_stop = True
+            max_results = None
+        
+        # 计算时间范围（使用 UTC 时区；回放录制的响应时以录制时间为终点）
+        end_date = self.transport.now()
         start_date = end_date - timedelta(days=days_back)
         
-        for category in categories:
-            logger.info(f"抓取类别: {category}")
+        # 增量模式：有水位线的类别只抓取水位线之后的部分，没有水位线时回退到 days_back
+        # 向前多取 watermark_overlap_hours，覆盖提交后延迟公布的论文（重复的论文在保存时去重）；
+        # 有水位线的类别结果早于起始时间后即停止翻页，否则每次仍会翻到 max_results，增量抓取省不下请求
+        start_dates = {category: start_date for category in categories}
+        early_stops = {category: early_stop for category in categories}
+        if arxiv_config.get('incremental', False):
+            overlap = timedelta(hours=arxiv_config.get('watermark_overlap_hours', 24))
+            watermarks = self.load_watermarks()
+            self.transport.record_watermarks(watermarks)  # 录制时一并保存，回放时使用相同的起始时间
+            for category, timestamp in watermarks.items():
+                if category in start_dates:
+                    start_dates[category] = datetime.fromisoformat(timestamp) - overlap
+                    early_stops[category] = True
+                    logger.info(f"{category} 增量抓取，起始时间: {start_dates[category].strftime('%Y-%m-%d %H:%M')}")
+        self.new_watermarks = {}
+        self.entry_cache = {}
+        
+        # 每次抓取都根据当前配置重建分类器（关键词只编译一次，供所有类别共用）
+        self.classifier = KeywordClassifier.from_config(self.config)
+        
+        # 所有类别共享一个全局限速器，并发时也遵守 ArXiv API 的请求间隔（离线回放时不限速）
+        delay_seconds = 0 if self.transport.offline else arxiv_config.get('delay_seconds', 3.0)
+        self.rate_limiter = RateLimiter(delay_seconds)
+        
+        if max_workers == 1 or len(categories) <= 1:
+            results = [self.fetch_arxiv_category(category, start_dates[category], max_results, early_stops[category])
+                       for category in categories]
+        else:
+            logger.info(f"并发抓取 {len(categories)} 个类别（线程数：{max_workers}）")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # executor.map 按类别顺序返回结果，与各线程完成的先后无关
+                results = list(executor.map(
+                    lambda category: self.fetch_arxiv_category(category, start_dates[category], max_results, early_stops[category]),
+                    categories
+                ))
+        
+        # 所有类别抓取完成后再按配置顺序合并，并发与串行模式的输出完全一致
+        papers = self.merge_category_papers(categories, results)
+        
+        if self.duplicate_count:
+            logger.info(f"跨类别去重：跳过 {self.duplicate_count} 篇重复论文")
+        logger.info(f"ArXiv 总共抓取了 {len(papers)} 篇论文")
+        return papers
+    
+    def fetch_arxiv_category(self, category: str, start_date: datetime, max_results: int,
+                             early_stop: bool = False) -> List[Dict]:
+        """抓取单个 ArXiv 类别的论文
+        
+        max_results 为 None 时不设上限；early_stop 为 True 时，结果（按提交时间降序）
+        早于 start_date 即停止翻页，不再请求后续页面。
+        
+        时间窗口按更新时间过滤，而结果按提交时间排序：开启 early_stop 后，在窗口之前提交、
+        窗口内修订的论文不会被抓取，因此 early_stop 默认关闭。
+        """
+        logger.info(f"抓取类别: {category}")
+        start_time = time.perf_counter()
+        papers = []
+        scanned = 0
+        reached_window_end = False
+        newest = None
+        
+        try:
+            # 获取结果（按提交时间降序）
+            for published_at, updated_at, paper in self.iter_arxiv_entries(category, max_results):
+                scanned += 1
+                
+                # 结果按提交时间降序排列，提交时间早于窗口后不会再有窗口内提交的论文
+                # （但可能还有更早提交、窗口内修订的论文，early_stop 时跳过它们）
+                if published_at < start_date:
+                    reached_window_end = True
+                    if early_stop:
+                        break
+                
+                # 检查发布时间（使用更新时间或发布时间）
+                paper_date = updated_at if updated_at else published_at
+                
+                # 只获取时间范围内的论文
+                if paper_date < start_date:
+                    continue
+                
+                # 记录本类别见到的最新时间，作为下次增量抓取的水位线
+                if newest is None or paper_date > newest:
+                    newest = paper_date
+                
+                papers.append(paper)
+            
+            logger.info(f"从 {category} 抓取了 {len(papers)} 篇论文（时间范围：{start_date.strftime('%Y-%m-%d')} 至今，扫描 {scanned} 条）")
             
-            try:
-                # 构建查询
-                search = arxiv.Search(
-                    query=f"cat:{category}",
-                    max_results=max_results,
-                    sort_by=arxiv.SortCriterion.SubmittedDate,
-                    sort_order=arxiv.SortOrder.Descending
-                )
+            # 只有成功抓取完整个时间窗口的类别才推进水位线：被 max_results 截断时，截掉的论文早于本次抓到的论文，
+            # 推进水位线后下次增量抓取会永远跳过它们
+            truncated = bool(max_results) and scanned >= max_results and not reached_window_end
+            if newest is not None and not truncated:
+                self.new_watermarks[category] = newest.isoformat()
+            
+            if truncated:
+                logger.warning(f"{category} 达到 max_results={max_results} 上限但未覆盖整个时间窗口，结果可能被截断，"
+                               f"水位线保持不变；可调大 max_results 或开启 adaptive_max_results")
+        
+        except Exception as e:
+            logger.error(f"抓取 {category} 时出错: {e}")
+            self.metrics.count('fetch_errors', category=category)
+        
+        # 类别总耗时，包含请求、限速等待、解析、会议提取和分类
+        self.metrics.add_time('fetch_category', time.perf_counter() - start_time, items=len(papers), category=category)
+        self.metrics.count('results_scanned', scanned, category=category)
+        return papers
+    
+    def merge_category_papers(self, categories: List[str], results: List[List[Dict]]) -> List[Dict]:
+        """按配置的类别顺序合并各类别的结果并跨类别去重（按无版本号 ID）
+        
+        交叉列出的论文归属配置中排在前面的类别，query_categories 按配置顺序列出所有返回它的类别；
+        每篇论文只提取一次会议信息、分类一次。
+        """
+        papers = []
+        seen = {}  # 无版本号 ID -> 论文
+        self.duplicate_count = 0
+        for category, category_papers in zip(categories, results):
+            for paper in category_papers:
+                base_id = strip_arxiv_version(paper['id'])
+                existing = seen.get(base_id)
+                if existing is not None:
+                    if category not in existing['query_categories']:
+                        existing['query_categories'].append(category)
+                    self.duplicate_count += 1
+                    self.metrics.count('papers_deduplicated', source='cross_category')
+                    continue
+                seen[base_id] = paper
                 
-                # 获取结果
-                count = 0
-                for result in search.results():
-                    # 检查发布时间（使用更新时间或发布时间）
-                    paper_date = result.updated if result.updated else result.published
-                    
-                    # 只获取时间范围内的论文
-                    if paper_date < start_date:
-                        continue
-                    
-                    paper = {
-                        'id': result.entry_id.split('/')[-1],
-                        'title': result.title,
-                        'authors': [author.name for author in result.authors],
-                        'abstract': result.summary,
-                        'published': result.published.strftime('%Y-%m-%d'),
-                        'updated': result.updated.strftime('%Y-%m-%d'),
-                        'categories': result.categories,
-                        'primary_category': result.primary_category,
-                        'pdf_url': result.pdf_url,
-                        'arxiv_url': result.entry_id,
-                        'source': 'ArXiv',
-                        'venue': category,
-                        'comment': result.comment if result.comment else None,
-                        'journal_ref': result.journal_ref if hasattr(result, 'journal_ref') and result.journal_ref else None
-                    }
-                    
-                    # 提取会议/期刊信息（优先使用journal_ref，然后是comment）
+                paper['venue'] = category
+                paper['query_categories'] = [category]
+                
+                # 提取会议/期刊信息（优先使用journal_ref，然后是comment）
+                with self.metrics.stage('venue_extraction', items=1, category=category):
                     paper['conference'] = self.extract_venue_from_journal_ref(paper.get('journal_ref')) or \
                                          self.extract_venue_from_comment(paper.get('comment'))
-                    
-                    # 分类论文
-                    paper['tags'] = self.classify_paper(paper)
-                    
-                    papers.append(paper)
-                    count += 1
                 
-                logger.info(f"从 {category} 抓取了 {count} 篇论文（时间范围：{start_date.strftime('%Y-%m-%d')} 至今）")
+                # 分类论文
+                with self.metrics.stage('classification', items=1, category=category):
+                    paper['tags'] = self.classify_paper(paper)
                 
-            except Exception as e:
-                logger.error(f"抓取 {category} 时出错: {e}")
-                continue
-        
-        logger.info(f"ArXiv 总共抓取了 {len(papers)} 篇论文")
+                papers.append(paper)
         return papers
     
-    def extract_venue_from_journal_ref(self, journal_ref: str) -> str:
-        """从 journal_ref 字段提取会议/期刊信息
-        例如: "The International Conference on Pattern Recognition (ICPR),2024"
+    def iter_arxiv_entries(self, category: str, max_results: Optional[int]) -> Iterator[Entry]:
+        """按提交时间降序逐条返回类别中的论文 (提交时间, 更新时间, 论文字典)
+        
+        backend 为 atom 时使用直接 Atom 客户端（scripts/arxiv_atom.py），否则使用 arxiv 包。
         """
-        if not journal_ref:
-            return None
-        
-        journal_ref = journal_ref.strip()
-        
-        import re
-        
-        # 常见会议列表
-        conferences = [
-            'CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR', 
-            'ACL', 'EMNLP', 'NAACL', 'AAAI', 'IJCAI', 'KDD',
-            'ICRA', 'IROS', 'CoRL', 'RSS', 'ICPR',
-            'SIGIR', 'WWW', 'WSDM', 'RecSys',
-            'SIGMOD', 'VLDB', 'ICDE',
-            'SIGGRAPH', 'ICASSP', 'INTERSPEECH'
-        ]
-        
-        # 模式1: 提取括号中的会议缩写及周围信息
-        # 例如: "The International Conference on Pattern Recognition (ICPR),2024"
-        pattern_with_acronym = r'([^()]*)\s*\(([A-Z]{2,})\s*(?:\d+)?\)\s*,?\s*(\d{4})?'
-        match = re.search(pattern_with_acronym, journal_ref)
-        if match:
-            full_name = match.group(1).strip()  # "The International Conference on Pattern Recognition"
-            acronym = match.group(2)  # "ICPR"
-            year = match.group(3)  # "2024"
-            
-            # 检查是否是已知的会议
-            if acronym.upper() in conferences:
-                # 构建返回值
-                if year:
-                    result = f"{full_name} ({acronym} {year})"
-                else:
-                    result = f"{full_name} ({acronym})"
-                
-                # 限制长度
-                if len(result) <= 200:
-                    return result
-        
-        # 模式2: 如果没找到括号，就直接返回整个journal_ref
-        # 但只有在看起来像期刊/会议名称时才返回
-        if len(journal_ref) > 3 and len(journal_ref) <= 200:
-            # 检查是否包含常见的关键词
-            if any(keyword.lower() in journal_ref.lower() for keyword in 
-                   ['conference', 'journal', 'proceedings', 'transactions', 'letters', 
-                    'review', 'symposium', 'workshop', 'conference']):
-                return journal_ref
-        
-        return None
+        # 页大小不超过 max_results，避免小批量抓取时请求多余的条目
+        page_size = min(self.page_size, max_results) if max_results else self.page_size
+        
+        if self.backend == 'atom':
+            client = AtomClient(self.transport, self.rate_limiter, page_size=page_size,
+                                metrics=self.metrics, category=category)
+            return client.results(category, max_results)
+        
+        # 每个类别使用独立的客户端，限速器全局共享
+        client = RateLimitedClient(self.rate_limiter, page_size=page_size, transport=self.transport,
+                                   metrics=self.metrics, category=category)
+        search = arxiv.Search(
+            query=f"cat:{category}",
+            max_results=max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+        return (self.cached_entry(result) for result in client.results(search))
+    
+    def cached_entry(self, result: arxiv.Result) -> Entry:
+        """arxiv.Result -> 条目；交叉列出的论文由各类别的线程共用同一个论文字典，只构建一次
+        
+        以带版本号的 ID 为键：同一版本的记录内容相同，抓取期间论文更新时新版本单独构建。
+        跨类别去重仍在 merge_category_papers 中按配置顺序进行，结果与逐条构建时相同。
+        """
+        paper = self.entry_cache.get(result.entry_id)
+        if paper is None:
+            # 多个线程同时遇到同一篇论文时可能各构建一次，setdefault 保证共用先写入的那份
+            paper = self.entry_cache.setdefault(result.entry_id, result_to_entry(result)[2])
+        return result.published, result.updated, paper
+    
+    def extract_venue_from_journal_ref(self, journal_ref: str) -> str:
+        """从 journal_ref 字段提取会议/期刊信息（见 scripts/venue.py）"""
+        return venue.extract_venue_from_journal_ref(journal_ref)
     
     def extract_venue_from_comment(self, comment: str) -> str:
-        """从 comment 字段提取会议/期刊信息，优先返回原始完整描述"""
-        if not comment:
-            return None
-        
-        comment = comment.strip()
-        
-        # 预处理：移除页数、图表、链接等冗余信息
-        import re
-        # 移除 "X pages, Y figures, Z tables" 等信息
-        comment = re.sub(r'\d+\s*pages?[,;]?\s*', '', comment, flags=re.IGNORECASE)
-        comment = re.sub(r'\d+\s*figures?[,;]?\s*', '', comment, flags=re.IGNORECASE)
-        comment = re.sub(r'\d+\s*tables?[,;]?\s*', '', comment, flags=re.IGNORECASE)
-        comment = re.sub(r'\d+\s*appendices[,;]?\s*', '', comment, flags=re.IGNORECASE)
-        # 移除 URL 链接
-        comment = re.sub(r'https?://[^\s,;]+', '', comment, flags=re.IGNORECASE)
-        # 移除 GitHub 链接描述
-        comment = re.sub(r'GitHub\s+link:?\s*', '', comment, flags=re.IGNORECASE)
-        comment = ' '.join(comment.split())  # 清理多余空格
-        
-        # 如果是 preprint，返回 None
-        if 'preprint' in comment.lower() and 'accepted' not in comment.lower():
-            return None
-        
-        # 常见会议列表
-        conferences = [
-            'CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR', 
-            'ACL', 'EMNLP', 'NAACL', 'AAAI', 'IJCAI', 'KDD',
-            'ICRA', 'IROS', 'CoRL', 'RSS',
-            'SIGIR', 'WWW', 'WSDM', 'RecSys',
-            'SIGMOD', 'VLDB', 'ICDE',
-            'SIGGRAPH', 'ICASSP', 'INTERSPEECH'
-        ]
-        
-        # 常见期刊列表
-        journals = [
-            'Nature', 'Science', 'PAMI', 'TPAMI', 'JMLR', 'IJCV',
-            'IEEE', 'ACM', 'Transactions', 'Journal'
-        ]
-        
-        import re
-        
-        # 尝试匹配常见模式并提取完整描述
-        # 模式1: "Accepted at/to CVPR 2025" 或 "Published in ICCV 2025" 或 "Published with Journal Name (Acronym)"
-        # 支持更多变体：at the, by the, for, in the, with 等
-        # 特别处理期刊名称，可能包含括号中的缩写
-        # 使用 .+? 贪婪匹配到逗号、句号、分号或字符串结尾（\Z）
-        pattern1 = r'(?:accepted?\s+(?:at\s+(?:the\s+)?|to\s+(?:the\s+)?|by\s+(?:the\s+)?|for\s+(?:the\s+)?)|published\s+(?:in\s+(?:the\s+)?|at\s+(?:the\s+)?|with\s+)|to\s+appear\s+(?:in\s+(?:the\s+)?|at\s+(?:the\s+)?))\s*(.+?)(?:[.,;]|\Z)'
-        match = re.search(pattern1, comment, re.IGNORECASE)
-        if match:
-            venue_text = match.group(1).strip()
-            # 清理多余空格、换行符
-            venue_text = ' '.join(venue_text.split())
-            # 移除尾部的位置信息（如 ", Washington, DC, USA"），但保留括号内容如 (IJETT)
-            venue_text = re.sub(r',\s*[A-Z][a-zA-Z\s,]+,\s*[A-Z]{2,}(?:\s*,\s*[A-Z]{2,4})?$', '', venue_text)
-            # 放宽长度限制，支持完整的期刊名称
-            if 5 < len(venue_text) <= 200:
-                return venue_text
-        
-        # 模式2: 直接以会议名开头，如 "CVPR 2025, Main Conference"
-        for conf in conferences:
-            pattern = rf'\b({conf}\s+\d{{4}}(?:\s*[,\-]\s*[\w\s]+)?)'
-            match = re.search(pattern, comment, re.IGNORECASE)
-            if match:
-                venue_text = match.group(1).strip()
-                # 限制长度
-                if ',' in venue_text or '-' in venue_text:
-                    # 只取会议名和年份部分
-                    venue_text = re.match(rf'{conf}\s+\d{{4}}', venue_text, re.IGNORECASE).group(0)
-                return venue_text
-        
-        # 模式3: 只有会议名和年份
-        for conf in conferences:
-            pattern = rf'\b{conf}\s*[:\']?\s*(\d{{4}})\b'
-            match = re.search(pattern, comment, re.IGNORECASE)
-            if match:
-                year = match.group(1)
-                return f"{conf} {year}"
-        
-        # 模式4: 只有会议名
-        for conf in conferences:
-            pattern = rf'\b{conf}\b'
-            if re.search(pattern, comment, re.IGNORECASE):
-                return conf
-        
-        # 检查期刊 - 尽量返回完整描述
-        for journal in journals:
-            if journal.lower() in comment.lower():
-                # 取第一句或前80个字符
-                first_sentence = comment.split('.')[0].strip()
-                if len(first_sentence) <= 80:
-                    return first_sentence
-                return comment[:80].strip() + '...'
-        
-        return None
+        """从 comment 字段提取会议/期刊信息（见 scripts/venue.py）"""
+        return venue.extract_venue_from_comment(comment)
     
     def classify_paper(self, paper: Dict) -> List[str]:
         """根据关键词分类论文"""
-        tags = set()
-        text = (paper['title'] + ' ' + paper['abstract']).lower()
-        
-        categories = self.config.get('categories', {})
-        for category_name, category_info in categories.items():
-            keywords = category_info.get('keywords', [])
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    tags.add(category_name)
-                    break
-        
-        return list(tags)
+        if self.classifier is None:
+            self.classifier = KeywordClassifier.from_config(self.config)
+        return self.classifier.classify_paper(paper)
     
     def save_papers(self, papers: List[Dict], output_path: str = "data/papers.json"):
         """保存论文数据"""
         output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # 加载已有数据
-        existing_papers = []
-        if output_file.exists():
-            with open(output_file, 'r', encoding='utf-8') as f:
-                existing_papers = json.load(f)
-        
-        # 去重（根据论文ID）
-        existing_ids = {p['id'] for p in existing_papers}
-        new_papers = [p for p in papers if p['id'] not in existing_ids]
         
-        # 合并数据
-        all_papers = new_papers + existing_papers
+        # 存储后端：json（单个 papers.json）或 sharded（按月分片，只重写有变动的月份）
+        backend = self.config.get('output', {}).get('storage', 'json')
+        store = open_store(output_file, backend=backend)
         
-        # 按日期排序
-        all_papers.sort(key=lambda x: x['published'], reverse=True)
+        # 去重（根据论文ID）并合并
+        with self.metrics.stage('save', items=len(papers)):
+            new_count = store.add(papers)
+        self.metrics.count('papers_saved', new_count)
+        self.metrics.count('papers_deduplicated', len(papers) - new_count, source='store')
         
-        # 保存
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_papers, f, ensure_ascii=False, indent=2)
+        logger.info(f"保存了 {new_count} 篇新论文，总共 {store.count()} 篇")
         
-        logger.info(f"保存了 {len(new_papers)} 篇新论文，总共 {len(all_papers)} 篇")
-        
-        # 同时保存今日论文
-        today = datetime.now().strftime('%Y-%m-%d')
+        # 同时保存今日论文（回放时以录制时间为今天）
+        offline = self.transport is not None and self.transport.offline
+        today = (self.transport.now() if offline else datetime.now()).strftime('%Y-%m-%d')
         today_papers = [p for p in papers if p['published'] == today]
         if today_papers:
             today_file = output_file.parent / f"papers_{today}.json"
@@ -321,20 +423,40 @@ class PaperFetcher:
         # 合并所有论文
         all_papers = arxiv_papers
         
-        # 保存数据
-        if all_papers:
-            self.save_papers(all_papers)
+        # 保存数据（离线回放时不改写数据目录，除非通过 output_dir 显式指定保存位置）
+        if all_papers and self.transport is not None and self.transport.offline and self.output_dir is None:
+            logger.info(f"回放完成！共获取 {len(all_papers)} 篇论文（未保存，使用 --output 指定保存目录）")
+        elif all_papers:
+            self.save_papers(all_papers, str(self.data_dir / "papers.json"))
+            self.save_watermarks()
             logger.info(f"抓取完成！共获取 {len(all_papers)} 篇论文")
         else:
             logger.warning("未抓取到任何论文")
         
+        logger.info(f"各阶段耗时: {self.metrics.summary()}（总计 {self.metrics.duration():.2f}s）")
         logger.info("=" * 60)
 
 
 def main():
     """主函数"""
-    fetcher = PaperFetcher()
+    parser = argparse.ArgumentParser(description="从 ArXiv 抓取最新论文")
+    parser.add_argument('--config', default="config.yaml", help="配置文件路径")
+    parser.add_argument('--record', metavar='DIR', default=None, help="同时把 API 原始响应录制到目录")
+    parser.add_argument('--replay', metavar='DIR', default=None, help="从录制目录回放响应，不访问网络")
+    parser.add_argument('--output', metavar='DIR', default=None,
+                        help="保存论文和水位线的数据目录（默认 data/；回放时不指定则不保存）")
+    parser.add_argument('--metrics-report', metavar='PATH', default=None, help="写出各阶段耗时和计数的 JSON 报告")
+    parser.add_argument('--prometheus', metavar='PATH', default=None, help="写出 Prometheus 文本格式的指标")
+    args = parser.parse_args()
+    
+    fetcher = PaperFetcher(args.config, transport=open_transport(record=args.record, replay=args.replay),
+                           output_dir=args.output)
     fetcher.run()
+    
+    if args.metrics_report:
+        fetcher.metrics.write_report(args.metrics_report)
+    if args.prometheus:
+        fetcher.metrics.write_prometheus(args.prometheus)
 
 
 if __name__ == "__main__":
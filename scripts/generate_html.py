@@ -4,47 +4,358 @@
 将论文数据生成为 HTML 页面
 """
 
+import argparse
+import gzip
+import hashlib
+import itertools
 import json
+import re
+import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Union
 import logging
 
+import yaml
+
+# 以脚本方式运行（python scripts/generate_html.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.assets import HEADERS_FILE, hashed_name, minify
+from scripts.card_template import build_card_js, card_context, render_card, venue_badge_class
+from scripts.metrics import Metrics
+from scripts.search_index import INDEX_VERSION, STOPWORDS, build_search_index
+from scripts.storage import open_store
+from scripts.utils import compute_paper_stats
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 输出格式版本：修改月度数据文件或论文卡片的生成方式后递增，使增量构建缓存失效
+BUILD_VERSION = 4
+
+# 月度列表文件（{month}.list.json）包含的字段；摘要按块单独存放，展开或搜索时才加载
+LIST_FILE_FIELDS = ['id', 'title', 'authors', 'published', 'conference', 'tags', 'code_link', 'project_link']
+
+# 列表页前端实际用到的论文字段（开启 trim_fields 时，月度数据文件只保留这些字段）
+LIST_VIEW_FIELDS = LIST_FILE_FIELDS + ['abstract', 'categories']
+
+# 卡片派生字段（代码/项目链接、会议徽章样式）的计算规则版本：修改提取逻辑后递增，使缓存失效
+DERIVED_VERSION = 3
+
+# 摘要中的代码、项目和 GitHub 链接
+_CODE_LINK_PATTERN = re.compile(r'[Cc]ode[:\s]+(?:available at\s+)?(\S+)')
+_PROJECT_LINK_PATTERN = re.compile(r'[Pp]roject[:\s]+(?:page\s+)?(\S+)')
+_GITHUB_LINK_PATTERN = re.compile(r'(https?://(?:www\.)?github\.com/[\w\-]+/[\w\-]+)')
+
+# assets/ 目录中的静态资源源文件（js/card.js 由卡片模板生成）
+ASSET_SOURCES = ['css/style.css', 'js/main.js']
+
+# 筛选按钮上使用的标签简称
+TAG_SHORT_NAMES = {'Natural Language Processing': 'NLP'}
+
+# 流式写出 HTML 时的写缓冲区大小（字节）
+STREAM_BUFFER_SIZE = 1 << 16
+
+# 页面模板中论文卡片的插入位置
+PAPERS_SLOT = '<!-- papers -->'
+
+# 小于该大小（字节）的数据文件不生成预压缩文件，压缩收益可以忽略
+PRECOMPRESS_MIN_SIZE = 1024
+
+# Brotli 为可选依赖，未安装时只生成 .gz
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def content_hash(content) -> str:
+    """字符串或字节内容的 SHA-256"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def slugify(name: str) -> str:
+    """标签名转换为文件名，例如 Computer Vision -> computer-vision"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'untagged'
+
+
+def web_link(url: Optional[str]) -> Optional[str]:
+    """只保留 http(s) 链接（摘要中提取的 "链接" 可能只是普通单词）"""
+    return url if url and url.startswith(('http://', 'https://')) else None
+
+
+def derived_source_hash(paper: Dict) -> str:
+    """派生字段所依赖内容（摘要、会议）及计算规则版本的哈希"""
+    source = f"{DERIVED_VERSION}\0{paper.get('abstract') or ''}\0{paper.get('conference') or ''}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+
+def file_hash(path: Path) -> str:
+    """分块读取文件计算 SHA-256，不把大文件整个读入内存"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_BUFFER_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
 
 class HTMLGenerator:
     """HTML 生成器"""
     
     def __init__(self, data_path: str = "data/papers.json", 
-                 output_dir: str = "docs"):
+                 output_dir: str = "docs", incremental: bool = True,
+                 config_path: str = "config.yaml", assets_dir: Optional[str] = None,
+                 metrics: Optional[Metrics] = None):
         self.data_path = Path(data_path)
         self.output_dir = Path(output_dir)
+        # 静态资源源文件默认使用仓库中的 assets/ 目录
+        self.assets_dir = Path(assets_dir) if assets_dir else Path(__file__).resolve().parent.parent / "assets"
+        self.asset_urls = {}  # 原文件名 -> 带哈希的路径，由 build_assets 填充
+        self.metrics = metrics or Metrics('generate')  # 各阶段耗时和写入量（见 scripts/metrics.py）
         self.papers = []
         self.papers_by_month = {}  # 按月份分组的论文
-        
+        self.store = None
+        self.stats = None  # 论文统计，首次使用时由 get_stats 计算
+        
+        # 派生字段缓存 {论文ID: {'hash', 'code', 'project'}}，只为新增或变化的论文重新计算
+        self.derived_cache_path = self.data_path.parent / "derived_cache.json"
+        self.derived_cache = self.load_derived_cache() if incremental else {}
+        self.derived_cache_dirty = False
+        
+        # 数据文件输出选项（config.yaml 的 output 部分）
+        self.config = self.load_config(config_path)
+        output_config = self.config.get('output', {}) or {}
+        self.compact_json = output_config.get('compact_json', True)
+        self.trim_fields = output_config.get('trim_fields', False)
+        self.precompress = self.get_precompress_formats(output_config.get('precompress', ['gzip', 'brotli']))
+        self.abstract_chunk_size = max(1, output_config.get('abstract_chunk_size', 100))
+        self.search_index = output_config.get('search_index', True)
+        self.search_prefix_length = max(1, output_config.get('search_prefix_length', 2))
+        self.index_max_papers = max(0, output_config.get('index_max_papers', 50))
+        self.papers_per_page = max(1, output_config.get('papers_per_page', 50))
+        self.minify_assets = output_config.get('minify_assets', True)
+        
+        # 增量构建：记录每个输出文件的输入哈希和内容哈希，输入未变且文件未被改动时跳过
+        # 构建清单与论文数据一起存放在 data/ 下（随数据提交），不放在部署目录中
+        self.incremental = incremental
+        self.build_manifest_path = self.data_path.parent / "build_manifest.json"
+        self.build_manifest = self.load_build_manifest() if incremental else {}
+        self.written_count = 0
+        self.skipped_count = 0
+    
+    def load_config(self, config_path: str) -> Dict:
+        """加载配置文件（不存在时使用默认配置）"""
+        if not Path(config_path).exists():
+            return {}
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    
+    def get_precompress_formats(self, formats: Optional[List[str]]) -> List[str]:
+        """返回可用的预压缩格式"""
+        formats = list(formats or [])
+        if 'brotli' in formats and brotli is None:
+            logger.warning("未安装 brotli，跳过生成 .br 文件（pip install brotli）")
+            formats.remove('brotli')
+        return [fmt for fmt in formats if fmt in ('gzip', 'brotli')]
+    
+    def load_derived_cache(self) -> Dict:
+        """加载派生字段缓存"""
+        if not self.derived_cache_path.exists():
+            return {}
+        with open(self.derived_cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_derived_cache(self):
+        """保存派生字段缓存（有新计算的论文时）"""
+        if not self.derived_cache_dirty:
+            return
+        self.derived_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.derived_cache_path, 'w', encoding='utf-8') as f:
+            json.dump(self.derived_cache, f, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        self.derived_cache_dirty = False
+    
+    def get_derived_fields(self, paper: Dict) -> Dict:
+        """论文卡片的派生字段：代码链接、项目链接和会议徽章样式
+        
+        以摘要和会议的哈希为键缓存，内容未变化的论文不再重复提取。
+        """
+        source_hash = derived_source_hash(paper)
+        cached = self.derived_cache.get(paper['id'])
+        if cached and cached['hash'] == source_hash:
+            return cached
+        
+        # 只保存非空字段，缓存文件随论文数增长，需要保持紧凑
+        derived = {'hash': source_hash}
+        derived.update(self.extract_code_links(paper.get('abstract', '')))
+        if paper.get('conference'):
+            derived['venue_class'] = venue_badge_class(paper['conference'])
+        self.derived_cache[paper['id']] = derived
+        self.derived_cache_dirty = True
+        return derived
+    
+    def load_build_manifest(self) -> Dict:
+        """加载构建清单 {相对路径: {'input': 输入哈希, 'output': 内容哈希}}"""
+        if not self.build_manifest_path.exists():
+            return {}
+        with open(self.build_manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_build_manifest(self):
+        """保存构建清单"""
+        self.build_manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.build_manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.build_manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        
+        # 旧版本把清单写在部署目录中，迁移后删除，避免随网站发布
+        legacy_path = self.output_dir / "data" / "build_manifest.json"
+        if legacy_path.exists():
+            legacy_path.unlink()
+    
+    def record_output(self, path: Path, input_hash: str, output_hash: str):
+        """在构建清单中记录输出文件的输入哈希、内容哈希以及写出后的大小和修改时间"""
+        stat = path.stat()
+        self.build_manifest[path.relative_to(self.output_dir).as_posix()] = {
+            'input': input_hash, 'output': output_hash, 'size': stat.st_size, 'mtime': stat.st_mtime_ns
+        }
+    
+    def can_skip(self, path: Path, input_hash: Optional[str]) -> bool:
+        """输入哈希与上次构建相同，且磁盘上的文件仍是上次写出的内容时可以跳过
+        
+        文件大小和修改时间与清单一致时直接认为未被改动，不再读取文件计算哈希；
+        不一致（如文件从别处恢复）时才比较内容哈希。
+        """
+        entry = self.build_manifest.get(path.relative_to(self.output_dir).as_posix())
+        if not (self.incremental and input_hash and entry and entry['input'] == input_hash):
+            return False
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False
+        if entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime_ns:
+            return True
+        if entry.get('size', stat.st_size) != stat.st_size or file_hash(path) != entry['output']:
+            return False
+        entry.update(size=stat.st_size, mtime=stat.st_mtime_ns)
+        return True
+    
+    def write_output(self, path: Path, render: Callable[[], Union[str, bytes]], input_hash: Optional[str] = None) -> bool:
+        """增量写出文件，返回是否实际写入
+        
+        input_hash 与上次构建相同且磁盘上的文件未被改动时，跳过生成；
+        生成后的内容与磁盘上的文件一致时，也不重写文件。
+        """
+        if self.can_skip(path, input_hash):
+            self.skipped_count += 1
+            return False
+        
+        data = render()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        output_hash = content_hash(data)
+        
+        if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+            self.record_output(path, input_hash or output_hash, output_hash)
+            self.skipped_count += 1
+            return False
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.record_output(path, input_hash or output_hash, output_hash)
+        self.written_count += 1
+        self.metrics.count('bytes_written', len(data))
+        return True
+    
+    def write_stream(self, path: Path, chunks: Iterable[str], input_hash: Optional[str] = None) -> bool:
+        """流式增量写出文件：逐块编码写入临时文件，不在内存中拼接完整内容，返回是否实际写入
+        
+        跳过规则与 write_output 相同；生成的内容与原文件一致时丢弃临时文件。
+        """
+        if self.can_skip(path, input_hash):
+            self.skipped_count += 1
+            return False
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        hasher = hashlib.sha256()
+        size = 0
+        with open(tmp_path, 'wb', buffering=STREAM_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                f.write(data)
+                hasher.update(data)
+                size += len(data)
+        output_hash = hasher.hexdigest()
+        
+        if path.exists() and path.stat().st_size == size and file_hash(path) == output_hash:
+            tmp_path.unlink()
+            self.record_output(path, input_hash or output_hash, output_hash)
+            self.skipped_count += 1
+            return False
+        
+        tmp_path.replace(path)
+        self.record_output(path, input_hash or output_hash, output_hash)
+        self.written_count += 1
+        self.metrics.count('bytes_written', size)
+        return True
+    
+    def month_input_hash(self, year_month: str, papers: List[Dict]) -> str:
+        """月度数据文件的输入哈希：分片存储直接使用分片哈希，否则对论文内容求哈希"""
+        source_hash = self.store.month_hash(year_month) if self.store and self.store.backend == 'sharded' else None
+        if source_hash is None:
+            source_hash = content_hash(json.dumps(papers, ensure_ascii=False, sort_keys=True))
+        return content_hash(f"{BUILD_VERSION}:{self.compact_json}:{self.trim_fields}:{year_month}:{source_hash}")
+    
+    def dump_json(self, data) -> str:
+        """序列化数据文件：compact_json 开启时不缩进、不留空格"""
+        if self.compact_json:
+            return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    
+    def write_data_file(self, path: Path, render: Callable[[], str], input_hash: Optional[str] = None) -> bool:
+        """写出 JSON 数据文件，并在旁边生成预压缩的 .gz / .br 文件"""
+        written = self.write_output(path, render, input_hash)
+        
+        # 压缩文件以原文件内容哈希为输入，原文件不变时直接跳过
+        source_hash = self.build_manifest[path.relative_to(self.output_dir).as_posix()]['output']
+        too_small = path.stat().st_size < PRECOMPRESS_MIN_SIZE
+        for fmt in self.precompress:
+            compressed_path = path.with_name(path.name + ('.gz' if fmt == 'gzip' else '.br'))
+            if too_small:
+                # 删除文件变小之前生成的压缩文件，避免服务器返回过期内容
+                if compressed_path.exists():
+                    compressed_path.unlink()
+                    self.build_manifest.pop(compressed_path.relative_to(self.output_dir).as_posix(), None)
+                continue
+            if fmt == 'gzip':
+                self.write_output(compressed_path,
+                                  lambda: gzip.compress(path.read_bytes(), compresslevel=9, mtime=0),
+                                  input_hash=source_hash)
+            elif fmt == 'brotli':
+                self.write_output(compressed_path,
+                                  lambda: brotli.compress(path.read_bytes(), quality=11),
+                                  input_hash=source_hash)
+        return written
+    
     def load_papers(self):
         """加载论文数据"""
-        if not self.data_path.exists():
+        # 自动检测存储后端：存在按月分片则按月加载，否则读取 papers.json
+        store = self.store = open_store(self.data_path)
+        if store.backend == 'json' and not self.data_path.exists():
             logger.warning(f"数据文件不存在: {self.data_path}")
             return
         
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            self.papers = json.load(f)
+        # 按月份分组（年月取自 published 字段，如 2025-10-31 -> 2025-10）
+        for year_month, papers in store.iter_months():
+            self.papers.extend(papers)
+            if year_month:
+                self.papers_by_month[year_month] = papers
         
         logger.info(f"加载了 {len(self.papers)} 篇论文")
         
-        # 按月份分组
-        for paper in self.papers:
-            # 从 published 字段提取年月 (格式: 2025-10-31)
-            published = paper.get('published', '')
-            if published:
-                year_month = published[:7]  # 提取 "2025-10"
-                if year_month not in self.papers_by_month:
-                    self.papers_by_month[year_month] = []
-                self.papers_by_month[year_month].append(paper)
-        
         logger.info(f"论文分布: {', '.join([f'{k}: {len(v)}篇' for k, v in sorted(self.papers_by_month.items(), reverse=True)])}")
     
     def generate_monthly_data_files(self):
@@ -52,28 +363,128 @@ class HTMLGenerator:
         data_dir = self.output_dir / "data"
         data_dir.mkdir(parents=True, exist_ok=True)
         
-        # 为每个月份生成独立的 JSON 文件
+        # 为每个月份生成独立的 JSON 文件（论文没有变化的月份跳过）
         for year_month, papers in self.papers_by_month.items():
             file_path = data_dir / f"{year_month}.json"
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(papers, f, ensure_ascii=False, indent=2)
-            logger.info(f"生成月度数据文件: {file_path} ({len(papers)} 篇)")
+            input_hash = self.month_input_hash(year_month, papers)
+            if self.trim_fields:
+                # 列表页只需要部分字段，去掉 comment、journal_ref 等以减小文件
+                month_data = [{k: p[k] for k in LIST_VIEW_FIELDS if k in p} for p in papers]
+            else:
+                month_data = papers
+            written = self.write_data_file(
+                file_path,
+                lambda: self.dump_json(month_data),
+                input_hash=input_hash
+            )
+            if written:
+                logger.info(f"生成月度数据文件: {file_path} ({len(papers)} 篇)")
+            
+            self.generate_month_list_files(year_month, papers, input_hash)
         
         # 生成索引文件，包含所有月份的元数据
         months_index = []
-        for year_month in sorted(self.papers_by_month.keys(), reverse=True):
-            papers = self.papers_by_month[year_month]
+        for year_month, month_stats in self.get_stats()['months'].items():
             months_index.append({
                 'month': year_month,
-                'count': len(papers),
-                'published_count': sum(1 for p in papers if p.get('conference')),
-                'preprint_count': sum(1 for p in papers if not p.get('conference'))
+                'count': month_stats['count'],
+                'published_count': month_stats['published_count'],
+                'preprint_count': month_stats['preprint_count']
             })
         
-        with open(data_dir / "index.json", 'w', encoding='utf-8') as f:
-            json.dump(months_index, f, ensure_ascii=False, indent=2)
+        if self.write_data_file(data_dir / "index.json", lambda: self.dump_json(months_index)):
+            logger.info(f"生成月份索引文件: {data_dir / 'index.json'}")
+    
+    def get_stats(self) -> Dict:
+        """论文统计：单次遍历得到总数、各月份、已发表/预印本和各标签的数量"""
+        if self.stats is None:
+            self.stats = compute_paper_stats(self.papers, list(self.config.get('categories') or {}))
+        return self.stats
+    
+    def generate_stats_file(self):
+        """生成统计文件 data/stats.json，供前端和其他脚本复用"""
+        if self.write_data_file(self.output_dir / "data" / "stats.json", lambda: self.dump_json(self.get_stats())):
+            logger.info(f"生成统计文件: {self.output_dir / 'data' / 'stats.json'}")
+    
+    def generate_month_list_files(self, year_month: str, papers: List[Dict], input_hash: str):
+        """生成月度列表文件和摘要分块文件
+        
+        {month}.list.json 只包含渲染卡片所需的字段，每篇论文带 chunk 编号；
+        摘要按 abstract_chunk_size 分块写入 abstracts/{month}/{chunk}.json（{id: 摘要}），
+        前端在卡片展开或搜索时才加载对应的块。
+        """
+        data_dir = self.output_dir / "data"
+        chunk_size = self.abstract_chunk_size
+        chunk_count = (len(papers) + chunk_size - 1) // chunk_size
+        
+        def render_list():
+            list_data = []
+            for index, paper in enumerate(papers):
+                item = {k: paper[k] for k in LIST_FILE_FIELDS if k in paper}
+                # 只把网址形式的代码/项目链接交给前端
+                derived = self.get_derived_fields(paper)
+                for field, key in (('code_link', 'code'), ('project_link', 'project')):
+                    link = web_link(derived.get(key))
+                    if link and field not in item:
+                        item[field] = link
+                item['chunk'] = index // chunk_size
+                list_data.append(item)
+            return self.dump_json(list_data)
+        
+        list_hash = content_hash(f"{input_hash}:list:{chunk_size}:{DERIVED_VERSION}")
+        self.write_data_file(data_dir / f"{year_month}.list.json", render_list, input_hash=list_hash)
+        
+        chunk_dir = data_dir / "abstracts" / year_month
+        for chunk in range(chunk_count):
+            chunk_papers = papers[chunk * chunk_size:(chunk + 1) * chunk_size]
+            self.write_data_file(
+                chunk_dir / f"{chunk}.json",
+                lambda: self.dump_json({p['id']: p.get('abstract', '') for p in chunk_papers}),
+                input_hash=content_hash(f"{list_hash}:{chunk}")
+            )
+        
+        # 删除分块数变少后遗留的旧分块
+        if chunk_dir.exists():
+            for path in chunk_dir.iterdir():
+                stem = path.name.split('.')[0]
+                if stem.isdigit() and int(stem) >= chunk_count:
+                    path.unlink()
+                    self.build_manifest.pop(path.relative_to(self.output_dir).as_posix(), None)
+    
+    def generate_search_index(self):
+        """生成按词项前缀分片的全站搜索索引（docs/data/search/）"""
+        if not self.search_index:
+            return
+        
+        search_dir = self.output_dir / "data" / "search"
+        # 文档编号按发布时间从旧到新分配：新论文只追加在末尾，已有论文的编号和倒排表不变，
+        # 日常构建只会重写新词项所在的分片；显示顺序由前端排序决定，与编号无关
+        papers = sorted((paper for month in self.papers_by_month.values() for paper in month),
+                        key=lambda p: (p.get('published', ''), p.get('id', '')))
+        doc_ids, shards = build_search_index(papers, prefix_length=self.search_prefix_length)
+        
+        # 分片内容不变时不会重写（write_output 比较内容）
+        for prefix, shard in shards.items():
+            self.write_data_file(search_dir / "shards" / f"{prefix}.json", lambda: self.dump_json(shard))
+        self.write_data_file(search_dir / "docs.json", lambda: self.dump_json(doc_ids))
+        meta = {
+            'version': INDEX_VERSION,
+            'prefix_length': self.search_prefix_length,
+            'doc_count': len(doc_ids),
+            'shards': sorted(shards),
+            'stopwords': sorted(STOPWORDS)  # 前端分词使用同一份停用词
+        }
+        self.write_data_file(search_dir / "meta.json", lambda: self.dump_json(meta))
         
-        logger.info(f"生成月份索引文件: {data_dir / 'index.json'}")
+        # 删除已经不存在的前缀分片（归档为空时没有任何分片，目录也不存在）
+        shard_dir = search_dir / "shards"
+        if shard_dir.exists():
+            for path in shard_dir.iterdir():
+                if path.name.split('.')[0] not in shards:
+                    path.unlink()
+                    self.build_manifest.pop(path.relative_to(self.output_dir).as_posix(), None)
+        
+        logger.info(f"生成搜索索引: {len(doc_ids)} 篇论文，{sum(len(s) for s in shards.values())} 个词项，{len(shards)} 个分片")
     
     def generate_month_buttons(self):
         """生成月份筛选按钮"""
@@ -83,16 +494,20 @@ class HTMLGenerator:
             buttons.append(f'<button class="filter-btn month-btn" data-month="{year_month}">{year_month} ({count})</button>')
         return '\n                    '.join(buttons)
     
+    def generate_category_buttons(self):
+        """生成研究领域筛选按钮（config.yaml 中的每个类别）"""
+        buttons = []
+        for tag, count in self.get_stats()['total']['tags'].items():
+            buttons.append(f'<button class="filter-btn category-btn" data-category="{tag}">{TAG_SHORT_NAMES.get(tag, tag)} ({count})</button>')
+        return '\n                    '.join(buttons)
+    
     def generate_index_html(self):
         """生成主页 HTML"""
-        # 计算各分类数量
-        published_count = sum(1 for p in self.papers if p.get('conference'))
-        preprint_count = sum(1 for p in self.papers if not p.get('conference'))
-        cv_count = sum(1 for p in self.papers if 'Computer Vision' in p.get('tags', []))
-        nlp_count = sum(1 for p in self.papers if 'Natural Language Processing' in p.get('tags', []))
-        ml_count = sum(1 for p in self.papers if 'Machine Learning' in p.get('tags', []))
-        robotics_count = sum(1 for p in self.papers if 'Robotics' in p.get('tags', []))
-        multimodal_count = sum(1 for p in self.papers if 'Multimodal' in p.get('tags', []))
+        # 各分类数量来自统计结果
+        total_stats = self.get_stats()['total']
+        published_count = total_stats['published_count']
+        preprint_count = total_stats['preprint_count']
+        update_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         html = f"""<!DOCTYPE html>
 <html lang="zh-CN">
@@ -100,14 +515,14 @@ class HTMLGenerator:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>DailyPaper - AI/ML/CV/NLP 最新论文</title>
-    <link rel="stylesheet" href="css/style.css">
+    <link rel="stylesheet" href="{self.asset_url('css/style.css')}">
 </head>
 <body>
     <header>
         <div class="container">
             <h1>📚 DailyPaper</h1>
             <p class="subtitle">每日自动更新 AI/ML/CV/NLP 领域最新论文</p>
-            <p class="update-time">最后更新: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC</p>
+            <p class="update-time">最后更新: {update_time} UTC</p>
         </div>
     </header>
     
@@ -132,11 +547,7 @@ class HTMLGenerator:
                 <label class="filter-label">🏷️ 研究领域：</label>
                 <div class="filters category-filters">
                     <button class="filter-btn category-btn active" data-category="all">全部 ({len(self.papers)})</button>
-                    <button class="filter-btn category-btn" data-category="Computer Vision">Computer Vision ({cv_count})</button>
-                    <button class="filter-btn category-btn" data-category="Natural Language Processing">NLP ({nlp_count})</button>
-                    <button class="filter-btn category-btn" data-category="Machine Learning">Machine Learning ({ml_count})</button>
-                    <button class="filter-btn category-btn" data-category="Robotics">Robotics ({robotics_count})</button>
-                    <button class="filter-btn category-btn" data-category="Multimodal">Multimodal ({multimodal_count})</button>
+                    {self.generate_category_buttons()}
                 </div>
             </div>
             <div class="filter-group">
@@ -162,8 +573,10 @@ class HTMLGenerator:
     
     <main class="container">
         <div id="papers-container">
-            <!-- Papers will be loaded by JavaScript -->
+            <!-- 最新的论文在构建时渲染，JavaScript 加载数据后替换为完整列表 -->
+            {PAPERS_SLOT}
         </div>
+        {self.render_archive_nav('')}
     </main>
     
     <footer>
@@ -172,18 +585,153 @@ class HTMLGenerator:
         </div>
     </footer>
     
-    <script src="js/main.js"></script>
+    <script src="{self.asset_url('js/card.js')}"></script>
+    <script src="{self.asset_url('js/main.js')}"></script>
 </body>
 </html>
 """
         
         output_file = self.output_dir / "index.html"
-        output_file.parent.mkdir(parents=True, exist_ok=True)
+        head, tail = html.split(PAPERS_SLOT)
+        
+        # 输入哈希不含更新时间：页面框架和论文数据都没有变化时保留原文件（及其更新时间）
+        month_hashes = ','.join(self.month_input_hash(month, self.papers_by_month[month])
+                                for month in sorted(self.papers_by_month, reverse=True))
+        input_hash = content_hash(f"{BUILD_VERSION}:{html.replace(update_time, '')}:{self.index_max_papers}:{month_hashes}")
+        
+        # 首屏论文卡片逐个流式写入，不拼接整页 HTML；超过 index_max_papers 的论文由 JavaScript 加载
+        papers = itertools.islice(self.iter_latest_papers(), self.index_max_papers)
+        chunks = itertools.chain([head], self.iter_papers_html(papers), [tail])
+        if self.write_stream(output_file, chunks, input_hash=input_hash):
+            logger.info(f"生成主页: {output_file}")
+    
+    def iter_latest_papers(self) -> Iterator[Dict]:
+        """按月份从新到旧依次产出论文"""
+        for year_month in sorted(self.papers_by_month, reverse=True):
+            yield from self.papers_by_month[year_month]
+    
+    def get_tags(self) -> List[str]:
+        """论文中出现过的标签，按 config.yaml 中 categories 的顺序，其余按出现顺序"""
+        return [tag for tag, count in self.get_stats()['total']['tags'].items() if count]
+    
+    def render_archive_nav(self, root: str) -> str:
+        """静态分页归档的导航链接（不含论文数量，新增论文时旧页面无需重建）"""
+        month_links = ''.join(f'<a class="filter-btn" href="{root}pages/month/{month}/1.html">{month}</a>'
+                              for month in sorted(self.papers_by_month, reverse=True))
+        tag_links = ''.join(f'<a class="filter-btn" href="{root}pages/tag/{slugify(tag)}/1.html">{tag}</a>'
+                            for tag in self.get_tags())
+        return f"""<nav class="archive-nav">
+            <div class="filter-group">
+                <label class="filter-label">📅 按月份浏览：</label>
+                <div class="filters">{month_links}</div>
+            </div>
+            <div class="filter-group">
+                <label class="filter-label">🏷️ 按领域浏览：</label>
+                <div class="filters">{tag_links}</div>
+            </div>
+        </nav>"""
+    
+    def render_pagination(self, page: int, page_count: int) -> str:
+        """分页链接：上一页/下一页、首末页和当前页附近的页码"""
+        if page_count <= 1:
+            return ''
+        
+        links = []
+        if page > 1:
+            links.append(f'<a class="filter-btn" href="{page - 1}.html">← 上一页</a>')
+        
+        shown = sorted({1, page_count} | set(range(max(1, page - 3), min(page_count, page + 3) + 1)))
+        previous = 0
+        for number in shown:
+            if number - previous > 1:
+                links.append('<span class="pagination-gap">…</span>')
+            css_class = 'filter-btn active' if number == page else 'filter-btn'
+            links.append(f'<a class="{css_class}" href="{number}.html">{number}</a>')
+            previous = number
+        
+        if page < page_count:
+            links.append(f'<a class="filter-btn" href="{page + 1}.html">下一页 →</a>')
+        return f'<nav class="pagination">{"".join(links)}</nav>'
+    
+    def render_page_shell(self, title: str, heading: str, root: str, pagination: str) -> str:
+        """静态分页页面的框架，论文卡片在 PAPERS_SLOT 处流式写入"""
+        return f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - DailyPaper</title>
+    <link rel="stylesheet" href="{self.asset_url('css/style.css', root)}">
+</head>
+<body>
+    <header>
+        <div class="container">
+            <h1><a href="{root}index.html" style="color: inherit; text-decoration: none;">📚 DailyPaper</a></h1>
+            <p class="subtitle">{heading}</p>
+        </div>
+    </header>
+    
+    <main class="container">
+        {self.render_archive_nav(root)}
+        {pagination}
+        <div id="papers-container">
+            {PAPERS_SLOT}
+        </div>
+        {pagination}
+    </main>
+    
+    <footer>
+        <div class="container">
+            <p>© 2025 DailyPaper | 数据来源: ArXiv | <a href="https://github.com/yourusername/DailyPaper" target="_blank">GitHub</a></p>
+        </div>
+    </footer>
+</body>
+</html>
+"""
+    
+    def generate_paginated_pages(self, page_dir: Path, title: str, papers: List[Dict], source_hash: str):
+        """把一组论文按 papers_per_page 分页，逐页流式写出 {page_dir}/{页码}.html"""
+        root = '../' * len(page_dir.relative_to(self.output_dir).parts)
+        page_count = max(1, (len(papers) + self.papers_per_page - 1) // self.papers_per_page)
+        # 导航只依赖月份和标签列表，与源数据哈希一起决定页面是否需要重建
+        nav_hash = content_hash(self.render_archive_nav(root))
+        
+        for page in range(1, page_count + 1):
+            page_papers = papers[(page - 1) * self.papers_per_page:page * self.papers_per_page]
+            shell = self.render_page_shell(
+                f"{title} · 第 {page} 页",
+                f"{title} · 共 {len(papers)} 篇 · 第 {page}/{page_count} 页",
+                root,
+                self.render_pagination(page, page_count)
+            )
+            head, tail = shell.split(PAPERS_SLOT)
+            input_hash = content_hash(f"{BUILD_VERSION}:{source_hash}:{nav_hash}:{self.asset_urls['css/style.css']}:"
+                                      f"{self.papers_per_page}:{page}")
+            chunks = itertools.chain([head], self.iter_papers_html(page_papers), [tail])
+            self.write_stream(page_dir / f"{page}.html", chunks, input_hash=input_hash)
+        
+        # 删除页数减少后遗留的旧页面
+        for path in page_dir.glob('*.html'):
+            if path.stem.isdigit() and int(path.stem) > page_count:
+                path.unlink()
+                self.build_manifest.pop(path.relative_to(self.output_dir).as_posix(), None)
+    
+    def generate_archive_pages(self):
+        """生成按月份和按标签分页的静态页面（docs/pages/），无需 JavaScript 即可浏览"""
+        pages_dir = self.output_dir / "pages"
+        month_hashes = {month: self.month_input_hash(month, papers) for month, papers in self.papers_by_month.items()}
+        
+        for year_month, papers in self.papers_by_month.items():
+            self.generate_paginated_pages(pages_dir / "month" / year_month, year_month, papers, month_hashes[year_month])
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
+        # 标签页面跨越所有月份，任一月份变化都需要检查
+        all_hash = content_hash(','.join(month_hashes[month] for month in sorted(month_hashes)))
+        tags = self.get_tags()
+        for tag in tags:
+            papers = [paper for paper in self.iter_latest_papers() if tag in paper.get('tags', [])]
+            self.generate_paginated_pages(pages_dir / "tag" / slugify(tag), tag, papers, content_hash(f"{all_hash}:{tag}"))
         
-        logger.info(f"生成主页: {output_file}")
+        logger.info(f"生成静态分页: {len(self.papers_by_month)} 个月份，{len(tags)} 个领域，每页 {self.papers_per_page} 篇")
     
     def get_category_name(self, category: str) -> str:
         """将 ArXiv 类别代码转换为友好的名称"""
@@ -204,24 +752,20 @@ class HTMLGenerator:
     
     def extract_code_links(self, abstract: str) -> Dict[str, str]:
         """从摘要中提取代码和项目链接"""
-        import re
         links = {}
         
         # 提取 Code: 链接
-        code_pattern = r'[Cc]ode[:\s]+(?:available at\s+)?(\S+)'
-        code_match = re.search(code_pattern, abstract)
+        code_match = _CODE_LINK_PATTERN.search(abstract)
         if code_match:
             links['code'] = code_match.group(1).rstrip('.,;')
         
         # 提取 Project: 链接
-        project_pattern = r'[Pp]roject[:\s]+(?:page\s+)?(\S+)'
-        project_match = re.search(project_pattern, abstract)
+        project_match = _PROJECT_LINK_PATTERN.search(abstract)
         if project_match:
             links['project'] = project_match.group(1).rstrip('.,;')
         
         # 提取 GitHub 链接
-        github_pattern = r'(https?://(?:www\.)?github\.com/[\w\-]+/[\w\-]+)'
-        github_match = re.search(github_pattern, abstract)
+        github_match = _GITHUB_LINK_PATTERN.search(abstract)
         if github_match and 'code' not in links:
             links['code'] = github_match.group(1)
         
@@ -231,1101 +775,105 @@ class HTMLGenerator:
         """获取会议徽章的样式类和显示文本"""
         if not conference:
             return ('preprint', 'Preprint')
-        
-        # 顶级会议配色
-        venue_styles = {
-            'NeurIPS': ('venue-neurips', 'NeurIPS'),
-            'CVPR': ('venue-cvpr', 'CVPR'),
-            'ICCV': ('venue-iccv', 'ICCV'),
-            'ECCV': ('venue-eccv', 'ECCV'),
-            'ICML': ('venue-icml', 'ICML'),
-            'ICLR': ('venue-iclr', 'ICLR'),
-            'ACL': ('venue-acl', 'ACL'),
-            'EMNLP': ('venue-emnlp', 'EMNLP'),
-            'AAAI': ('venue-aaai', 'AAAI'),
-            'IJCAI': ('venue-ijcai', 'IJCAI'),
-        }
-        
-        # 检查会议名称
-        for venue_name, (style, display) in venue_styles.items():
-            if venue_name in conference:
-                return (style, conference)
-        
-        return ('venue-other', conference)
+        return (venue_badge_class(conference), conference)
     
     def generate_papers_html(self) -> str:
         """生成论文列表 HTML"""
-        if not self.papers:
-            return '<p class="no-results">暂无论文数据</p>'
-        
-        html_parts = []
-        for paper in self.papers:
-            tags_html = ''.join([f'<span class="tag">{tag}</span>' for tag in paper.get('tags', [])])
-            authors_html = ', '.join(paper['authors'][:5])
-            if len(paper['authors']) > 5:
-                authors_html += ' et al.'
-            
-            # 获取友好的类别名称
-            primary_category = paper.get('primary_category', paper['venue'])
-            category_name = self.get_category_name(primary_category)
-            
-            # 获取会议信息和徽章样式
-            conference = paper.get('conference')
-            venue_class, venue_display = self.get_venue_badge(conference)
-            
-            # 确定发表状态
-            is_published = 'published' if conference else 'preprint'
-            
-            # 提取代码链接
-            code_links = self.extract_code_links(paper['abstract'])
-            code_links_html = ''
-            if code_links.get('code'):
-                code_links_html += f'<a href="{code_links["code"]}" target="_blank" class="btn-link btn-code">💻 Code</a>'
-            if code_links.get('project'):
-                code_links_html += f'<a href="{code_links["project"]}" target="_blank" class="btn-link btn-project">🌐 Project</a>'
-            
-            paper_html = f"""
-            <article class="paper-card" data-tags="{','.join(paper.get('tags', []))}" data-status="{is_published}" data-date="{paper['published']}">
-                <div class="venue-badge {venue_class}">{venue_display}</div>
-                <h2 class="paper-title">
-                    <a href="{paper['arxiv_url']}" target="_blank">{paper['title']}</a>
-                </h2>
-                <div class="paper-meta">
-                    <span class="meta-item">📅 {paper['published']}</span>
-                    <span class="meta-item">📖 ArXiv {category_name}</span>
-                </div>
-                <div class="paper-authors">
-                    👥 {authors_html}
-                </div>
-                <div class="paper-tags">
-                    {tags_html}
-                </div>
-                <div class="paper-abstract">
-                    <details>
-                        <summary>查看摘要</summary>
-                        <p>{paper['abstract']}</p>
-                    </details>
-                </div>
-                <div class="paper-links">
-                    <a href="{paper['pdf_url']}" target="_blank" class="btn-link">📄 PDF</a>
-                    <a href="{paper['arxiv_url']}" target="_blank" class="btn-link">🔗 ArXiv</a>
-                    {code_links_html}
-                </div>
-            </article>
-            """
-            html_parts.append(paper_html)
-        
-        return '\n'.join(html_parts)
-    
-    def generate_css(self):
-        """生成 CSS 样式"""
-        css = """/* 全局样式 */
-* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-body {
-    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-    line-height: 1.6;
-    color: #333;
-    background-color: #f5f5f5;
-}
-
-.container {
-    max-width: 1200px;
-    margin: 0 auto;
-    padding: 0 20px;
-}
-
-/* 头部样式 */
-header {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    color: white;
-    padding: 2rem 0;
-    text-align: center;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-}
-
-header h1 {
-    font-size: 2.5rem;
-    margin-bottom: 0.5rem;
-}
-
-.subtitle {
-    font-size: 1.1rem;
-    opacity: 0.9;
-}
-
-.update-time {
-    font-size: 0.9rem;
-    opacity: 0.8;
-    margin-top: 0.5rem;
-}
-
-/* 导航和筛选 */
-nav {
-    background: white;
-    padding: 1.5rem 20px;
-    margin: 2rem auto;
-    border-radius: 10px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-}
-
-.filter-section {
-    margin-bottom: 1rem;
-}
-
-.filter-group {
-    margin-bottom: 1rem;
-}
-
-.filter-label {
-    display: inline-block;
-    font-weight: 600;
-    color: #333;
-    margin-bottom: 0.5rem;
-    font-size: 0.95rem;
-}
-
-.filters {
-    display: flex;
-    flex-wrap: wrap;
-    gap: 0.5rem;
-}
-
-.filter-btn {
-    padding: 0.5rem 1rem;
-    border: 2px solid #667eea;
-    background: white;
-    color: #667eea;
-    border-radius: 20px;
-    cursor: pointer;
-    transition: all 0.3s;
-    font-size: 0.9rem;
-}
-
-.filter-btn:hover {
-    background: #f0f0f0;
-}
-
-.filter-btn.active {
-    background: #667eea;
-    color: white;
-}
-
-.search-box {
-    margin-top: 1.5rem;
-}
-
-.search-box input {
-    width: 100%;
-    padding: 0.8rem;
-    border: 2px solid #ddd;
-    border-radius: 8px;
-    font-size: 1rem;
-    transition: border-color 0.3s;
-}
-
-.search-box input:focus {
-    outline: none;
-    border-color: #667eea;
-}
-
-/* 主内容区域 */
-main {
-    margin-top: 0;
-}
-
-#papers-container {
-    margin-top: 1rem;
-}
-
-/* 结果信息栏 */
-.results-info {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    margin-top: 1rem;
-    padding: 0.8rem;
-    background: #f8f9fa;
-    border-radius: 8px;
-}
-
-#resultsCount {
-    font-size: 0.9rem;
-    color: #666;
-    font-weight: 500;
-}
-
-.export-btn {
-    padding: 0.5rem 1rem;
-    background: #667eea;
-    color: white;
-    border: none;
-    border-radius: 6px;
-    cursor: pointer;
-    font-size: 0.9rem;
-    transition: background 0.3s;
-}
-
-.export-btn:hover {
-    background: #5568d3;
-}
-
-/* 论文卡片 */
-.paper-card {
-    position: relative;
-    background: white;
-    padding: 1.5rem;
-    padding-top: 2.5rem;
-    padding-left: 4rem;
-    margin-bottom: 1rem;
-    border-radius: 10px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-    transition: transform 0.3s, box-shadow 0.3s;
-    display: flex;
-    align-items: flex-start;
-}
-
-.paper-card:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-}
-
-/* 复选框样式 */
-.paper-select {
-    position: absolute;
-    left: 1.2rem;
-    top: 1.5rem;
-}
-
-.paper-checkbox {
-    width: 20px;
-    height: 20px;
-    cursor: pointer;
-    accent-color: #667eea;
-}
-
-.paper-content {
-    flex: 1;
-}
-
-/* 导出控制按钮 */
-.export-controls {
-    display: flex;
-    gap: 0.5rem;
-    align-items: center;
-}
-
-.select-btn {
-    padding: 0.5rem 1rem;
-    background: white;
-    border: 2px solid #667eea;
-    color: #667eea;
-    border-radius: 5px;
-    cursor: pointer;
-    font-size: 0.9rem;
-    font-weight: 600;
-    transition: all 0.3s;
-}
-
-.select-btn:hover {
-    background: #667eea;
-    color: white;
-}
-
-/* Venue 徽章 - 增强对比度和可见性 */
-.venue-badge {
-    display: inline-block;
-    padding: 0.4rem 0.9rem;
-    border-radius: 6px;
-    font-size: 0.8rem;
-    font-weight: 700;
-    text-transform: none;
-    letter-spacing: 0.3px;
-    box-shadow: 0 2px 6px rgba(0,0,0,0.15);
-    margin-left: 0.5rem;
-    max-width: 600px;
-    white-space: normal;
-    word-wrap: break-word;
-    line-height: 1.4;
-}
-
-.badge-neurips {
-    background: #6B46C1;
-    color: white;
-}
-
-.badge-cvpr, .badge-iccv, .badge-eccv {
-    background: #E53E3E;
-    color: white;
-}
-
-.badge-icml, .badge-iclr {
-    background: #3182CE;
-    color: white;
-}
-
-.badge-acl, .badge-emnlp, .badge-naacl {
-    background: #38A169;
-    color: white;
-}
-
-.badge-aaai, .badge-ijcai {
-    background: #D69E2E;
-    color: white;
-}
-
-.badge-published {
-    background: #4A5568;
-    color: white;
-}
-
-.preprint {
-    background: #f5f5f5;
-    color: #757575;
-}
-
-.paper-title {
-    font-size: 1.3rem;
-    margin-bottom: 0.8rem;
-}
-
-.paper-title a {
-    color: #333;
-    text-decoration: none;
-    transition: color 0.3s;
-}
-
-.paper-title a:hover {
-    color: #667eea;
-}
-
-.paper-meta {
-    display: flex;
-    flex-wrap: wrap;
-    gap: 1rem;
-    margin-bottom: 0.8rem;
-    font-size: 0.9rem;
-    color: #666;
-}
-
-.meta-item.venue-conference {
-    color: #2e7d32;
-    font-weight: 600;
-    background: #e8f5e9;
-    padding: 0.2rem 0.6rem;
-    border-radius: 4px;
-}
-
-.meta-item.venue-preprint {
-    color: #666;
-}
-
-.paper-authors {
-    margin-bottom: 0.8rem;
-    color: #555;
-    font-size: 0.95rem;
-}
-
-.paper-tags {
-    display: flex;
-    flex-wrap: wrap;
-    gap: 0.5rem;
-    margin-bottom: 1rem;
-}
-
-.tag {
-    display: inline-block;
-    padding: 0.3rem 0.8rem;
-    background: #e3f2fd;
-    color: #1976d2;
-    border-radius: 15px;
-    font-size: 0.85rem;
-}
-
-.paper-abstract {
-    margin-bottom: 1rem;
-}
-
-.paper-abstract details summary {
-    cursor: pointer;
-    color: #667eea;
-    font-weight: 500;
-    user-select: none;
-}
-
-.paper-abstract details[open] summary {
-    margin-bottom: 0.5rem;
-}
-
-.paper-abstract p {
-    color: #555;
-    line-height: 1.8;
-    text-align: justify;
-}
-
-.paper-links {
-    display: flex;
-    gap: 1rem;
-}
-
-.btn-link {
-    padding: 0.5rem 1rem;
-    background: #667eea;
-    color: white;
-    text-decoration: none;
-    border-radius: 5px;
-    font-size: 0.9rem;
-    transition: background 0.3s;
-    display: inline-block;
-}
-
-.btn-link:hover {
-    background: #5568d3;
-}
-
-.btn-code {
-    background: #28a745;
-}
-
-.btn-code:hover {
-    background: #218838;
-}
-
-.btn-project {
-    background: #17a2b8;
-}
-
-.btn-project:hover {
-    background: #138496;
-}
-
-/* 底部 */
-footer {
-    background: #333;
-    color: white;
-    text-align: center;
-    padding: 2rem 0;
-    margin-top: 3rem;
-}
-
-footer a {
-    color: #667eea;
-    text-decoration: none;
-}
-
-/* 无结果提示 */
-.no-results {
-    text-align: center;
-    padding: 3rem;
-    color: #999;
-    font-size: 1.1rem;
-}
-
-/* 加载指示器 */
-.loading-indicator {
-    text-align: center;
-    padding: 2rem;
-    color: #667eea;
-    font-size: 1rem;
-    font-weight: 500;
-}
-
-.loading-indicator::after {
-    content: '';
-    display: inline-block;
-    width: 20px;
-    height: 20px;
-    margin-left: 10px;
-    border: 3px solid #667eea;
-    border-radius: 50%;
-    border-top-color: transparent;
-    animation: spin 1s linear infinite;
-}
-
-@keyframes spin {
-    to { transform: rotate(360deg); }
-}
-
-/* 响应式设计 */
-@media (max-width: 768px) {
-    header h1 {
-        font-size: 2rem;
-    }
-    
-    .filters {
-        justify-content: center;
-    }
-    
-    .paper-meta {
-        flex-direction: column;
-        gap: 0.3rem;
-    }
-}
-"""
-        
-        css_dir = self.output_dir / "css"
-        css_dir.mkdir(parents=True, exist_ok=True)
-        
-        with open(css_dir / "style.css", 'w', encoding='utf-8') as f:
-            f.write(css)
-        
-        logger.info("生成 CSS 样式文件")
-    
-    def generate_js(self):
-        """生成 JavaScript 文件"""
-        js = """// 筛选、搜索、排序和懒加载功能
-document.addEventListener('DOMContentLoaded', function() {
-    console.log('JavaScript loaded');
-    
-    // 获取DOM元素
-    const monthBtns = document.querySelectorAll('.month-btn');
-    const statusBtns = document.querySelectorAll('.status-btn');
-    const categoryBtns = document.querySelectorAll('.category-btn');
-    const sortBtns = document.querySelectorAll('.sort-btn');
-    const searchInput = document.getElementById('searchInput');
-    const exportBtn = document.getElementById('exportBtn');
-    const selectAllBtn = document.getElementById('selectAllBtn');
-    const clearAllBtn = document.getElementById('clearAllBtn');
-    const selectedCount = document.getElementById('selectedCount');
-    const resultsCount = document.getElementById('resultsCount');
-    const papersContainer = document.getElementById('papers-container');
-    
-    console.log('DOM elements:', {
-        monthBtns: monthBtns.length,
-        statusBtns: statusBtns.length,
-        categoryBtns: categoryBtns.length,
-        sortBtns: sortBtns.length,
-        searchInput: !!searchInput,
-        exportBtn: !!exportBtn,
-        selectAllBtn: !!selectAllBtn,
-        clearAllBtn: !!clearAllBtn,
-        resultsCount: !!resultsCount,
-        papersContainer: !!papersContainer
-    });
-    
-    // 状态变量
-    let allPapersData = [];  // 所有论文数据
-    let currentMonth = 'all';  // 当前选中的月份
-    let currentStatus = 'all';
-    let currentCategory = 'all';
-    let currentSort = 'date-desc';
-    let searchTerm = '';
-    let filteredPapers = [];
-    let loadedCount = 0;
-    const initialBatchSize = 20;  // 第一次加载20个
-    const subsequentBatchSize = 10;  // 后续每次加载10个
-    let isLoading = false;
-    let observer = null;
-    let monthsCache = {};  // 缓存已加载的月份数据
-    
-    // 加载月份索引
-    async function loadMonthsIndex() {
-        try {
-            const response = await fetch('data/index.json');
-            const monthsIndex = await response.json();
-            console.log('Months index loaded:', monthsIndex);
-            
-            // 默认加载最新月份的数据
-            if (monthsIndex.length > 0) {
-                await loadMonthData('all');
-            }
-        } catch (e) {
-            console.error('Failed to load months index:', e);
-        }
-    }
-    
-    // 加载指定月份的数据
-    async function loadMonthData(month) {
-        if (month === 'all') {
-            // 加载所有月份
-            try {
-                const response = await fetch('data/index.json');
-                const monthsIndex = await response.json();
-                
-                // 加载所有月份数据
-                allPapersData = [];
-                for (const monthInfo of monthsIndex) {
-                    if (!monthsCache[monthInfo.month]) {
-                        const monthResponse = await fetch(`data/${monthInfo.month}.json`);
-                        monthsCache[monthInfo.month] = await monthResponse.json();
-                    }
-                    allPapersData.push(...monthsCache[monthInfo.month]);
-                }
-                console.log(`Loaded all months, total ${allPapersData.length} papers`);
-            } catch (e) {
-                console.error('Failed to load all months data:', e);
-            }
-        } else {
-            // 加载单个月份
-            if (!monthsCache[month]) {
-                try {
-                    const response = await fetch(`data/${month}.json`);
-                    monthsCache[month] = await response.json();
-                    console.log(`Loaded month ${month}, ${monthsCache[month].length} papers`);
-                } catch (e) {
-                    console.error(`Failed to load month ${month}:`, e);
-                    return;
-                }
-            }
-            allPapersData = monthsCache[month];
-            console.log(`Using cached data for ${month}, ${allPapersData.length} papers`);
-        }
-        
-        // 数据加载完成后，触发筛选
-        filterAndSortPapers();
-    }
-    
-    // 生成论文HTML
-    function createPaperHTML(paper) {
-        const tags = paper.tags ? paper.tags.map(tag => `<span class="tag">${tag}</span>`).join('') : '';
-        
-        // 提取代码链接
-        let codeLink = '';
-        if (paper.code_link) {
-            codeLink = `<a href="${paper.code_link}" target="_blank" class="code-link">📄 Code/Project</a>`;
-        }
-        
-        // 获取会议徽章
-        let venueBadge = '';
-        if (paper.conference) {
-            const badgeInfo = getVenueBadge(paper.conference);
-            if (badgeInfo) {
-                venueBadge = `<span class="venue-badge ${badgeInfo.class}">${badgeInfo.text}</span>`;
-            }
-        }
-        
-        const status = paper.conference ? 'published' : 'preprint';
-        const firstCategory = paper.categories && paper.categories.length > 0 ? paper.categories[0] : '';
-        
-        return `
-            <article class="paper-card" data-date="${paper.published}" data-status="${status}" data-tags="${paper.tags ? paper.tags.join(',') : ''}" data-paper-id="${paper.id}">
-                <div class="paper-select">
-                    <input type="checkbox" class="paper-checkbox" id="check-${paper.id}" data-paper-id="${paper.id}">
-                    <label for="check-${paper.id}"></label>
-                </div>
-                <div class="paper-content">
-                    <h2 class="paper-title">
-                        <a href="https://arxiv.org/abs/${paper.id}" target="_blank">${paper.title}</a>
-                    </h2>
-                    <div class="paper-meta">
-                        <span class="meta-item">📅 ${paper.published}</span>
-                        ${venueBadge}
-                        ${codeLink}
-                    </div>
-                    <div class="paper-authors">
-                        👥 ${paper.authors}
-                    </div>
-                    <div class="paper-tags">
-                        ${tags}
-                    </div>
-                    <div class="paper-abstract">
-                        <details>
-                            <summary>查看摘要</summary>
-                            <p>${paper.abstract}</p>
-                        </details>
-                    </div>
-                </div>
-            </article>
-        `;
-    }
-    
-    // 获取会议徽章信息
-    function getVenueBadge(conference) {
-        if (!conference) return null;
-        
-        // 根据会议名称中包含的关键词决定徽章样式
-        const conferenceUpper = conference.toUpperCase();
-        let badgeClass = 'badge-published';  // 默认样式
-        
-        // 顶级会议匹配
-        if (conferenceUpper.includes('NEURIPS')) {
-            badgeClass = 'badge-neurips';
-        } else if (conferenceUpper.includes('ICLR')) {
-            badgeClass = 'badge-iclr';
-        } else if (conferenceUpper.includes('ICML')) {
-            badgeClass = 'badge-icml';
-        } else if (conferenceUpper.includes('CVPR')) {
-            badgeClass = 'badge-cvpr';
-        } else if (conferenceUpper.includes('ICCV')) {
-            badgeClass = 'badge-iccv';
-        } else if (conferenceUpper.includes('ECCV')) {
-            badgeClass = 'badge-eccv';
-        } else if (conferenceUpper.includes('ACL')) {
-            badgeClass = 'badge-acl';
-        } else if (conferenceUpper.includes('EMNLP')) {
-            badgeClass = 'badge-emnlp';
-        } else if (conferenceUpper.includes('NAACL')) {
-            badgeClass = 'badge-naacl';
-        } else if (conferenceUpper.includes('AAAI')) {
-            badgeClass = 'badge-aaai';
-        } else if (conferenceUpper.includes('IJCAI')) {
-            badgeClass = 'badge-ijcai';
-        }
-        
-        // 直接使用从 ArXiv comments 提取的完整会议名称
-        return { class: badgeClass, text: conference };
-    }
-    
-    // 更新研究领域按钮的数量
-    function updateCategoryButtonCounts() {
-        // 先筛选出符合当前状态的论文
-        const statusFilteredPapers = allPapersData.filter(paper => {
-            const status = paper.conference ? 'published' : 'preprint';
-            return currentStatus === 'all' || status === currentStatus;
-        });
-        
-        // 计算各个领域的数量
-        const categoryCounts = {
-            'all': statusFilteredPapers.length,
-            'Computer Vision': 0,
-            'Natural Language Processing': 0,
-            'Machine Learning': 0,
-            'Robotics': 0,
-            'Multimodal': 0
-        };
-        
-        statusFilteredPapers.forEach(paper => {
-            const tags = paper.tags || [];
-            tags.forEach(tag => {
-                if (categoryCounts.hasOwnProperty(tag)) {
-                    categoryCounts[tag]++;
-                }
-            });
-        });
-        
-        // 更新按钮文本
-        categoryBtns.forEach(btn => {
-            const category = btn.dataset.category;
-            const displayName = category === 'all' ? '全部' : 
-                               category === 'Natural Language Processing' ? 'NLP' : category;
-            const count = categoryCounts[category] || 0;
-            btn.textContent = `${displayName} (${count})`;
-        });
-    }
-    
-    // 筛选和排序论文
-    function filterAndSortPapers() {
-        console.log('Filtering papers:', { currentStatus, currentCategory, searchTerm, currentSort });
-        
-        // 筛选
-        filteredPapers = allPapersData.filter(paper => {
-            const status = paper.conference ? 'published' : 'preprint';
-            const tags = paper.tags || [];
-            const text = `${paper.title} ${paper.authors} ${paper.abstract}`.toLowerCase();
-            
-            const matchStatus = currentStatus === 'all' || status === currentStatus;
-            const matchCategory = currentCategory === 'all' || tags.includes(currentCategory);
-            const matchSearch = searchTerm === '' || text.includes(searchTerm);
-            
-            return matchStatus && matchCategory && matchSearch;
-        });
-        
-        console.log(`Filtered to ${filteredPapers.length} papers`);
-        
-        // 排序
-        filteredPapers.sort((a, b) => {
-            const dateA = new Date(a.published);
-            const dateB = new Date(b.published);
-            
-            if (currentSort === 'date-desc') {
-                return dateB - dateA;
-            } else {
-                return dateA - dateB;
-            }
-        });
-        
-        // 更新研究领域按钮的数量
-        updateCategoryButtonCounts();
-        
-        // 更新显示
-        if (resultsCount) {
-            resultsCount.textContent = `显示 ${filteredPapers.length} 篇论文`;
-        }
-        
-        // 重置懒加载
-        loadedCount = 0;
-        if (papersContainer) {
-            papersContainer.innerHTML = '';
-        }
-        
-        // 移除旧的 observer
-        if (observer) {
-            observer.disconnect();
-        }
-        
-        // 加载第一批
-        loadMorePapers();
-    }
-    
-    // 加载更多论文
-    function loadMorePapers() {
-        if (isLoading || loadedCount >= filteredPapers.length) {
-            console.log('Skip loading:', { isLoading, loadedCount, total: filteredPapers.length });
-            return;
-        }
-        
-        isLoading = true;
-        
-        // 第一次加载50个，后续每次10个
-        const batchSize = loadedCount === 0 ? initialBatchSize : subsequentBatchSize;
-        console.log(`Loading papers ${loadedCount} to ${loadedCount + batchSize} (batch size: ${batchSize})`);
-        
-        const endIndex = Math.min(loadedCount + batchSize, filteredPapers.length);
-        const fragment = document.createDocumentFragment();
-        
-        for (let i = loadedCount; i < endIndex; i++) {
-            const paperHTML = createPaperHTML(filteredPapers[i]);
-            const temp = document.createElement('div');
-            temp.innerHTML = paperHTML;
-            fragment.appendChild(temp.firstElementChild);
-        }
-        
-        // 移除旧的加载指示器
-        const oldIndicator = document.getElementById('loading-indicator');
-        if (oldIndicator) {
-            oldIndicator.remove();
-        }
-        
-        papersContainer.appendChild(fragment);
-        loadedCount = endIndex;
-        isLoading = false;
-        
-        console.log(`Loaded ${endIndex} papers total`);
-        
-        // 如果还有更多，设置加载触发器
-        if (loadedCount < filteredPapers.length) {
-            setupLoadTrigger();
-        }
-    }
-    
-    // 设置加载触发器
-    function setupLoadTrigger() {
-        let indicator = document.getElementById('loading-indicator');
-        if (!indicator) {
-            indicator = document.createElement('div');
-            indicator.id = 'loading-indicator';
-            indicator.className = 'loading-indicator';
-            indicator.style.height = '100px';
-            indicator.style.margin = '20px 0';
-            indicator.style.textAlign = 'center';
-            indicator.style.color = '#666';
-            indicator.textContent = '加载更多...';
-            papersContainer.appendChild(indicator);
-        }
-        
-        // 创建新的 observer
-        if (observer) {
-            observer.disconnect();
-        }
-        
-        observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    console.log('Loading more papers (intersection detected)');
-                    loadMorePapers();
-                }
-            });
-        }, {
-            rootMargin: '200px'
-        });
-        
-        observer.observe(indicator);
-    }
-    
-    // 月份筛选
-    monthBtns.forEach(btn => {
-        btn.addEventListener('click', async function() {
-            console.log('Month button clicked:', this.dataset.month);
-            monthBtns.forEach(b => b.classList.remove('active'));
-            this.classList.add('active');
-            currentMonth = this.dataset.month;
-            
-            // 显示加载提示
-            if (resultsCount) {
-                resultsCount.textContent = '加载中...';
-            }
-            if (papersContainer) {
-                papersContainer.innerHTML = '<div style="text-align: center; padding: 40px; color: #666;">加载中...</div>';
-            }
-            
-            // 加载月份数据
-            await loadMonthData(currentMonth);
-        });
-    });
-    
-    // 发表状态筛选
-    statusBtns.forEach(btn => {
-        btn.addEventListener('click', function() {
-            console.log('Status button clicked:', this.dataset.status);
-            statusBtns.forEach(b => b.classList.remove('active'));
-            this.classList.add('active');
-            currentStatus = this.dataset.status;
-            filterAndSortPapers();
-        });
-    });
-    
-    // 研究领域筛选
-    categoryBtns.forEach(btn => {
-        btn.addEventListener('click', function() {
-            console.log('Category button clicked:', this.dataset.category);
-            categoryBtns.forEach(b => b.classList.remove('active'));
-            this.classList.add('active');
-            currentCategory = this.dataset.category;
-            filterAndSortPapers();
-        });
-    });
-    
-    // 排序按钮
-    sortBtns.forEach(btn => {
-        btn.addEventListener('click', function(e) {
-            console.log('Sort button clicked:', this.dataset.sort);
-            e.preventDefault();
-            sortBtns.forEach(b => b.classList.remove('active'));
-            this.classList.add('active');
-            currentSort = this.dataset.sort;
-            filterAndSortPapers();
-        });
-    });
-    
-    // 搜索输入
-    if (searchInput) {
-        searchInput.addEventListener('input', function() {
-            searchTerm = this.value.toLowerCase();
-            console.log('Search term:', searchTerm);
-            filterAndSortPapers();
-        });
-    }
-    
-    // 更新选中数量
-    function updateSelectedCount() {
-        const count = document.querySelectorAll('.paper-checkbox:checked').length;
-        if (selectedCount) {
-            selectedCount.textContent = count;
-        }
-    }
-    
-    // 监听复选框变化（使用事件委托）
-    if (papersContainer) {
-        papersContainer.addEventListener('change', function(e) {
-            if (e.target.classList.contains('paper-checkbox')) {
-                updateSelectedCount();
-            }
-        });
-    }
-    
-    // 全选功能
-    if (selectAllBtn) {
-        selectAllBtn.addEventListener('click', function() {
-            const checkboxes = document.querySelectorAll('.paper-checkbox');
-            checkboxes.forEach(cb => cb.checked = true);
-            updateSelectedCount();
-            console.log('All papers selected');
-        });
-    }
-    
-    // 清空选择
-    if (clearAllBtn) {
-        clearAllBtn.addEventListener('click', function() {
-            const checkboxes = document.querySelectorAll('.paper-checkbox');
-            checkboxes.forEach(cb => cb.checked = false);
-            updateSelectedCount();
-            console.log('All selections cleared');
-        });
-    }
-    
-    // 导出功能
-    if (exportBtn) {
-        exportBtn.addEventListener('click', function(e) {
-            console.log('Export button clicked');
-            e.preventDefault();
-            exportToBibTeX();
-        });
-    }
-    
-    // 导出为 BibTeX
-    function exportToBibTeX() {
-        // 获取所有选中的复选框
-        const checkboxes = document.querySelectorAll('.paper-checkbox:checked');
-        
-        if (checkboxes.length === 0) {
-            alert('请至少选择一篇论文导出！');
-            return;
-        }
-        
-        // 获取选中的论文ID
-        const selectedIds = Array.from(checkboxes).map(cb => cb.dataset.paperId);
-        
-        // 从所有论文数据中找到对应的论文
-        const selectedPapers = allPapersData.filter(paper => selectedIds.includes(paper.id));
-        
-        let bibtex = '';
-        selectedPapers.forEach((paper, index) => {
-            const arxivId = paper.id;
-            const year = paper.published.split('-')[0];
-            
-            bibtex += `@article{${arxivId.replace('.', '_')},\\n`;
-            bibtex += `  title={${paper.title}},\\n`;
-            bibtex += `  author={${paper.authors}},\\n`;
-            bibtex += `  year={${year}},\\n`;
-            bibtex += `  journal={arXiv preprint arXiv:${arxivId}}`;
-            if (paper.conference) {
-                bibtex += `,\\n  note={${paper.conference}}`;
-            }
-            bibtex += `\\n}\\n\\n`;
-        });
-        
-        console.log(`Exporting ${selectedPapers.length} selected papers`);
-        downloadFile(bibtex, 'papers.bib', 'text/plain');
-    }
-    
-    // 下载文件
-    function downloadFile(content, filename, contentType) {
-        const blob = new Blob([content], { type: contentType });
-        const url = URL.createObjectURL(blob);
-        const link = document.createElement('a');
-        link.href = url;
-        link.download = filename;
-        document.body.appendChild(link);
-        link.click();
-        document.body.removeChild(link);
-        URL.revokeObjectURL(url);
-        console.log('File download triggered:', filename);
-    }
-    
-    // 初始化 - 加载数据
-    console.log('Initializing...');
-    loadMonthsIndex();
-});
-"""
-        
-        js_dir = self.output_dir / "js"
-        js_dir.mkdir(parents=True, exist_ok=True)
-        
-        with open(js_dir / "main.js", 'w', encoding='utf-8') as f:
-            f.write(js)
-        
-        logger.info("生成 JavaScript 文件")
+        return ''.join(self.iter_papers_html(self.papers))
+    
+    def iter_papers_html(self, papers: Iterable[Dict]) -> Iterator[str]:
+        """逐篇产出论文卡片 HTML，供流式写出页面使用（卡片之间以换行分隔，拼接结果与 generate_papers_html 相同）"""
+        empty = True
+        for paper in papers:
+            yield self.render_paper_card(paper) if empty else '\n' + self.render_paper_card(paper)
+            empty = False
+        if empty:
+            yield '<p class="no-results">暂无论文数据</p>'
+    
+    def render_paper_card(self, paper: Dict) -> str:
+        """渲染单篇论文卡片（与前端共用 scripts/card_template.py 中的模板）"""
+        derived = self.get_derived_fields(paper)
+        fields = {'code_link': web_link(derived.get('code')), 'project_link': web_link(derived.get('project')),
+                  'venue_class': derived.get('venue_class')}
+        return render_card(card_context({**paper, **fields}))
+    
+    def build_assets(self):
+        """处理静态资源：压缩 assets/ 中的 CSS/JS 和卡片脚本，以内容哈希命名写入 docs/assets/
+        
+        内容不变时文件名和文件都不变，不会重写；docs/css、docs/js 下手动维护的文件不受影响。
+        """
+        assets_dir = self.output_dir / "assets"
+        sources = {name: (self.assets_dir / name).read_text(encoding='utf-8') for name in ASSET_SOURCES}
+        sources['js/card.js'] = build_card_js()
+        
+        for name, content in sources.items():
+            if self.minify_assets:
+                content = minify(name, content)
+            filename = hashed_name(name, content)
+            if self.write_output(assets_dir / filename, lambda: content):
+                logger.info(f"生成静态资源: {name} -> assets/{filename}")
+            self.asset_urls[name] = f"assets/{filename}"
+        
+        # 资源清单（原文件名 -> 带哈希的文件名），并删除旧版本的资源文件
+        self.write_output(assets_dir / "manifest.json", lambda: json.dumps(self.asset_urls, indent=2, sort_keys=True))
+        current = {url.split('/')[-1] for url in self.asset_urls.values()} | {'manifest.json'}
+        for path in assets_dir.iterdir():
+            if path.name not in current:
+                path.unlink()
+                self.build_manifest.pop(path.relative_to(self.output_dir).as_posix(), None)
+        
+        self.write_output(self.output_dir / "_headers", lambda: HEADERS_FILE)
+    
+    def asset_url(self, name: str, root: str = '') -> str:
+        """页面中引用静态资源的路径（root 为页面到网站根目录的相对路径）"""
+        return root + self.asset_urls[name]
     
     def run(self):
         """运行生成流程"""
         logger.info("开始生成静态网页...")
         
-        self.load_papers()
-        self.generate_monthly_data_files()  # 生成月度数据文件
-        self.generate_css()
-        self.generate_js()
-        self.generate_index_html()
-        
-        logger.info(f"网页生成完成! 输出目录: {self.output_dir}")
+        with self.metrics.stage('load_papers') as stage:
+            self.load_papers()
+            stage.items = len(self.papers)
+        
+        papers_count = len(self.papers)
+        with self.metrics.stage('month_files', items=papers_count):
+            self.generate_monthly_data_files()  # 生成月度数据文件
+        with self.metrics.stage('search_index', items=papers_count):
+            self.generate_search_index()
+        with self.metrics.stage('stats_file', items=papers_count):
+            self.generate_stats_file()
+        with self.metrics.stage('assets'):
+            self.build_assets()
+        with self.metrics.stage('html_render', items=min(papers_count, self.index_max_papers), page='index'):
+            self.generate_index_html()
+        with self.metrics.stage('html_render', items=papers_count, page='archive'):
+            self.generate_archive_pages()
+        with self.metrics.stage('save_caches'):
+            self.save_build_manifest()
+            self.save_derived_cache()
+        
+        self.metrics.count('files_written', self.written_count)
+        self.metrics.count('files_skipped', self.skipped_count)
+        logger.info(f"网页生成完成! 输出目录: {self.output_dir}（写入 {self.written_count} 个文件，"
+                    f"跳过 {self.skipped_count} 个未变化的文件）")
+        logger.info(f"各阶段耗时: {self.metrics.summary()}（总计 {self.metrics.duration():.2f}s）")
 
 
 def main():
-    generator = HTMLGenerator()
+    parser = argparse.ArgumentParser(description="生成静态网页")
+    parser.add_argument('--full', action='store_true', help="忽略构建清单，重新生成所有文件")
+    parser.add_argument('--metrics-report', metavar='PATH', default=None, help="写出各阶段耗时和计数的 JSON 报告")
+    parser.add_argument('--prometheus', metavar='PATH', default=None, help="写出 Prometheus 文本格式的指标")
+    args = parser.parse_args()
+    
+    generator = HTMLGenerator(incremental=not args.full)
     generator.run()
+    
+    if args.metrics_report:
+        generator.metrics.write_report(args.metrics_report)
+    if args.prometheus:
+        generator.metrics.write_prometheus(args.prometheus)
 
 
 if __name__ == "__main__":
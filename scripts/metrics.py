@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+运行指标
+记录 PaperFetcher / HTMLGenerator 各阶段的耗时、调用次数和处理条目数，以及请求页数、写入字节数等计数器，
+运行结束后输出 JSON 报告，也可以输出 Prometheus 文本格式（供 node_exporter 的 textfile collector 等采集）。
+
+阶段和计数器可以带标签（如 category="cs.AI"），同名不同标签分别统计；多线程并发记录是安全的。
+外层阶段的耗时包含其中嵌套的阶段（如 fetch_category 包含该类别的 rate_limit_wait）。
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# 报告格式版本：修改报告结构后递增
+REPORT_VERSION = 1
+
+# Prometheus 指标名前缀
+PROMETHEUS_PREFIX = 'paper_daily'
+
+# 计数器说明（Prometheus 的 HELP 行），未列出的计数器使用计数器名
+COUNTER_HELP = {
+    'api_requests': "ArXiv API 请求数（含重试）",
+    'results_scanned': "扫描的 API 结果条数",
+    'papers_deduplicated': "去重跳过的论文数",
+    'papers_saved': "新保存的论文数",
+    'fetch_errors': "抓取出错的类别数",
+    'bytes_written': "写入的字节数",
+    'files_written': "写入的文件数",
+    'files_skipped': "未变化而跳过的文件数",
+    'records_harvested': "OAI-PMH 收割的记录数",
+    'records_skipped': "回填时跳过的记录数",
+    'bytes_received': "接收的响应字节数",
+}
+
+
+def _label_key(labels: Dict) -> Tuple:
+    """标签字典 -> 可哈希的键（按标签名排序）"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape_label(value: str) -> str:
+    """Prometheus 标签值转义"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class StageTimer:
+    """正在计时的阶段，可在阶段内更新处理条目数"""
+    
+    def __init__(self, items: int = 0):
+        self.items = items
+
+
+class Metrics:
+    """一次运行（抓取或生成网页）的指标"""
+    
+    def __init__(self, run: str):
+        self.run = run
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.stages = {}    # (阶段名, 标签) -> {'seconds', 'calls', 'items'}
+        self.counters = {}  # (计数器名, 标签) -> 值
+        self._lock = threading.Lock()
+    
+    def add_time(self, stage: str, seconds: float, items: int = 0, **labels):
+        """累加一次阶段耗时"""
+        key = (stage, _label_key(labels))
+        with self._lock:
+            entry = self.stages.get(key)
+            if entry is None:
+                entry = self.stages[key] = {'seconds': 0.0, 'calls': 0, 'items': 0}
+            entry['seconds'] += seconds
+            entry['calls'] += 1
+            entry['items'] += items
+    
+    @contextmanager
+    def stage(self, stage: str, items: int = 0, **labels) -> Iterator[StageTimer]:
+        """计时一个阶段（with 语句），可通过返回对象的 items 属性设置处理条目数"""
+        timer = StageTimer(items)
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            self.add_time(stage, time.perf_counter() - start, timer.items, **labels)
+    
+    def count(self, name: str, value: float = 1, **labels):
+        """累加计数器"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def duration(self) -> float:
+        """从创建到现在的总耗时（秒）"""
+        return time.perf_counter() - self._start
+    
+    def report(self) -> Dict:
+        """JSON 运行报告"""
+        with self._lock:
+            stages = [{'stage': stage, 'labels': dict(labels), 'seconds': round(entry['seconds'], 6),
+                       'calls': entry['calls'], 'items': entry['items']}
+                      for (stage, labels), entry in self.stages.items()]
+            counters = [{'counter': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in self.counters.items()]
+        return {
+            'version': REPORT_VERSION,
+            'run': self.run,
+            'started_at': self.started_at.isoformat(),
+            'duration_seconds': round(self.duration(), 6),
+            'stages': stages,
+            'counters': counters,
+        }
+    
+    def summary(self) -> str:
+        """按阶段汇总的耗时（不区分标签），用于日志"""
+        totals = {}
+        for (stage, _), entry in list(self.stages.items()):
+            totals[stage] = totals.get(stage, 0.0) + entry['seconds']
+        return ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in totals.items())
+    
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Prometheus 文本格式"""
+        report = self.report()
+        run_label = {'run': self.run}
+        lines = []
+        
+        def metric(name: str, help_text: str, metric_type: str, samples: List[Tuple[Dict, float]]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(str(val))}"' for key, val in {**run_label, **labels}.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+        
+        stage_samples = [({'stage': s['stage'], **s['labels']}, s) for s in report['stages']]
+        metric('stage_seconds_total', "各阶段累计耗时（秒）", 'counter',
+               [(labels, s['seconds']) for labels, s in stage_samples])
+        metric('stage_calls_total', "各阶段执行次数", 'counter',
+               [(labels, s['calls']) for labels, s in stage_samples])
+        metric('stage_items_total', "各阶段处理的条目数", 'counter',
+               [(labels, s['items']) for labels, s in stage_samples])
+        
+        counters = {}
+        for c in report['counters']:
+            counters.setdefault(c['counter'], []).append((c['labels'], c['value']))
+        for name in sorted(counters):
+            metric(f"{name}_total", COUNTER_HELP.get(name, name), 'counter', counters[name])
+        
+        metric('run_duration_seconds', "本次运行总耗时（秒）", 'gauge', [({}, report['duration_seconds'])])
+        metric('run_timestamp_seconds', "本次运行开始时间（Unix 时间戳）", 'gauge', [({}, self.started_at.timestamp())])
+        return '\n'.join(lines) + '\n'
+    
+    def write_report(self, path: str):
+        """写出 JSON 运行报告"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+    
+    def write_prometheus(self, path: str):
+        """写出 Prometheus 文本格式"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_prometheus(), encoding='utf-8')
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+SQLite 论文数据库（可选）
+将论文归档导入 SQLite，utils.py 中的查询函数在这里以带索引的 SQL 查询实现，
+并提供基于 FTS5 的标题/摘要全文搜索，适合对完整归档做临时查询。
+
+用法:
+    python scripts/paper_db.py import [data/papers.json]   # 导入（自动识别分片存储）
+    python scripts/paper_db.py search "diffusion model"     # 全文搜索
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+# 以脚本方式运行（python scripts/paper_db.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.storage import open_store
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    published TEXT,
+    updated TEXT,
+    primary_category TEXT,
+    conference TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_papers_published ON papers(published);
+CREATE INDEX IF NOT EXISTS idx_papers_primary_category ON papers(primary_category);
+CREATE INDEX IF NOT EXISTS idx_papers_conference ON papers(conference);
+
+CREATE TABLE IF NOT EXISTS paper_tags (
+    paper_id TEXT NOT NULL REFERENCES papers(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (tag, paper_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_paper_tags_paper ON paper_tags(paper_id);
+"""
+
+# 外部内容 FTS5 表，由触发器与 papers 表保持同步
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, content='papers', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract) VALUES ('delete', old.rowid, old.title, old.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract) VALUES ('delete', old.rowid, old.title, old.abstract);
+    INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+END;
+"""
+
+
+def fts_query(query: str) -> str:
+    """把用户输入转为 FTS5 查询：按空白拆分，每个词作为 FTS5 字符串（短语）加引号，各词之间为 AND
+    
+    用户输入中的 -、+、?、: 等字符在 FTS5 查询语法中有特殊含义，直接传入会报语法错误，
+    加引号后由分词器按普通文本处理（如 text-to-image 匹配相邻的 text、to、image）。
+    """
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class PaperDatabase:
+    """SQLite 论文库"""
+    
+    def __init__(self, db_path: str = "data/papers.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        
+        # FTS5 依赖 SQLite 编译选项，不可用时退回 LIKE 搜索
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            logger.warning("当前 SQLite 不支持 FTS5，全文搜索将使用 LIKE 扫描")
+            self.has_fts = False
+        self.conn.commit()
+    
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+    
+    def import_papers(self, papers: List[Dict]) -> int:
+        """导入论文（已存在的 ID 会被覆盖），返回导入数量"""
+        with self.conn:
+            for paper in papers:
+                self.conn.execute(
+                    """INSERT INTO papers (id, title, abstract, published, updated, primary_category, conference, data)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(id) DO UPDATE SET
+                           title = excluded.title, abstract = excluded.abstract,
+                           published = excluded.published, updated = excluded.updated,
+                           primary_category = excluded.primary_category,
+                           conference = excluded.conference, data = excluded.data""",
+                    (paper['id'], paper.get('title', ''), paper.get('abstract', ''),
+                     paper.get('published'), paper.get('updated'), paper.get('primary_category'),
+                     paper.get('conference'), json.dumps(paper, ensure_ascii=False))
+                )
+                self.conn.execute("DELETE FROM paper_tags WHERE paper_id = ?", (paper['id'],))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO paper_tags (paper_id, tag) VALUES (?, ?)",
+                    [(paper['id'], tag) for tag in paper.get('tags', [])]
+                )
+        return len(papers)
+    
+    def import_store(self, json_path: str = "data/papers.json") -> int:
+        """从论文存储（papers.json 或按月分片）导入全部论文，逐月导入以控制内存"""
+        count = 0
+        for year_month, papers in open_store(json_path).iter_months():
+            count += self.import_papers(papers)
+            logger.info(f"导入 {year_month or '未知月份'}: {len(papers)} 篇")
+        return count
+    
+    def _query_papers(self, sql: str, params: tuple = ()) -> List[Dict]:
+        """执行查询并还原论文字典"""
+        return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+    
+    def count(self) -> int:
+        """论文总数"""
+        return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+    
+    def get_papers_by_date(self, date: str) -> List[Dict]:
+        """获取指定日期的论文"""
+        return self._query_papers("SELECT data FROM papers WHERE published = ?", (date,))
+    
+    def get_papers_by_date_range(self, start: str, end: str) -> List[Dict]:
+        """获取日期范围内（含两端）的论文，按日期降序"""
+        return self._query_papers(
+            "SELECT data FROM papers WHERE published BETWEEN ? AND ? ORDER BY published DESC",
+            (start, end)
+        )
+    
+    def get_papers_by_category(self, category: str) -> List[Dict]:
+        """获取指定类别（标签）的论文"""
+        return self._query_papers(
+            "SELECT p.data FROM paper_tags t JOIN papers p ON p.id = t.paper_id WHERE t.tag = ?",
+            (category,)
+        )
+    
+    def get_papers_by_primary_category(self, primary_category: str) -> List[Dict]:
+        """获取指定 ArXiv 主类别的论文"""
+        return self._query_papers("SELECT data FROM papers WHERE primary_category = ?", (primary_category,))
+    
+    def get_papers_by_conference(self, conference: str) -> List[Dict]:
+        """获取指定会议/期刊的论文（精确匹配 conference 字段）"""
+        return self._query_papers("SELECT data FROM papers WHERE conference = ?", (conference,))
+    
+    def count_papers_by_category(self) -> Dict[str, int]:
+        """统计各类别论文数量"""
+        return dict(self.conn.execute("SELECT tag, COUNT(*) FROM paper_tags GROUP BY tag"))
+    
+    def search(self, query: str, limit: Optional[int] = 100) -> List[Dict]:
+        """在标题和摘要中全文搜索，FTS5 可用时按相关度排序"""
+        limit = -1 if limit is None else limit
+        if not query.split():
+            return []
+        if self.has_fts:
+            return self._query_papers(
+                """SELECT p.data FROM papers_fts f JOIN papers p ON p.rowid = f.rowid
+                   WHERE papers_fts MATCH ? ORDER BY f.rank LIMIT ?""",
+                (fts_query(query), limit)
+            )
+        # 每个词都须出现在标题或摘要中（% 和 _ 按普通字符匹配）
+        terms = [term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') for term in query.split()]
+        where = ' AND '.join("(title LIKE ? ESCAPE '\\' OR abstract LIKE ? ESCAPE '\\')" for _ in terms)
+        params = [pattern for term in terms for pattern in (f"%{term}%", f"%{term}%")]
+        return self._query_papers(f"SELECT data FROM papers WHERE {where} LIMIT ?", (*params, limit))
+
+
+def main():
+    """命令行入口"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(description="SQLite 论文数据库")
+    parser.add_argument('--db', default="data/papers.db", help="数据库路径")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    import_parser = subparsers.add_parser('import', help="从 papers.json / 分片存储导入")
+    import_parser.add_argument('json_path', nargs='?', default="data/papers.json")
+    
+    search_parser = subparsers.add_parser('search', help="全文搜索标题和摘要")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=20)
+    
+    args = parser.parse_args()
+    db = PaperDatabase(args.db)
+    
+    if args.command == 'import':
+        count = db.import_store(args.json_path)
+        logger.info(f"导入完成！共 {count} 篇，数据库中共 {db.count()} 篇论文")
+    elif args.command == 'search':
+        for paper in db.search(args.query, limit=args.limit):
+            print(f"{paper['published']}  {paper['id']}  {paper['title']}")
+    
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+批量重新分类脚本
+修改 config.yaml 中的 categories 后，用新的关键词重新给已保存的论文打标签，无需重新抓取。
+按月份流式读取论文，多进程并行分类，只写回标签发生变化的论文（分片存储下逐月写回，内存中只保留一个月的论文）。
+
+用法:
+    python scripts/retag_papers.py                # 使用全部 CPU 核心
+    python scripts/retag_papers.py --workers 1    # 单进程
+    python scripts/retag_papers.py --dry-run      # 只统计，不写回
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+import logging
+
+import yaml
+
+# 以脚本方式运行（python scripts/retag_papers.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.classifier import KeywordClassifier
+from scripts.storage import open_store
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 每个任务分类的论文数，平衡进程间通信开销和负载均衡
+CHUNK_SIZE = 500
+
+# 子进程中的分类器，由 _init_worker 构建一次
+_worker_classifier = None
+
+
+def _init_worker(config: Dict):
+    """子进程初始化：根据配置构建分类器"""
+    global _worker_classifier
+    _worker_classifier = KeywordClassifier.from_config(config)
+
+
+def _classify_texts(texts: List[str]) -> List[List[str]]:
+    """在子进程中分类一批文本（只传标题+摘要，减少序列化开销）"""
+    return [_worker_classifier.classify_text(text) for text in texts]
+
+
+def retag_papers(config: Dict, data_path: str = "data/papers.json",
+                 workers: int = None, dry_run: bool = False) -> Dict[str, int]:
+    """重新分类所有已保存的论文，返回统计信息"""
+    workers = workers or os.cpu_count() or 1
+    store = open_store(data_path)
+    
+    stats = {'total': 0, 'changed': 0}
+    # 分片存储每处理完一个月就写回该月；单文件存储只能整体重写，所有月份处理完后写回一次
+    per_month = store.backend == 'sharded'
+    changed_papers = []
+    
+    executor = None
+    classifier = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,))
+    else:
+        classifier = KeywordClassifier.from_config(config)
+    
+    try:
+        # 按月份流式处理，每次只在内存中保留一个月的论文
+        for year_month, papers in store.iter_months():
+            texts = [paper['title'] + ' ' + paper['abstract'] for paper in papers]
+            if executor:
+                chunks = [texts[i:i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+                new_tags = [tags for chunk_tags in executor.map(_classify_texts, chunks) for tags in chunk_tags]
+            else:
+                new_tags = [classifier.classify_text(text) for text in texts]
+            
+            month_changed = []
+            for paper, tags in zip(papers, new_tags):
+                if set(tags) != set(paper.get('tags', [])):
+                    paper['tags'] = tags
+                    month_changed.append(paper)
+            
+            # 只写回标签变化的论文
+            if month_changed and not dry_run:
+                if per_month:
+                    store.update(month_changed)
+                else:
+                    changed_papers.extend(month_changed)
+            
+            stats['total'] += len(papers)
+            stats['changed'] += len(month_changed)
+            logger.info(f"{year_month or '未知月份'}: {len(papers)} 篇，标签变化 {len(month_changed)} 篇")
+    finally:
+        if executor:
+            executor.shutdown()
+    
+    if changed_papers:
+        store.update(changed_papers)
+    
+    return stats
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="用 config.yaml 中的关键词重新给已保存的论文打标签")
+    parser.add_argument('--config', default="config.yaml", help="配置文件路径")
+    parser.add_argument('--data', default="data/papers.json", help="论文数据路径（自动识别分片存储）")
+    parser.add_argument('--workers', type=int, default=None, help="进程数（默认使用全部 CPU 核心）")
+    parser.add_argument('--dry-run', action='store_true', help="只统计变化，不写回")
+    args = parser.parse_args()
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    start = time.perf_counter()
+    stats = retag_papers(config, args.data, workers=args.workers, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+    
+    action = "需要更新" if args.dry_run else "已更新"
+    logger.info(f"重新分类完成！共 {stats['total']} 篇论文，{action} {stats['changed']} 篇，耗时 {elapsed:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
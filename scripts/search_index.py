@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+静态搜索索引
+构建时对整个归档的标题、作者和摘要建立倒排索引，按词项前缀分片写入 docs/data/search/，
+前端只需下载查询词所在的分片就能跨月份搜索，不必下载和扫描全部摘要。
+
+文件格式:
+    search/meta.json           {"version", "prefix_length", "doc_count", "shards": [前缀, ...]}
+    search/docs.json           [论文ID, ...]，按发布时间从旧到新排列，倒排表中的文档编号即此列表的下标
+    search/shards/{前缀}.json  {词项: [文档编号差值, ...]}，倒排表按编号升序、差值编码
+
+前端的分词规则（小写后取 [a-z0-9]+，长度 >= 2，去掉停用词）必须与 tokenize 保持一致。
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# 索引格式版本：修改分词规则或文件格式后递增
+INDEX_VERSION = 2
+
+# 分片前缀长度：词项按前 N 个字符分到同一个分片
+DEFAULT_PREFIX_LENGTH = 2
+
+# 出现频率极高、对检索没有区分度的英文停用词
+STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in into is it its of on or our that the their this to
+we which with via these those than then both also such not but was were been being
+""".split())
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """分词：小写后取连续字母数字，去掉单字符和停用词"""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower())
+            if len(token) >= 2 and token not in STOPWORDS]
+
+
+def paper_text(paper: Dict) -> str:
+    """参与索引的文本：标题、作者和摘要"""
+    authors = paper.get('authors', [])
+    if isinstance(authors, list):
+        authors = ' '.join(authors)
+    return f"{paper.get('title', '')} {authors} {paper.get('abstract', '')}"
+
+
+def build_search_index(papers: Iterable[Dict],
+                       prefix_length: int = DEFAULT_PREFIX_LENGTH) -> Tuple[List[str], Dict[str, Dict[str, List[int]]]]:
+    """构建倒排索引，返回 (文档ID列表, {前缀: {词项: 差值编码的倒排表}})
+    
+    文档编号按 papers 的顺序分配，同一 ID 的论文只索引第一次出现的版本。
+    调用方应按从旧到新的顺序传入，这样新论文只追加在末尾，已有分片的内容保持不变。
+    """
+    doc_ids = []
+    seen = set()
+    postings = {}  # 词项 -> 文档编号列表（按编号递增追加）
+    
+    for paper in papers:
+        paper_id = paper.get('id')
+        if not paper_id or paper_id in seen:
+            continue
+        seen.add(paper_id)
+        doc = len(doc_ids)
+        doc_ids.append(paper_id)
+        for term in set(tokenize(paper_text(paper))):
+            postings.setdefault(term, []).append(doc)
+    
+    shards = {}
+    for term in sorted(postings):
+        docs = postings[term]
+        # 差值编码：相邻编号之差通常很小，序列化后更短
+        shards.setdefault(term[:prefix_length], {})[term] = [docs[0]] + [b - a for a, b in zip(docs, docs[1:])]
+    
+    return doc_ids, shards
+
+
+def search(doc_ids: List[str], shards: Dict[str, Dict[str, List[int]]], query: str,
+           prefix_length: int = DEFAULT_PREFIX_LENGTH) -> List[str]:
+    """在索引上执行查询（与前端逻辑相同，供调试和测试使用）
+    
+    每个查询词按前缀匹配词项，多个查询词取交集。
+    """
+    result = None
+    for token in tokenize(query):
+        # 查询词比前缀短时，需要查找所有以它开头的分片
+        prefix = token[:prefix_length]
+        matched = set()
+        for shard_prefix, shard in shards.items():
+            if not shard_prefix.startswith(prefix):
+                continue
+            for term, deltas in shard.items():
+                if term.startswith(token):
+                    doc = 0
+                    for delta in deltas:
+                        doc += delta
+                        matched.add(doc)
+        result = matched if result is None else result & matched
+        if not result:
+            return []
+    return [doc_ids[doc] for doc in sorted(result or [])]
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+论文存储模块
+支持两种存储后端：
+- json: 单个 data/papers.json 文件（旧格式）
+- sharded: 按月分片的 JSON Lines 文件 data/papers/YYYY-MM.jsonl + manifest.json
+
+分片存储下，每次保存只重写有变动的月份分片，读取时也可以只加载需要的月份。
+两种后端都按去掉版本号的 ArXiv ID 去重：同一论文的新版本替换已保存的旧版本，不会保存多份。
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+# 以脚本方式运行（python scripts/storage.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.utils import arxiv_version, load_json, save_json, strip_arxiv_version
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def get_month(paper: Dict) -> str:
+    """论文所属月份（published 字段的年月，如 2025-10）"""
+    return paper.get('published', '')[:7]
+
+
+def group_by_month(papers: List[Dict]) -> Dict[str, List[Dict]]:
+    """按月份分组，保持原有顺序"""
+    groups = {}
+    for paper in papers:
+        groups.setdefault(get_month(paper), []).append(paper)
+    return groups
+
+
+def merge_papers(existing_papers: List[Dict], papers: List[Dict]) -> Tuple[List[Dict], int, int]:
+    """把 papers 合并到 existing_papers 中，按去掉版本号的 ID 去重
+    
+    同一论文出现多次时保留版本号最大的一份（替换原有位置），新论文排在已有论文之前。
+    返回 (合并后的论文, 新增数量, 替换为新版本的已有论文数量)。
+    """
+    existing_papers = list(existing_papers)
+    existing_index = {strip_arxiv_version(p['id']): i for i, p in enumerate(existing_papers)}
+    new_papers = []
+    new_index = {}
+    replaced = 0
+    for paper in papers:
+        key = strip_arxiv_version(paper['id'])
+        if key in existing_index:
+            i = existing_index[key]
+            if arxiv_version(paper['id']) > arxiv_version(existing_papers[i]['id']):
+                existing_papers[i] = paper
+                replaced += 1
+        elif key in new_index:
+            i = new_index[key]
+            if arxiv_version(paper['id']) > arxiv_version(new_papers[i]['id']):
+                new_papers[i] = paper
+        else:
+            new_index[key] = len(new_papers)
+            new_papers.append(paper)
+    return new_papers + existing_papers, len(new_papers), replaced
+
+
+class JSONPaperStore:
+    """单文件存储（data/papers.json）"""
+    
+    backend = 'json'
+    
+    def __init__(self, json_path: str = "data/papers.json"):
+        self.json_path = Path(json_path)
+        self._papers = None  # 整个文件只解析一次
+    
+    def months(self) -> List[str]:
+        """所有月份（降序）"""
+        return sorted({get_month(p) for p in self.load()}, reverse=True)
+    
+    def load(self, months: Optional[List[str]] = None) -> List[Dict]:
+        """加载论文，可只加载指定月份"""
+        if self._papers is None:
+            self._papers = load_json(self.json_path)
+        papers = list(self._papers)
+        if months is not None:
+            wanted = set(months)
+            papers = [p for p in papers if get_month(p) in wanted]
+        return papers
+    
+    def iter_months(self, months: Optional[List[str]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """按月份（降序）依次返回 (月份, 论文列表)"""
+        groups = group_by_month(self.load(months))
+        for month in sorted(groups, reverse=True):
+            yield month, groups[month]
+    
+    def add(self, papers: List[Dict]) -> int:
+        """添加论文（按去掉版本号的 ID 去重，新版本替换旧版本），返回新增数量"""
+        all_papers, new_count, _ = merge_papers(self.load(), papers)
+        all_papers.sort(key=lambda x: x['published'], reverse=True)
+        save_json(all_papers, self.json_path)
+        self._papers = all_papers
+        return new_count
+    
+    def update(self, papers: List[Dict]) -> int:
+        """按 ID 替换已有论文，返回更新数量"""
+        if not papers:
+            return 0
+        updates = {p['id']: p for p in papers}
+        all_papers = self.load()
+        count = 0
+        for i, paper in enumerate(all_papers):
+            if paper['id'] in updates:
+                all_papers[i] = updates[paper['id']]
+                count += 1
+        save_json(all_papers, self.json_path)
+        self._papers = all_papers
+        return count
+    
+    def count(self) -> int:
+        """论文总数"""
+        return len(self.load())
+
+
+class ShardedPaperStore:
+    """按月分片的 JSON Lines 存储
+    
+    目录结构:
+        data/papers/manifest.json   # {"version": 1, "months": {"2025-10": {"file", "count", "hash"}}}
+        data/papers/2025-10.jsonl   # 每行一篇论文，按 published 降序
+    """
+    
+    backend = 'sharded'
+    
+    def __init__(self, shard_dir: str = "data/papers"):
+        self.shard_dir = Path(shard_dir)
+        self.manifest_path = self.shard_dir / "manifest.json"
+        self.manifest = self.load_manifest()
+    
+    def load_manifest(self) -> Dict:
+        """加载分片清单"""
+        if not self.manifest_path.exists():
+            return {'version': MANIFEST_VERSION, 'months': {}}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_manifest(self):
+        """保存分片清单"""
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    
+    def exists(self) -> bool:
+        """分片存储是否已初始化"""
+        return self.manifest_path.exists()
+    
+    def months(self) -> List[str]:
+        """所有月份（降序）"""
+        return sorted(self.manifest['months'], reverse=True)
+    
+    def month_hash(self, month: str) -> Optional[str]:
+        """月份分片内容的哈希（分片不存在时返回 None）"""
+        info = self.manifest['months'].get(month)
+        return info['hash'] if info else None
+    
+    def load_month(self, month: str) -> List[Dict]:
+        """加载单个月份分片"""
+        info = self.manifest['months'].get(month)
+        if not info:
+            return []
+        papers = []
+        with open(self.shard_dir / info['file'], 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    papers.append(json.loads(line))
+        return papers
+    
+    def load(self, months: Optional[List[str]] = None) -> List[Dict]:
+        """加载论文，可只加载指定月份"""
+        papers = []
+        for _, month_papers in self.iter_months(months):
+            papers.extend(month_papers)
+        return papers
+    
+    def iter_months(self, months: Optional[List[str]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """按月份（降序）依次返回 (月份, 论文列表)，每次只在内存中保留一个分片"""
+        wanted = self.months() if months is None else sorted(set(months), reverse=True)
+        for month in wanted:
+            if month in self.manifest['months']:
+                yield month, self.load_month(month)
+    
+    def write_month(self, month: str, papers: List[Dict]):
+        """重写单个月份分片并更新清单（不保存清单）"""
+        papers.sort(key=lambda x: x['published'], reverse=True)
+        content = ''.join(json.dumps(p, ensure_ascii=False) + '\n' for p in papers).encode('utf-8')
+        
+        file_name = f"{month or 'unknown'}.jsonl"
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.shard_dir / file_name, 'wb') as f:
+            f.write(content)
+        
+        self.manifest['months'][month] = {
+            'file': file_name,
+            'count': len(papers),
+            'hash': hashlib.sha256(content).hexdigest()
+        }
+    
+    def add(self, papers: List[Dict]) -> int:
+        """添加论文（按去掉版本号的 ID 去重，新版本替换旧版本），只重写涉及的月份分片，返回新增数量"""
+        new_count = 0
+        changed = False
+        # 论文的 published 不随版本变化，同一论文的各个版本只可能出现在同一个月份分片中
+        for month, month_papers in group_by_month(papers).items():
+            merged, month_new, month_replaced = merge_papers(self.load_month(month), month_papers)
+            if month_new or month_replaced:
+                self.write_month(month, merged)
+                new_count += month_new
+                changed = True
+        
+        if changed:
+            self.save_manifest()
+        return new_count
+    
+    def update(self, papers: List[Dict]) -> int:
+        """按 ID 替换已有论文，只重写涉及的月份分片，返回更新数量"""
+        count = 0
+        for month, month_papers in group_by_month(papers).items():
+            updates = {p['id']: p for p in month_papers}
+            existing_papers = self.load_month(month)
+            month_count = 0
+            for i, paper in enumerate(existing_papers):
+                if paper['id'] in updates:
+                    existing_papers[i] = updates[paper['id']]
+                    month_count += 1
+            if month_count:
+                self.write_month(month, existing_papers)
+                count += month_count
+        
+        if count:
+            self.save_manifest()
+        return count
+    
+    def count(self) -> int:
+        """论文总数（只读清单）"""
+        return sum(info['count'] for info in self.manifest['months'].values())
+    
+    def import_json(self, json_path: str) -> int:
+        """从旧的 papers.json 导入全部论文，返回导入数量"""
+        papers = load_json(json_path)
+        for month, month_papers in group_by_month(papers).items():
+            merged, _, _ = merge_papers(self.load_month(month), month_papers)
+            self.write_month(month, merged)
+        self.save_manifest()
+        logger.info(f"从 {json_path} 导入了 {len(papers)} 篇论文到 {self.shard_dir}")
+        return len(papers)
+
+
+def open_store(json_path: str = "data/papers.json", backend: Optional[str] = None):
+    """打开论文存储
+    
+    分片目录为 papers.json 同级的 papers/ 目录。backend 为 None 时自动检测：
+    存在分片清单则使用分片存储，否则使用 papers.json。
+    backend 为 'sharded' 且分片尚未初始化时，会自动从已有的 papers.json 迁移。
+    """
+    json_path = Path(json_path)
+    sharded = ShardedPaperStore(json_path.parent / "papers")
+    
+    if backend is None:
+        backend = 'sharded' if sharded.exists() else 'json'
+    
+    if backend == 'sharded':
+        if not sharded.exists() and json_path.exists():
+            logger.info(f"初始化分片存储，从 {json_path} 迁移数据...")
+            sharded.import_json(json_path)
+        return sharded
+    if backend == 'json':
+        return JSONPaperStore(json_path)
+    raise ValueError(f"未知的存储后端: {backend}")
+
+
+def main():
+    """将 data/papers.json 迁移为按月分片存储"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    json_path = sys.argv[1] if len(sys.argv) > 1 else "data/papers.json"
+    store = open_store(json_path, backend='sharded')
+    logger.info(f"分片存储共 {store.count()} 篇论文，{len(store.months())} 个月份")
+
+
+if __name__ == "__main__":
+    main()
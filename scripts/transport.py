@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+抓取传输层
+PaperFetcher 通过传输对象发出 HTTP 请求，默认直接访问网络，也可以录制或回放原始响应：
+- HTTPTransport       访问网络（每个线程独立的 requests.Session）
+- PooledHTTPTransport 访问网络，所有线程共用一个 keep-alive 连接池（直接 Atom 客户端默认使用）
+- RecordingTransport  访问网络，同时把原始响应（ArXiv 返回的 Atom XML）保存到目录
+- ReplayTransport     只从录制目录读取响应，不访问网络、不限速，可用于离线测试、性能分析和压测
+
+录制目录格式:
+    index.json      {"version", "recorded_at", "watermarks", "responses": {URL: {"file", "status"}}}
+    {哈希}.xml      响应原文
+
+回放时 now() 返回录制时间，watermarks 为录制开始时使用的增量抓取水位线，
+使按时间窗口过滤的结果与录制时一致，不受当前 data/fetch_watermarks.json 影响。
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# 录制格式版本：修改目录格式后递增
+RECORDING_VERSION = 1
+
+# 请求默认超时（秒，连接和每次读取分别计时），调用方未指定 timeout 时使用，避免连接挂起时一直阻塞
+DEFAULT_TIMEOUT = 60
+
+
+class RecordedResponse:
+    """回放的响应（提供 arxiv.Client 用到的 status_code / content / text）"""
+    
+    def __init__(self, url: str, status_code: int, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+    
+    @property
+    def text(self) -> str:
+        """响应文本"""
+        return self.content.decode('utf-8', errors='replace')
+
+
+class HTTPTransport:
+    """直接访问网络"""
+    
+    # 是否离线（离线传输不需要遵守 API 请求间隔）
+    offline = False
+    
+    # 录制的增量抓取水位线，为 None 时由 PaperFetcher 从数据目录读取
+    watermarks = None
+    
+    def __init__(self):
+        self._local = threading.local()  # requests.Session 非线程安全，每个线程使用独立的会话
+    
+    def get(self, url: str, headers: Optional[Dict] = None, **kwargs):
+        """发出 GET 请求"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+        return session.get(url, headers=headers, **kwargs)
+    
+    def now(self) -> datetime:
+        """当前时间（UTC），抓取时间窗口的终点"""
+        return datetime.now(timezone.utc)
+    
+    def record_watermarks(self, watermarks: Dict[str, str]):
+        """记录本次抓取使用的水位线（只有录制传输会保存）"""
+
+
+class PooledHTTPTransport(HTTPTransport):
+    """所有线程共用一个会话和连接池，连接保持 keep-alive，翻页时不必重新建立 TLS 连接"""
+    
+    def __init__(self, pool_size: int = 4):
+        super().__init__()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def get(self, url: str, headers: Optional[Dict] = None, **kwargs):
+        """发出 GET 请求"""
+        kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+        return self.session.get(url, headers=headers, **kwargs)
+
+
+class RecordingTransport(HTTPTransport):
+    """访问网络并把每个响应保存到录制目录（同一 URL 再次请求时覆盖）"""
+    
+    def __init__(self, directory: str, inner: Optional[HTTPTransport] = None):
+        """inner 为实际发出请求的传输，默认直接访问网络"""
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.inner = inner
+        self.recorded_at = datetime.now(timezone.utc)
+        self.recorded_watermarks = {}
+        self.responses = {}
+        self._lock = threading.Lock()
+    
+    def get(self, url: str, headers: Optional[Dict] = None, **kwargs):
+        """发出请求并录制响应"""
+        if self.inner is not None:
+            response = self.inner.get(url, headers=headers, **kwargs)
+        else:
+            response = super().get(url, headers=headers, **kwargs)
+        filename = f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.xml"
+        (self.directory / filename).write_bytes(response.content)
+        with self._lock:
+            self.responses[url] = {'file': filename, 'status': response.status_code}
+            self.save_index()
+        return response
+    
+    def record_watermarks(self, watermarks: Dict[str, str]):
+        """保存抓取开始时的水位线，回放时代替数据目录中的水位线"""
+        with self._lock:
+            self.recorded_watermarks = dict(watermarks)
+            self.save_index()
+    
+    def save_index(self):
+        """写入录制索引（每录制一个响应更新一次，中途出错时已录制的部分仍可回放）"""
+        index = {
+            'version': RECORDING_VERSION,
+            'recorded_at': self.recorded_at.isoformat(),
+            'watermarks': self.recorded_watermarks,
+            'responses': self.responses,
+        }
+        with open(self.directory / "index.json", 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2, sort_keys=True)
+    
+    def now(self) -> datetime:
+        """录制开始的时间，回放时作为时间窗口的终点"""
+        return self.recorded_at
+
+
+class ReplayTransport:
+    """从录制目录回放响应，不访问网络"""
+    
+    offline = True
+    
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        index_path = self.directory / "index.json"
+        if not index_path.exists():
+            raise ValueError(f"录制目录中没有 index.json: {self.directory}")
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != RECORDING_VERSION:
+            raise ValueError(f"不支持的录制格式版本: {index.get('version')}")
+        self.recorded_at = datetime.fromisoformat(index['recorded_at'])
+        self.watermarks = index.get('watermarks', {})  # 较早的录制没有保存水位线，按无水位线处理
+        self.responses = index['responses']
+        self._cache = {}  # URL -> 响应原文，重复回放（如压测）时不再读盘
+    
+    def get(self, url: str, headers: Optional[Dict] = None, **kwargs) -> RecordedResponse:
+        """返回录制的响应，没有录制该 URL 时抛出 LookupError"""
+        entry = self.responses.get(url)
+        if entry is None:
+            raise LookupError(f"没有录制该请求的响应: {url}")
+        content = self._cache.get(url)
+        if content is None:
+            content = self._cache[url] = (self.directory / entry['file']).read_bytes()
+        return RecordedResponse(url, entry['status'], content)
+    
+    def now(self) -> datetime:
+        """录制时间"""
+        return self.recorded_at
+    
+    def record_watermarks(self, watermarks: Dict[str, str]):
+        """回放时不需要记录"""
+
+
+def open_transport(record: Optional[str] = None, replay: Optional[str] = None) -> Optional[HTTPTransport]:
+    """根据命令行参数选择传输：录制到 record 目录、从 replay 目录回放；
+    都没有指定时返回 None，由 PaperFetcher 按抓取后端选择直接访问网络的传输
+    """
+    if record and replay:
+        raise ValueError("不能同时录制和回放")
+    if replay:
+        logger.info(f"回放录制的响应: {replay}")
+        return ReplayTransport(replay)
+    if record:
+        logger.info(f"录制抓取响应到: {record}")
+        return RecordingTransport(record)
+    return None
@@ -2,91 +2,142 @@
 """
 更新论文数据 - 添加会议/期刊信息
 从现有论文数据中提取并更新会议信息
+
+使用与抓取脚本相同的提取逻辑（scripts/venue.py）。增量执行：记录每篇论文
+comment / journal_ref 的哈希，未变化的论文直接跳过；待处理论文较多时使用多进程并行提取，
+只写回会议信息有变化的论文。哈希缓存保存在论文数据旁的 venue_hashes.json（默认 data/venue_hashes.json），
+与论文数据一起提交（每日工作流提交整个 data/ 目录），换一台机器运行也能增量执行。
+
+用法:
+    python scripts/update_venue.py              # 增量更新
+    python scripts/update_venue.py --full       # 忽略缓存，全部重新提取
+    python scripts/update_venue.py --workers 4  # 指定进程数
 """
 
+import argparse
+import hashlib
 import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import re
+from typing import Dict, List, Optional, Tuple
 
+# 以脚本方式运行（python scripts/update_venue.py）时也能导入 scripts 包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.storage import open_store
+from scripts.venue import EXTRACTOR_VERSION, extract_venue
+
+# 待处理论文数超过该值时才启用多进程（进程启动开销在小批量时得不偿失）
+PARALLEL_THRESHOLD = 2000
+CHUNK_SIZE = 1000
+
+
+def venue_source_hash(paper: Dict) -> str:
+    """论文 comment / journal_ref 及提取规则版本的哈希"""
+    source = f"{EXTRACTOR_VERSION}\0{paper.get('journal_ref') or ''}\0{paper.get('comment') or ''}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
 
-def extract_venue_from_comment(comment: str) -> str:
-    """从 comment 字段提取会议/期刊信息"""
-    if not comment:
-        return None
-    
-    comment = comment.strip()
-    
-    # 如果是 preprint，返回 None
-    if 'preprint' in comment.lower():
-        return None
-    
-    # 常见会议列表
-    conferences = [
-        'CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR', 
-        'ACL', 'EMNLP', 'NAACL', 'AAAI', 'IJCAI', 'KDD',
-        'ICRA', 'IROS', 'CoRL', 'RSS',
-        'SIGIR', 'WWW', 'WSDM', 'RecSys',
-        'SIGMOD', 'VLDB', 'ICDE',
-        'SIGGRAPH', 'ICASSP', 'INTERSPEECH'
-    ]
-    
-    # 匹配模式：会议名 + 年份
-    for conf in conferences:
-        # 匹配 "CVPR 2025" 或 "Accepted to CVPR 2025" 等模式
-        pattern = rf'\b{conf}\s*[:\']?\s*(\d{{4}})\b'
-        match = re.search(pattern, comment, re.IGNORECASE)
-        if match:
-            year = match.group(1)
-            return f"{conf} {year}"
-        
-        # 匹配只有会议名的情况
-        pattern = rf'\b{conf}\b'
-        if re.search(pattern, comment, re.IGNORECASE):
-            return conf
-    
-    return None
 
+def load_hashes(hash_file: Path) -> Dict[str, str]:
+    """加载上次处理时记录的哈希"""
+    if not hash_file.exists():
+        return {}
+    with open(hash_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
-def update_papers_with_venue():
+
+def save_hashes(hashes: Dict[str, str], hash_file: Path):
+    """保存本次处理后的哈希"""
+    hash_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(hash_file, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, sort_keys=True, separators=(',', ':'))
+
+
+def _extract_chunk(sources: List[Tuple[Optional[str], Optional[str]]]) -> List[Optional[str]]:
+    """在子进程中批量提取 (journal_ref, comment) -> 会议信息"""
+    return [extract_venue(journal_ref, comment) for journal_ref, comment in sources]
+
+
+def update_papers_with_venue(data_path: str = "data/papers.json", full: bool = False,
+                             workers: Optional[int] = None):
     """更新论文数据，添加会议信息"""
-    data_file = Path("data/papers.json")
+    data_file = Path(data_path)
+    store = open_store(data_file)
     
-    if not data_file.exists():
+    if store.backend == 'json' and not data_file.exists():
         print("❌ papers.json 不存在")
         return
     
-    # 读取论文数据
-    with open(data_file, 'r', encoding='utf-8') as f:
-        papers = json.load(f)
-    
-    print(f"📚 加载了 {len(papers)} 篇论文")
+    hash_file = data_file.parent / "venue_hashes.json"
+    hashes = {} if full else load_hashes(hash_file)
     
     # 统计
-    updated_count = 0
+    total_count = 0
+    checked_count = 0
     venue_count = {}
+    published_count = 0
+    changed_papers = []
+    hashes_changed = False
+    executor = None
+    
+    try:
+        # 按月份流式处理
+        for year_month, papers in store.iter_months():
+            total_count += len(papers)
+            
+            # 只处理 comment / journal_ref 有变化（或从未处理过）的论文
+            pending = []
+            for paper in papers:
+                source_hash = venue_source_hash(paper)
+                if hashes.get(paper['id']) != source_hash:
+                    hashes[paper['id']] = source_hash
+                    hashes_changed = True
+                    if paper.get('comment') or paper.get('journal_ref'):
+                        pending.append(paper)
+            checked_count += len(pending)
+            
+            sources = [(paper.get('journal_ref'), paper.get('comment')) for paper in pending]
+            if len(sources) >= PARALLEL_THRESHOLD and (workers or os.cpu_count() or 1) > 1:
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=workers)
+                chunks = [sources[i:i + CHUNK_SIZE] for i in range(0, len(sources), CHUNK_SIZE)]
+                venues = [venue for chunk in executor.map(_extract_chunk, chunks) for venue in chunk]
+            else:
+                venues = _extract_chunk(sources)
+            
+            # 更新会议信息
+            for paper, venue in zip(pending, venues):
+                if venue and paper.get('conference') != venue:
+                    paper['conference'] = venue
+                    changed_papers.append(paper)
+            
+            # 统计
+            for paper in papers:
+                venue = paper.get('conference')
+                if venue:
+                    published_count += 1
+                    venue_name = venue.split()[0]  # 只取会议名
+                    venue_count[venue_name] = venue_count.get(venue_name, 0) + 1
+    finally:
+        if executor:
+            executor.shutdown()
     
-    # 更新会议信息
-    for paper in papers:
-        comment = paper.get('comment')
-        if comment:
-            venue = extract_venue_from_comment(comment)
-            if venue:
-                paper['conference'] = venue
-                updated_count += 1
-                
-                # 统计
-                venue_name = venue.split()[0]  # 只取会议名
-                venue_count[venue_name] = venue_count.get(venue_name, 0) + 1
+    print(f"📚 加载了 {total_count} 篇论文，其中 {checked_count} 篇需要重新提取")
     
-    # 保存更新后的数据
-    with open(data_file, 'w', encoding='utf-8') as f:
-        json.dump(papers, f, ensure_ascii=False, indent=2)
+    # 只写回有变动的论文（分片存储下只重写涉及的月份），写入成功后再记录哈希；没有变化时不写任何文件
+    store.update(changed_papers)
+    if hashes_changed:
+        save_hashes(hashes, hash_file)
     
     print(f"\n✅ 更新完成！")
     print(f"📊 统计：")
-    print(f"  - 总论文数：{len(papers)}")
-    print(f"  - 有会议信息：{updated_count} 篇")
-    print(f"  - 预印本：{len(papers) - updated_count} 篇")
+    print(f"  - 总论文数：{total_count}")
+    print(f"  - 本次提取：{checked_count} 篇（跳过 {total_count - checked_count} 篇未变化的论文）")
+    print(f"  - 本次变更：{len(changed_papers)} 篇")
+    print(f"  - 有会议信息：{published_count} 篇")
+    print(f"  - 预印本：{total_count - published_count} 篇")
     
     if venue_count:
         print(f"\n📍 会议分布：")
@@ -94,5 +145,16 @@ def update_papers_with_venue():
             print(f"  - {venue}: {count} 篇")
 
 
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="从已保存论文的 comment / journal_ref 中提取会议信息")
+    parser.add_argument('--data', default="data/papers.json", help="论文数据路径（自动识别分片存储）")
+    parser.add_argument('--full', action='store_true', help="忽略增量缓存，重新提取所有论文")
+    parser.add_argument('--workers', type=int, default=None, help="进程数（默认使用全部 CPU 核心）")
+    args = parser.parse_args()
+    
+    update_papers_with_venue(args.data, full=args.full, workers=args.workers)
+
+
 if __name__ == "__main__":
-    update_papers_with_venue()
+    main()
@@ -4,8 +4,9 @@
 """
 
 import json
+import re
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List
 from datetime import datetime
 
 
@@ -42,6 +43,17 @@ def deduplicate_papers(papers: List[Dict], key: str = 'id') -> List[Dict]:
     return unique_papers
 
 
+def strip_arxiv_version(paper_id: str) -> str:
+    """去掉 ArXiv ID 的版本号后缀，例如 2510.27630v2 -> 2510.27630"""
+    return re.sub(r'v\d+$', '', paper_id)
+
+
+def arxiv_version(paper_id: str) -> int:
+    """ArXiv ID 的版本号，例如 2510.27630v2 -> 2，没有版本号时为 0"""
+    match = re.search(r'v(\d+)$', paper_id)
+    return int(match.group(1)) if match else 0
+
+
 def format_authors(authors: List[str], max_authors: int = 5) -> str:
     """格式化作者列表"""
     if len(authors) <= max_authors:
@@ -82,3 +94,32 @@ def count_papers_by_category(papers: List[Dict]) -> Dict[str, int]:
         for tag in paper.get('tags', []):
             counts[tag] = counts.get(tag, 0) + 1
     return counts
+
+
+def compute_paper_stats(papers: Iterable[Dict], tags: List[str]) -> Dict:
+    """单次遍历统计论文数量：总数、已发表/预印本、各标签，按月份和全部分别统计
+    
+    tags 为需要统计的标签（如 config.yaml 中的 categories），论文中出现的其他标签也会计入。
+    返回 {'total': {...}, 'months': {'2025-10': {...}, ...}}，
+    每项为 {'count', 'published_count', 'preprint_count', 'tags': {标签: 数量}}。
+    """
+    def new_counter():
+        return {'count': 0, 'published_count': 0, 'preprint_count': 0, 'tags': dict.fromkeys(tags, 0)}
+    
+    total = new_counter()
+    months = {}
+    for paper in papers:
+        month = paper.get('published', '')[:7]
+        counters = (total, months.setdefault(month, new_counter())) if month else (total,)
+        status = 'published_count' if paper.get('conference') else 'preprint_count'
+        paper_tags = paper.get('tags', [])
+        for counter in counters:
+            counter['count'] += 1
+            counter[status] += 1
+            for tag in paper_tags:
+                counter['tags'][tag] = counter['tags'].get(tag, 0) + 1
+    
+    return {
+        'total': total,
+        'months': {month: months[month] for month in sorted(months, reverse=True)}
+    }
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+会议/期刊信息提取模块
+从 ArXiv 的 comment 和 journal_ref 字段中提取论文的发表会议/期刊。
+
+所有正则表达式在导入时编译一次；会议名使用单个交替正则匹配，
+每种模式对一条 comment 只做一次扫描（而不是每个会议各搜索一次）。
+"""
+
+import re
+from typing import Optional
+
+# 提取规则版本号：修改提取逻辑后递增，使 update_venue.py 的增量缓存失效并重新提取
+EXTRACTOR_VERSION = 1
+
+# 常见会议列表（顺序即优先级：同一条 comment 中出现多个会议时，取列表中靠前的）
+CONFERENCES = [
+    'CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR',
+    'ACL', 'EMNLP', 'NAACL', 'AAAI', 'IJCAI', 'KDD',
+    'ICRA', 'IROS', 'CoRL', 'RSS',
+    'SIGIR', 'WWW', 'WSDM', 'RecSys',
+    'SIGMOD', 'VLDB', 'ICDE',
+    'SIGGRAPH', 'ICASSP', 'INTERSPEECH'
+]
+
+# journal_ref 中识别的会议缩写（比 comment 多 ICPR）
+JOURNAL_REF_CONFERENCES = set(CONFERENCES + ['ICPR'])
+
+# 常见期刊关键词
+JOURNALS = [
+    'Nature', 'Science', 'PAMI', 'TPAMI', 'JMLR', 'IJCV',
+    'IEEE', 'ACM', 'Transactions', 'Journal'
+]
+
+# journal_ref 中表示期刊/会议名称的关键词
+JOURNAL_REF_KEYWORDS = [
+    'conference', 'journal', 'proceedings', 'transactions', 'letters',
+    'review', 'symposium', 'workshop'
+]
+
+# 会议名（小写）-> 优先级
+_CONFERENCE_RANK = {conf.lower(): i for i, conf in enumerate(CONFERENCES)}
+_CONFERENCE_ALT = '|'.join(re.escape(conf) for conf in CONFERENCES)
+
+# 预处理：移除页数、图表、链接等冗余信息
+_CLEANUP_PATTERNS = [
+    re.compile(r'\d+\s*pages?[,;]?\s*', re.IGNORECASE),
+    re.compile(r'\d+\s*figures?[,;]?\s*', re.IGNORECASE),
+    re.compile(r'\d+\s*tables?[,;]?\s*', re.IGNORECASE),
+    re.compile(r'\d+\s*appendices[,;]?\s*', re.IGNORECASE),
+    re.compile(r'https?://[^\s,;]+', re.IGNORECASE),
+    re.compile(r'GitHub\s+link:?\s*', re.IGNORECASE),
+]
+
+# 模式1: "Accepted at/to CVPR 2025"、"Published in ICCV 2025"、"To appear in ..." 等，取完整描述
+_ACCEPTED_PATTERN = re.compile(
+    r'(?:accepted?\s+(?:at\s+(?:the\s+)?|to\s+(?:the\s+)?|by\s+(?:the\s+)?|for\s+(?:the\s+)?)'
+    r'|published\s+(?:in\s+(?:the\s+)?|at\s+(?:the\s+)?|with\s+)'
+    r'|to\s+appear\s+(?:in\s+(?:the\s+)?|at\s+(?:the\s+)?))\s*(.+?)(?:[.,;]|\Z)',
+    re.IGNORECASE
+)
+# 移除尾部的位置信息（如 ", Washington, DC, USA"），但保留括号内容如 (IJETT)
+_LOCATION_SUFFIX = re.compile(r',\s*[A-Z][a-zA-Z\s,]+,\s*[A-Z]{2,}(?:\s*,\s*[A-Z]{2,4})?$')
+
+# 模式2: 会议名 + 空格 + 年份，如 "CVPR 2025, Main Conference" -> "CVPR 2025"（保留原文大小写）
+_CONF_YEAR_PATTERN = re.compile(rf'\b(?P<conf>{_CONFERENCE_ALT})\s+\d{{4}}', re.IGNORECASE)
+# 模式3: 会议名 + 可选分隔符 + 年份，如 "ICCV'2023"、"CVPR2024" -> "ICCV 2023"
+_CONF_SEP_YEAR_PATTERN = re.compile(rf'\b(?P<conf>{_CONFERENCE_ALT})\s*[:\']?\s*(?P<year>\d{{4}})\b', re.IGNORECASE)
+# 模式4: 只有会议名
+_CONF_NAME_PATTERN = re.compile(rf'\b(?P<conf>{_CONFERENCE_ALT})\b', re.IGNORECASE)
+
+_JOURNAL_PATTERN = re.compile('|'.join(re.escape(j) for j in JOURNALS), re.IGNORECASE)
+
+# journal_ref: 括号中的会议缩写及周围信息，如 "The International Conference on Pattern Recognition (ICPR),2024"
+_JOURNAL_REF_ACRONYM = re.compile(r'([^()]*)\s*\(([A-Z]{2,})\s*(?:\d+)?\)\s*,?\s*(\d{4})?')
+_JOURNAL_REF_KEYWORD_PATTERN = re.compile('|'.join(JOURNAL_REF_KEYWORDS), re.IGNORECASE)
+
+
+def _conference_index(name: str) -> int:
+    """匹配到的会议名 -> 在会议列表中的下标
+    
+    IGNORECASE 下 'ı'、'ſ' 等非 ASCII 字符也能匹配 i、s，lower() 无法把它们还原成字典中的键，
+    这时按与正则相同的规则逐个比较会议名。
+    """
+    index = _CONFERENCE_RANK.get(name.lower())
+    if index is None:
+        index = next(i for i, conf in enumerate(CONFERENCES) if re.fullmatch(re.escape(conf), name, re.IGNORECASE))
+    return index
+
+
+def _best_conference_match(pattern: re.Pattern, text: str) -> Optional[re.Match]:
+    """一次扫描找出所有会议匹配，返回会议列表中优先级最高的（同一会议取最先出现的）"""
+    best = None
+    best_rank = len(CONFERENCES)
+    for match in pattern.finditer(text):
+        rank = _conference_index(match.group('conf'))
+        if rank < best_rank:
+            best, best_rank = match, rank
+            if rank == 0:
+                break
+    return best
+
+
+def extract_venue_from_comment(comment: Optional[str]) -> Optional[str]:
+    """从 comment 字段提取会议/期刊信息，优先返回原始完整描述"""
+    if not comment:
+        return None
+    
+    comment = comment.strip()
+    
+    # 预处理：移除页数、图表、链接等冗余信息
+    for pattern in _CLEANUP_PATTERNS:
+        comment = pattern.sub('', comment)
+    comment = ' '.join(comment.split())  # 清理多余空格
+    
+    # 如果是 preprint，返回 None
+    comment_lower = comment.lower()
+    if 'preprint' in comment_lower and 'accepted' not in comment_lower:
+        return None
+    
+    # 模式1: 提取 "Accepted at ..." 之后的完整描述
+    match = _ACCEPTED_PATTERN.search(comment)
+    if match:
+        venue_text = ' '.join(match.group(1).split())
+        venue_text = _LOCATION_SUFFIX.sub('', venue_text)
+        # 放宽长度限制，支持完整的期刊名称
+        if 5 < len(venue_text) <= 200:
+            return venue_text
+    
+    # 模式2: 会议名 + 年份（保留原文）
+    match = _best_conference_match(_CONF_YEAR_PATTERN, comment)
+    if match:
+        return match.group(0)
+    
+    # 模式3: 会议名 + 分隔符 + 年份（规范化会议名）
+    match = _best_conference_match(_CONF_SEP_YEAR_PATTERN, comment)
+    if match:
+        conf = CONFERENCES[_conference_index(match.group('conf'))]
+        return f"{conf} {match.group('year')}"
+    
+    # 模式4: 只有会议名
+    match = _best_conference_match(_CONF_NAME_PATTERN, comment)
+    if match:
+        return CONFERENCES[_conference_index(match.group('conf'))]
+    
+    # 检查期刊 - 尽量返回完整描述
+    if _JOURNAL_PATTERN.search(comment):
+        # 取第一句或前80个字符
+        first_sentence = comment.split('.')[0].strip()
+        if len(first_sentence) <= 80:
+            return first_sentence
+        return comment[:80].strip() + '...'
+    
+    return None
+
+
+def extract_venue_from_journal_ref(journal_ref: Optional[str]) -> Optional[str]:
+    """从 journal_ref 字段提取会议/期刊信息
+    例如: "The International Conference on Pattern Recognition (ICPR),2024"
+    """
+    if not journal_ref:
+        return None
+    
+    journal_ref = journal_ref.strip()
+    
+    # 模式1: 提取括号中的会议缩写及周围信息
+    match = _JOURNAL_REF_ACRONYM.search(journal_ref)
+    if match:
+        full_name = match.group(1).strip()
+        acronym = match.group(2)
+        year = match.group(3)
+        
+        # 检查是否是已知的会议
+        if acronym.upper() in JOURNAL_REF_CONFERENCES:
+            if year:
+                result = f"{full_name} ({acronym} {year})"
+            else:
+                result = f"{full_name} ({acronym})"
+            
+            # 限制长度
+            if len(result) <= 200:
+                return result
+    
+    # 模式2: 如果没找到括号，就直接返回整个journal_ref
+    # 但只有在看起来像期刊/会议名称时才返回
+    if 3 < len(journal_ref) <= 200 and _JOURNAL_REF_KEYWORD_PATTERN.search(journal_ref):
+        return journal_ref
+    
+    return None
+
+
+def extract_venue(journal_ref: Optional[str], comment: Optional[str]) -> Optional[str]:
+    """提取会议/期刊信息（优先使用 journal_ref，然后是 comment）"""
+    return extract_venue_from_journal_ref(journal_ref) or extract_venue_from_comment(comment)
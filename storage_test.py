@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+论文存储测试 - 校验按月分片存储的读写往返、去重、只重写涉及的分片，以及从 papers.json 迁移
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.storage import JSONPaperStore, ShardedPaperStore, open_store
+from scripts.utils import save_json
+
+
+def make_paper(paper_id: str, published: str, **fields) -> dict:
+    """最小的论文字典"""
+    return {'id': paper_id, 'title': f"Paper {paper_id}", 'published': published, 'updated': published, **fields}
+
+
+def sample_papers():
+    """跨三个月份的论文"""
+    return [
+        make_paper('2510.00001v1', '2025-10-02'),
+        make_paper('2510.00002v1', '2025-10-05'),
+        make_paper('2509.00001v1', '2025-09-30'),
+        make_paper('2508.00001v1', '2025-08-01', tags=['Computer Vision']),
+    ]
+
+
+def test_sharded_round_trip():
+    """分片存储读写往返：按月分片、按 ID 去重，只重写涉及的月份"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = ShardedPaperStore(Path(directory) / "papers")
+        assert store.add(sample_papers()) == 4
+        assert store.months() == ['2025-10', '2025-09', '2025-08']
+        assert sorted((Path(directory) / "papers").iterdir())[0].name == '2025-08.jsonl'
+        
+        # 重新打开后内容一致，同月按 published 降序
+        reopened = ShardedPaperStore(Path(directory) / "papers")
+        assert reopened.count() == 4
+        assert [p['id'] for p in reopened.load_month('2025-10')] == ['2510.00002v1', '2510.00001v1']
+        assert {p['id']: p for p in reopened.load()} == {p['id']: p for p in sample_papers()}
+        assert [month for month, _ in reopened.iter_months(['2025-08', '2025-10'])] == ['2025-10', '2025-08']
+        
+        # 重复添加不写入；新论文只改变所在月份的哈希
+        hashes = {month: reopened.month_hash(month) for month in reopened.months()}
+        assert reopened.add(sample_papers()) == 0
+        assert reopened.add([make_paper('2509.00002v1', '2025-09-15')]) == 1
+        assert reopened.month_hash('2025-09') != hashes['2025-09']
+        assert reopened.month_hash('2025-10') == hashes['2025-10']
+        assert reopened.month_hash('2025-08') == hashes['2025-08']
+        
+        # update 按 ID 替换
+        assert reopened.update([make_paper('2508.00001v1', '2025-08-01', tags=[])]) == 1
+        assert ShardedPaperStore(Path(directory) / "papers").load_month('2025-08')[0]['tags'] == []
+
+
+def test_migrate_from_json():
+    """已有 papers.json 时首次打开分片存储自动迁移，之后自动识别为分片存储"""
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / "papers.json"
+        save_json(sample_papers(), json_path)
+        assert isinstance(open_store(json_path), JSONPaperStore)
+        
+        store = open_store(json_path, backend='sharded')
+        assert isinstance(store, ShardedPaperStore)
+        assert store.count() == 4
+        assert sorted(p['id'] for p in store.load()) == sorted(p['id'] for p in JSONPaperStore(json_path).load())
+        
+        reopened = open_store(json_path)
+        assert isinstance(reopened, ShardedPaperStore)
+        assert reopened.count() == 4
+
+
+def test_version_dedupe():
+    """两种后端都按去掉版本号的 ID 去重：新版本替换旧版本，旧版本和相同版本被跳过"""
+    with tempfile.TemporaryDirectory() as directory:
+        json_store = JSONPaperStore(str(Path(directory) / "papers.json"))
+        sharded_store = ShardedPaperStore(str(Path(directory) / "papers"))
+        for store in (json_store, sharded_store):
+            assert store.add(sample_papers()) == 4
+            assert store.add([
+                make_paper('2510.00001v3', '2025-10-02', tags=['Vision']),
+                make_paper('2510.00001v2', '2025-10-02'),
+                make_paper('2509.00001v1', '2025-09-30', title='duplicate'),
+                make_paper('2510.00003v1', '2025-10-03'),
+                make_paper('2510.00003v2', '2025-10-03'),
+            ]) == 1
+            papers = {paper['id']: paper for paper in store.load()}
+            assert sorted(papers) == ['2508.00001v1', '2509.00001v1', '2510.00001v3', '2510.00002v1', '2510.00003v2']
+            assert papers['2510.00001v3']['tags'] == ['Vision']
+            assert papers['2509.00001v1']['title'] == 'Paper 2509.00001v1'
+            assert store.count() == 5
+        
+        # 只有旧版本时不重写分片
+        october_hash = sharded_store.month_hash('2025-10')
+        assert sharded_store.add([make_paper('2510.00001v1', '2025-10-02')]) == 0
+        assert sharded_store.month_hash('2025-10') == october_hash
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 论文存储测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_sharded_round_trip, test_migrate_from_json, test_version_dedupe):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -46,8 +46,7 @@ def test_generate():
     
     if generator.papers:
         print(f"✅ 加载了 {len(generator.papers)} 篇论文")
-        generator.generate_css()
-        generator.generate_js()
+        generator.build_assets()
         generator.generate_index_html()
         print(f"✅ 网页生成成功")
         print(f"📁 输出目录: {generator.output_dir}")
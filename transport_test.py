@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+抓取传输层测试 - 录制合成的 ArXiv 响应后离线回放，校验回放抓取的结果与录制时一致，且回放不改写数据目录
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.benchmark import CorpusTransport, synthetic_corpus
+from scripts.fetch_papers import PaperFetcher
+from scripts.storage import open_store
+from scripts.transport import RecordingTransport, ReplayTransport
+
+CONFIG_PATH = str(project_root / "config.yaml")
+
+
+def make_fetcher(transport, output_dir: str = None, incremental: bool = False) -> PaperFetcher:
+    """只抓取一个类别、不限时间窗口和数量的 PaperFetcher"""
+    fetcher = PaperFetcher(CONFIG_PATH, transport=transport, output_dir=output_dir)
+    fetcher.config['sources']['arxiv'].update({
+        'categories': ['cs.AI'], 'max_results': None, 'page_size': 40, 'days_back': 36500,
+        'delay_seconds': 0, 'max_workers': 1, 'early_stop': False, 'incremental': incremental,
+    })
+    return fetcher
+
+
+def test_record_and_replay():
+    """回放录制的响应，得到与录制时相同的论文"""
+    papers = synthetic_corpus(PaperFetcher(CONFIG_PATH).config, 100, seed=2)
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = RecordingTransport(directory, inner=CorpusTransport(papers))
+        recorded = make_fetcher(recorder).fetch_arxiv_papers()
+        
+        replay = ReplayTransport(directory)
+        assert len(replay.responses) == 3  # 100 篇，每页 40 篇
+        assert replay.now() == recorder.now()
+        replayed = make_fetcher(replay).fetch_arxiv_papers()
+    
+    assert len(recorded) == 100
+    assert replayed == recorded
+    assert {paper['id'] for paper in replayed} == {paper['id'] for paper in papers}
+
+
+def test_replay_missing_response():
+    """回放没有录制过的请求时报错"""
+    with tempfile.TemporaryDirectory() as directory:
+        RecordingTransport(directory).save_index()
+        with pytest.raises(LookupError):
+            ReplayTransport(directory).get("https://export.arxiv.org/api/query?search_query=cat%3Acs.CV")
+
+
+def test_replay_recorded_watermarks():
+    """增量抓取的录制保存了水位线，回放时使用录制的水位线，与当前数据目录中的水位线无关"""
+    papers = synthetic_corpus(PaperFetcher(CONFIG_PATH).config, 100, seed=2)
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = Path(directory) / "data"
+        data_dir.mkdir()
+        watermark_path = data_dir / "fetch_watermarks.json"
+        watermark_path.write_text(json.dumps({'cs.AI': '2025-10-15T00:00:00+00:00'}), encoding='utf-8')
+        recording = str(Path(directory) / "recording")
+        recorded = make_fetcher(RecordingTransport(recording, inner=CorpusTransport(papers)),
+                                str(data_dir), incremental=True).fetch_arxiv_papers()
+        assert 0 < len(recorded) < 100
+        
+        # 数据目录中的水位线之后被推进或删除，回放结果不受影响
+        replay = ReplayTransport(recording)
+        assert replay.watermarks == {'cs.AI': '2025-10-15T00:00:00+00:00'}
+        watermark_path.write_text(json.dumps({'cs.AI': '2025-12-31T00:00:00+00:00'}), encoding='utf-8')
+        assert make_fetcher(replay, str(data_dir), incremental=True).fetch_arxiv_papers() == recorded
+        watermark_path.unlink()
+        assert make_fetcher(ReplayTransport(recording), str(data_dir), incremental=True).fetch_arxiv_papers() == recorded
+
+
+def test_replay_does_not_persist():
+    """回放时不指定保存目录则不写入 data/，指定后论文和水位线保存到该目录"""
+    papers = synthetic_corpus(PaperFetcher(CONFIG_PATH).config, 50, seed=4)
+    with tempfile.TemporaryDirectory() as directory:
+        recording = str(Path(directory) / "recording")
+        make_fetcher(RecordingTransport(recording, inner=CorpusTransport(papers))).fetch_arxiv_papers()
+        
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            make_fetcher(ReplayTransport(recording)).run()
+        finally:
+            os.chdir(cwd)
+        assert not (Path(directory) / "data").exists()
+        
+        output_dir = Path(directory) / "replay-output"
+        make_fetcher(ReplayTransport(recording), str(output_dir), incremental=True).run()
+        assert open_store(output_dir / "papers.json").count() == 50
+        assert 'cs.AI' in json.loads((output_dir / "fetch_watermarks.json").read_text(encoding='utf-8'))
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 抓取传输层测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_record_and_replay, test_replay_missing_response, test_replay_recorded_watermarks,
+                 test_replay_does_not_persist):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+会议信息更新测试 - 校验 scripts/update_venue.py 的哈希缓存、只写回变动的论文，以及多进程提取
+"""
+
+import json
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts import update_venue
+from scripts.storage import ShardedPaperStore, open_store
+
+
+def make_paper(paper_id: str, published: str, **fields) -> dict:
+    """最小的论文字典"""
+    return {'id': paper_id, 'title': f"Paper {paper_id}", 'published': published, 'updated': published, **fields}
+
+
+def sample_papers():
+    """跨两个月份的论文：两篇带会议 comment、一篇带 journal_ref、一篇预印本"""
+    return [
+        make_paper('2510.00001v1', '2025-10-02', comment='Accepted at CVPR 2025'),
+        make_paper('2510.00002v1', '2025-10-05', comment='12 pages, 5 figures'),
+        make_paper('2509.00001v1', '2025-09-30', comment='NeurIPS 2024 workshop'),
+        make_paper('2509.00002v1', '2025-09-12', journal_ref='Pattern Recognition Letters (PRL), 2025'),
+    ]
+
+
+class UpdateSpy:
+    """记录 ShardedPaperStore.update 每次收到的论文 ID"""
+    
+    def __init__(self):
+        self.calls = []
+        self.original = ShardedPaperStore.update
+    
+    def __enter__(self):
+        spy = self
+        
+        def update(store, papers):
+            spy.calls.append(sorted(paper['id'] for paper in papers))
+            return spy.original(store, papers)
+        
+        ShardedPaperStore.update = update
+        return self
+    
+    def __exit__(self, *exc_info):
+        ShardedPaperStore.update = self.original
+
+
+def shard_mtimes(data_path: Path) -> dict:
+    """数据目录下各文件的修改时间"""
+    return {path.name: path.stat().st_mtime_ns for path in data_path.parent.rglob('*') if path.is_file()}
+
+
+def conferences(data_path: Path) -> dict:
+    """论文 ID -> 会议信息"""
+    return {paper['id']: paper.get('conference') for paper in open_store(data_path).load()}
+
+
+def test_incremental_update():
+    """第二次运行时 comment 未变化，不提取也不写入任何文件；只修改一篇论文的 comment 时只更新这一篇"""
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = Path(directory) / "papers.json"
+        open_store(data_path, backend='sharded').add(sample_papers())
+        
+        with UpdateSpy() as spy:
+            update_venue.update_papers_with_venue(str(data_path))
+        assert spy.calls == [['2509.00001v1', '2509.00002v1', '2510.00001v1']]
+        assert conferences(data_path) == {'2510.00001v1': 'CVPR 2025', '2510.00002v1': None,
+                                          '2509.00001v1': 'NeurIPS 2024',
+                                          '2509.00002v1': 'Pattern Recognition Letters (PRL), 2025'}
+        hashes = json.loads((data_path.parent / "venue_hashes.json").read_text(encoding='utf-8'))
+        assert sorted(hashes) == sorted(paper['id'] for paper in sample_papers())
+        
+        # 第二次运行：没有论文需要写回，哈希文件和分片都不重写
+        mtimes = shard_mtimes(data_path)
+        with UpdateSpy() as spy:
+            update_venue.update_papers_with_venue(str(data_path))
+        assert spy.calls == [[]]
+        assert shard_mtimes(data_path) == mtimes
+        
+        # 只修改一篇论文的 comment：只提取并写回这一篇
+        store = open_store(data_path)
+        changed = next(paper for paper in store.load() if paper['id'] == '2510.00002v1')
+        store.update([dict(changed, comment='To appear in ICML 2025')])
+        extracted = []
+        original_extract = update_venue._extract_chunk
+        
+        def spy_extract(sources):
+            extracted.extend(sources)
+            return original_extract(sources)
+        
+        update_venue._extract_chunk = spy_extract
+        try:
+            with UpdateSpy() as spy:
+                update_venue.update_papers_with_venue(str(data_path))
+        finally:
+            update_venue._extract_chunk = original_extract
+        assert extracted == [(None, 'To appear in ICML 2025')]
+        assert spy.calls == [['2510.00002v1']]
+        assert conferences(data_path)['2510.00002v1'] == 'ICML 2025'
+
+
+def test_parallel_extraction():
+    """待处理论文超过阈值时使用多进程提取，结果与单进程相同"""
+    papers = [make_paper(f"2510.{i:05d}v1", f"2025-10-{i % 28 + 1:02d}", comment=comment)
+              for i, comment in enumerate(['Accepted at CVPR 2025', 'ICCV 2023', '8 pages', 'EMNLP'] * 5)]
+    results = []
+    pools = []
+    
+    class CountingPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+    
+    original = update_venue.PARALLEL_THRESHOLD, update_venue.CHUNK_SIZE, update_venue.ProcessPoolExecutor
+    for parallel in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            data_path = Path(directory) / "papers.json"
+            open_store(data_path, backend='sharded').add(papers)
+            if parallel:
+                update_venue.PARALLEL_THRESHOLD, update_venue.CHUNK_SIZE = 1, 3
+            update_venue.ProcessPoolExecutor = CountingPool
+            try:
+                update_venue.update_papers_with_venue(str(data_path), workers=2)
+            finally:
+                update_venue.PARALLEL_THRESHOLD, update_venue.CHUNK_SIZE, update_venue.ProcessPoolExecutor = original
+            results.append(conferences(data_path))
+        assert len(pools) == (1 if parallel else 0)
+    assert results[0] == results[1]
+    assert sum(1 for venue in results[0].values() if venue) == 15
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 会议信息更新测试")
+    print("=" * 60)
+    
+    failed = 0
+    for test in (test_incremental_update, test_parallel_extraction):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
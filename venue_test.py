@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+会议/期刊提取回归测试 - 用真实 comment / journal_ref 语料校验 scripts/venue.py 的输出
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.venue import extract_venue_from_comment, extract_venue_from_journal_ref
+
+CORPUS_PATH = project_root / "fixtures" / "venue_corpus.json"
+
+
+def load_corpus():
+    """加载回归语料"""
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_cases(cases, extract):
+    """返回输出与期望不一致的用例"""
+    failures = []
+    for case in cases:
+        actual = extract(case['input'])
+        if actual != case['expected']:
+            failures.append((case['input'], case['expected'], actual))
+    return failures
+
+
+def test_comment_corpus():
+    """comment 语料"""
+    failures = check_cases(load_corpus()['comment'], extract_venue_from_comment)
+    assert not failures, failures[:5]
+
+
+def test_journal_ref_corpus():
+    """journal_ref 语料"""
+    failures = check_cases(load_corpus()['journal_ref'], extract_venue_from_journal_ref)
+    assert not failures, failures[:5]
+
+
+def test_conference_priority():
+    """同时出现多个会议时，按会议列表顺序取优先级最高的"""
+    assert extract_venue_from_comment("Extended version of our AAAI 2024 paper, now at CVPR 2025") == "CVPR 2025"
+    assert extract_venue_from_comment("iccv'2023 and eccv'2022 workshops") == "ICCV 2023"
+    assert extract_venue_from_comment("Oral at NAACL") == "NAACL"
+
+
+def test_non_ascii_case_folding():
+    """IGNORECASE 下非 ASCII 字母（'ı'、'ſ'）也能匹配会议名，不会因查不到优先级而抛出 KeyError"""
+    assert extract_venue_from_comment("ICCV ıCML 2024") == "ıCML 2024"
+    assert extract_venue_from_comment("ICAſſP 2024") == "ICAſſP 2024"
+    assert extract_venue_from_comment("ıCML'2024 workshop") == "ICML 2024"
+    assert extract_venue_from_comment("Oral at ıclr") == "ICLR"
+
+
+def main():
+    """运行全部测试"""
+    print("🧪 会议/期刊提取回归测试")
+    print("=" * 60)
+    
+    corpus = load_corpus()
+    failed = 0
+    for name, extract in [('comment', extract_venue_from_comment),
+                          ('journal_ref', extract_venue_from_journal_ref)]:
+        failures = check_cases(corpus[name], extract)
+        failed += len(failures)
+        print(f"{'✅' if not failures else '❌'} {name}: {len(corpus[name]) - len(failures)}/{len(corpus[name])} 通过")
+        for text, expected, actual in failures[:10]:
+            print(f"  输入: {text!r}")
+            print(f"  期望: {expected!r}  实际: {actual!r}")
+    
+    for test in (test_conference_priority, test_non_ascii_case_folding):
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__doc__}: {e}")
+    
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())